@@ -0,0 +1,70 @@
+from typing import Dict, Any, Iterable
+
+# Key under which derived aggregates are stored inside a dataset
+AGGREGATES_KEY = "aggregates"
+
+
+def _finalize(category_totals: Dict[str, float], total_expenses: float, total_investment: float,
+              monthly_income: float, expenses_count: int, investments_count: int) -> Dict[str, Any]:
+    savings = monthly_income - total_expenses
+    savings_rate = (savings / monthly_income * 100) if monthly_income > 0 else 0
+    return {
+        "category_totals": category_totals,
+        "total_expenses": total_expenses,
+        "total_investment": total_investment,
+        "monthly_income": monthly_income,
+        "savings": savings,
+        "savings_rate": savings_rate,
+        "expenses_count": expenses_count,
+        "investments_count": investments_count,
+    }
+
+
+def compute_aggregates(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the totals every dashboard view needs in one pass over the dataset"""
+    category_totals = {}
+    total_expenses = 0
+    for expense in data.get("expenses", []):
+        category = expense.get("category", "Other")
+        amount = expense.get("amount", 0)
+        category_totals[category] = category_totals.get(category, 0) + amount
+        total_expenses += amount
+
+    total_investment = sum(inv.get("amount", 0) for inv in data.get("investments", []))
+
+    monthly_income = data.get("profile", {}).get("monthly_income", 0)
+    return _finalize(
+        category_totals, total_expenses, total_investment, monthly_income,
+        len(data.get("expenses", [])), len(data.get("investments", []))
+    )
+
+
+def merge_aggregates(parts: Iterable[Dict[str, Any]], monthly_income: float) -> Dict[str, Any]:
+    """Combine aggregates of disjoint slices (chunks or sheets) of one dataset, recomputing income figures"""
+    category_totals: Dict[str, float] = {}
+    total_expenses = 0
+    total_investment = 0
+    expenses_count = 0
+    investments_count = 0
+    for part in parts:
+        for category, amount in part.get("category_totals", {}).items():
+            category_totals[category] = category_totals.get(category, 0) + amount
+        total_expenses += part.get("total_expenses", 0)
+        total_investment += part.get("total_investment", 0)
+        expenses_count += part.get("expenses_count", 0)
+        investments_count += part.get("investments_count", 0)
+    return _finalize(category_totals, total_expenses, total_investment, monthly_income, expenses_count, investments_count)
+
+
+def attach_aggregates(data: Dict[str, Any]) -> Dict[str, Any]:
+    """(Re)compute aggregates and store them on `data`; returns `data`"""
+    data[AGGREGATES_KEY] = compute_aggregates(data)
+    return data
+
+
+def get_aggregates(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the stored aggregates of `data`, computing them once if missing"""
+    aggregates = data.get(AGGREGATES_KEY)
+    if aggregates is None:
+        aggregates = attach_aggregates(data)[AGGREGATES_KEY]
+    return aggregates
@@ -0,0 +1,79 @@
+"""
+Compare load time and file size of an upload saved as indented JSON (the
+old format) and as a .fgb binary dataset (binary_store.py).
+
+Builds a dataset the size of a 20k-row engineered upload (220k expenses),
+writes it both ways and times a cold load plus the first read of expenses.
+
+    python benchmarks/bench_binary_store.py [--count 220000] [--repeat 3] [--compress]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_store import read_dataset, write_dataset  # noqa: E402
+from records import Transaction, Investment, json_default  # noqa: E402
+
+DATES = [f"2025-{m:02d}-01" for m in range(1, 13)]
+CATEGORIES = ["Rent", "Groceries", "Transport", "Eating Out", "Utilities", "Healthcare", "Shopping", "Entertainment"]
+TYPES = ["Stocks", "Mutual Funds", "Fixed Deposits", "Gold"]
+
+
+def build_dataset(count: int):
+    return {
+        "user_id": "bench",
+        "profile": {"name": "Bench", "monthly_income": 85000.0},
+        "expenses": [Transaction(DATES[i % 12], CATEGORIES[i % 8], round(i * 1.37 % 5000, 2)) for i in range(count)],
+        "investments": [Investment(TYPES[i % 4], i * 10.5, 6.0 + i % 7) for i in range(count // 11)],
+        "goals": [],
+        "subscriptions": [],
+    }
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=220_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    data = build_dataset(args.count)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "upload.json")
+        fgb_path = os.path.join(tmp, "upload.fgb")
+        with open(json_path, "w") as f:
+            json.dump(data, f, indent=2, default=json_default)
+        write_dataset(data, fgb_path, compress=args.compress)
+
+        def load_json():
+            with open(json_path) as f:
+                return json.load(f)
+
+        results = {
+            "json load": best_of(args.repeat, load_json),
+            "fgb open (lazy)": best_of(args.repeat, lambda: read_dataset(fgb_path)),
+            "fgb open + expenses": best_of(args.repeat, lambda: read_dataset(fgb_path)["expenses"]),
+            "fgb full decode": best_of(args.repeat, lambda: read_dataset(fgb_path, lazy=False)),
+        }
+        print(f"json: {os.path.getsize(json_path) / 1024 / 1024:6.1f} MiB   fgb: {os.path.getsize(fgb_path) / 1024 / 1024:6.1f} MiB")
+        for name, seconds in results.items():
+            print(f"{name:<22} {seconds * 1000:8.1f} ms")
+        print(f"full decode is {results['json load'] / results['fgb full decode']:.1f}x faster than json")
+
+
+if __name__ == "__main__":
+    main()
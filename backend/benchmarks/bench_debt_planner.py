@@ -0,0 +1,74 @@
+"""
+Benchmark the multi-debt planner: 50 loans over a 360-month horizon.
+
+    python benchmarks/bench_debt_planner.py [--loans 50] [--months 360] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from debt_planner import iter_repayment_schedule, summarize_plan, compare_strategies  # noqa: E402
+
+
+def make_loans(count: int, months: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    balances = rng.uniform(10_000, 2_000_000, count)
+    rates = rng.uniform(6, 24, count)
+    loans = []
+    for i, (balance, rate) in enumerate(zip(balances, rates)):
+        # Minimums sized so each loan alone would take about the full horizon
+        r = rate / 12 / 100
+        minimum = balance * r * (1 + r) ** months / ((1 + r) ** months - 1)
+        loans.append({"name": f"loan_{i}", "balance": float(balance), "annual_interest_rate": float(rate), "min_payment": float(minimum)})
+    return loans
+
+
+def timed(label, fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loans", type=int, default=50)
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    loans = make_loans(args.loans, args.months)
+    budget = sum(loan["min_payment"] for loan in loans) * 1.05
+    print(f"{args.loans} loans, {args.months}-month minimums, budget {budget:,.0f}/month")
+
+    summary = timed("summarize_plan (avalanche)", lambda: summarize_plan(loans, budget, "avalanche", max_months=args.months), args.repeat)
+    timed("summarize_plan (snowball)", lambda: summarize_plan(loans, budget, "snowball", max_months=args.months), args.repeat)
+    timed("compare_strategies", lambda: compare_strategies(loans, budget, max_months=args.months), args.repeat)
+    timed("stream schedule (consume only)", lambda: sum(1 for _ in iter_repayment_schedule(loans, budget, max_months=args.months)), args.repeat)
+    timed("materialize schedule (list)", lambda: list(iter_repayment_schedule(loans, budget, max_months=args.months)), args.repeat)
+
+    # Peak memory: streaming keeps one month alive, a list keeps all of them
+    for label, fn in (
+        ("streamed", lambda: sum(1 for _ in iter_repayment_schedule(loans, budget, max_months=args.months))),
+        ("materialized", lambda: list(iter_repayment_schedule(loans, budget, max_months=args.months))),
+    ):
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"peak memory {label:<20} {peak / 1024:9.1f} KiB")
+
+    print(f"avalanche: debt free in {summary['months']} months, interest {summary['total_interest']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark engineered CSV parsing: serial vs chunked worker-pool parsing.
+
+Generates a synthetic engineered dataset and parses it with the pool
+disabled and with 2..N workers. Speedup needs more than one CPU.
+
+    python benchmarks/bench_engineered_parse.py [--rows 200000] [--workers 4]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_parser  # noqa: E402
+from engineered_dataset import EXPENSE_COLUMNS  # noqa: E402
+
+
+def make_csv(rows: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    header = ["income", "age", "dependents", "occupation"] + EXPENSE_COLUMNS + ["savings"]
+    income = rng.uniform(20_000, 200_000, rows).round(2)
+    expenses = rng.uniform(0, 0.1, (rows, len(EXPENSE_COLUMNS))) * income[:, None]
+    expenses[rng.random(expenses.shape) < 0.05] = 0
+    savings = (income - expenses.sum(axis=1)).clip(min=0)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([h.title() for h in header])
+    for i in range(rows):
+        writer.writerow([income[i], 25 + i % 40, i % 4, "Professional", *expenses[i].round(2), round(savings[i], 2)])
+    return buf.getvalue().encode()
+
+
+def parse(content: bytes, parallel_min_rows: int) -> dict:
+    lines = iter(file_parser.iter_text_lines(io.BytesIO(content), max_bytes=None))
+    fieldnames, _ = file_parser.iter_csv_rows(lines)
+    return file_parser.parse_engineered_csv(fieldnames, lines, max_rows=None, parallel_min_rows=parallel_min_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--executor", default="process", choices=["process", "thread"])
+    args = parser.parse_args()
+
+    content = make_csv(args.rows)
+    print(f"{args.rows} rows, {len(content) / 1024 / 1024:.1f} MiB, {os.cpu_count()} CPUs")
+
+    file_parser.PARSE_EXECUTOR = "serial"
+    start = time.perf_counter()
+    data = parse(content, parallel_min_rows=args.rows + 1)
+    serial = time.perf_counter() - start
+    print(f"{'serial':<12} {serial:7.2f} s   {len(data['expenses'])} expenses")
+
+    file_parser.PARSE_EXECUTOR = args.executor
+    for workers in range(2, max(2, args.workers) + 1):
+        file_parser.PARSE_MAX_WORKERS = workers
+        # The pool is long-lived in the app; start it outside the timed run
+        file_parser.shutdown_worker_pool()
+        file_parser._worker_pool().submit(int).result()
+        start = time.perf_counter()
+        parse(content, parallel_min_rows=0)
+        elapsed = time.perf_counter() - start
+        print(f"{workers} workers    {elapsed:7.2f} s   speedup {serial / elapsed:4.2f}x")
+    file_parser.shutdown_worker_pool()
+
+
+if __name__ == "__main__":
+    main()
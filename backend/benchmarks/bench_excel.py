@@ -0,0 +1,84 @@
+"""
+Benchmark Excel upload parsing: full workbook load vs read-only streaming.
+
+Generates an expenses workbook (default 100k rows) and compares the previous
+approach (full-mode load_workbook + iter_rows) with FileParser.parse_file,
+which streams rows in read-only mode.
+
+    python benchmarks/bench_excel.py [--rows 100000] [--repeat 1]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_parser import FileParser  # noqa: E402
+
+
+def make_workbook(rows: int) -> bytes:
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Expenses")
+    ws.append(["Date", "Category", "Amount"])
+    categories = ["Food", "Rent", "Transport", "Utilities", "Entertainment"]
+    start = datetime(2024, 1, 1)
+    for i in range(rows):
+        ws.append([start + timedelta(days=i % 365), categories[i % len(categories)], float(i % 5000) + 0.5])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def parse_full_mode(content: bytes) -> dict:
+    """The pre-streaming implementation: whole cell model in memory"""
+    wb = openpyxl.load_workbook(BytesIO(content), data_only=True)
+    sheet = wb.active
+    fieldnames = [str(cell.value).lower().strip() for cell in sheet[1]]
+    rows = [dict(zip(fieldnames, r)) for r in sheet.iter_rows(min_row=2, values_only=True)]
+    expenses = [
+        {"date": str(r["date"]), "category": str(r["category"]), "amount": float(r["amount"])}
+        for r in rows
+    ]
+    return {"expenses": expenses}
+
+
+def parse_read_only(content: bytes) -> dict:
+    return FileParser.parse_file(content, "bench.xlsx")
+
+
+def measure(fn, content: bytes, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        best = min(best, time.perf_counter() - start)
+    # Separate run for memory, since tracing slows parsing down
+    tracemalloc.start()
+    result = fn(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(result["expenses"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    content = make_workbook(args.rows)
+    print(f"{args.rows} rows, {len(content) / 1024 / 1024:.1f} MiB workbook")
+
+    for label, fn in (("full mode (before)", parse_full_mode), ("read-only stream", parse_read_only)):
+        seconds, peak, count = measure(fn, content, args.repeat)
+        print(f"{label:<20} {seconds:7.2f} s   peak {peak / 1024 / 1024:8.1f} MiB   {count} expenses")
+
+
+if __name__ == "__main__":
+    main()
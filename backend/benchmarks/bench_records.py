@@ -0,0 +1,53 @@
+"""
+Measure memory per record: plain dicts vs the __slots__ records in records.py.
+
+Builds the same expense/investment lists both ways (default 220k expenses,
+the size of a 20k-row engineered upload) and reports traced bytes per record.
+
+    python benchmarks/bench_records.py [--count 220000]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Transaction, Investment  # noqa: E402
+
+DATES = [f"2025-01-{d:02d}" for d in range(1, 29)]
+CATEGORIES = ["Rent", "Groceries", "Transport", "Eating Out", "Utilities", "Healthcare"]
+TYPES = ["Stocks", "Mutual Funds", "Fixed Deposits", "Gold"]
+
+
+def measure(build, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(items) == count
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=220_000)
+    args = parser.parse_args()
+
+    # Amount floats are created fresh per record in both cases, as in the parser
+    cases = {
+        "expense dict": lambda n: [{"date": DATES[i % 28], "category": CATEGORIES[i % 6], "amount": i * 1.5} for i in range(n)],
+        "Transaction": lambda n: [Transaction(DATES[i % 28], CATEGORIES[i % 6], i * 1.5) for i in range(n)],
+        "investment dict": lambda n: [{"type": TYPES[i % 4], "amount": i * 1.5, "annual_return": i * 0.5} for i in range(n)],
+        "Investment": lambda n: [Investment(TYPES[i % 4], i * 1.5, i * 0.5) for i in range(n)],
+    }
+    results = {name: measure(build, args.count) for name, build in cases.items()}
+    for name, per_record in results.items():
+        print(f"{name:<16} {per_record:7.1f} bytes/record   {per_record * args.count / 1024 / 1024:7.1f} MiB total")
+    print(f"expenses:    {1 - results['Transaction'] / results['expense dict']:.0%} smaller")
+    print(f"investments: {1 - results['Investment'] / results['investment dict']:.0%} smaller")
+
+
+if __name__ == "__main__":
+    main()
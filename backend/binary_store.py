@@ -0,0 +1,254 @@
+"""
+Binary on-disk format for parsed datasets (.fgb):
+
+    b"FGB\\x01" | uint32 header length | JSON header | padding to 8 bytes | column data
+
+Large uniform lists are stored column by column; everything else stays in the header JSON.
+"""
+import gc
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from records import Record, Transaction, Investment, Goal, json_default
+from config import BINARY_STORE_COMPRESS
+
+MAGIC = b"FGB\x01"
+VERSION = 1
+_ALIGN = 8
+
+# Lists shorter than this are cheaper to keep in the JSON header
+MIN_COLUMNAR_ROWS = 16
+
+# Record classes restored on load, by field tuple
+RECORD_TYPES = {cls._fields: cls for cls in (Transaction, Investment, Goal)}
+
+_DTYPES = {"f8": "<f8", "i8": "<i8", "str": "<i4"}
+
+
+def _column_kind(values: List[Any]) -> Optional[str]:
+    """"str", "i8" or "f8" if every value fits one column type, else None"""
+    if all(type(v) is str for v in values):
+        return "str"
+    if all(type(v) is int for v in values):
+        if all(-2**63 <= v < 2**63 for v in values):
+            return "i8"
+        return None
+    if all(type(v) in (int, float) for v in values):
+        return "f8"
+    return None
+
+
+def _split_table(items: List[Any]) -> Optional[Tuple[Tuple[str, ...], List[List[Any]], List[str]]]:
+    """(fields, columns, kinds) if `items` is a list of same-shaped flat mappings"""
+    if len(items) < MIN_COLUMNAR_ROWS or not all(isinstance(item, (dict, Record)) for item in items):
+        return None
+    fields = tuple(items[0])
+    if not fields or any(tuple(item) != fields for item in items):
+        return None
+    columns = [[item[f] for item in items] for f in fields]
+    kinds = [_column_kind(column) for column in columns]
+    if any(kind is None for kind in kinds):
+        return None
+    return fields, columns, kinds
+
+
+def write_dataset(data: Dict[str, Any], path: str, compress: bool = BINARY_STORE_COMPRESS) -> int:
+    """Write `data` to `path` atomically; returns the file size in bytes"""
+    data = materialize(data)
+    strings: List[str] = []
+    string_codes: Dict[str, int] = {}
+    tables: Dict[str, Any] = {}
+    rest: Dict[str, Any] = {}
+    blocks: List[bytes] = []
+    offset = 0
+
+    for key, value in data.items():
+        split = _split_table(value) if isinstance(value, list) else None
+        if split is None:
+            rest[key] = value
+            continue
+        fields, columns, kinds = split
+        specs = []
+        for column, kind in zip(columns, kinds):
+            if kind == "str":
+                codes = []
+                for s in column:
+                    code = string_codes.get(s)
+                    if code is None:
+                        code = string_codes[s] = len(strings)
+                        strings.append(s)
+                    codes.append(code)
+                array = np.asarray(codes, dtype=_DTYPES[kind])
+            else:
+                array = np.asarray(column, dtype=_DTYPES[kind])
+            raw = array.tobytes()
+            if compress:
+                raw = zlib.compress(raw, 1)
+            # Keep every block 8-byte aligned so uncompressed columns can be viewed in place
+            padding = -len(raw) % _ALIGN
+            specs.append({"dtype": kind, "offset": offset, "nbytes": len(raw)})
+            blocks.append(raw + b"\0" * padding)
+            offset += len(raw) + padding
+        record = RECORD_TYPES.get(fields)
+        tables[key] = {
+            "rows": len(value),
+            "fields": list(fields),
+            "record": record.__name__ if record else None,
+            "columns": specs,
+        }
+
+    header = json.dumps({
+        "version": VERSION,
+        "compression": "zlib" if compress else None,
+        "strings": strings,
+        "tables": tables,
+        "data": rest,
+    }, default=json_default, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % _ALIGN)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(prefix)
+            for block in blocks:
+                f.write(block)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return len(prefix) + offset
+
+
+class _LazyTable:
+    """Placeholder for a columnar list that has not been decoded yet"""
+
+    __slots__ = ("spec", "buffer", "base", "strings", "compressed")
+
+    def __init__(self, spec: Dict[str, Any], buffer, base: int, strings: List[str], compressed: bool):
+        self.spec = spec
+        self.buffer = buffer
+        self.base = base
+        self.strings = strings
+        self.compressed = compressed
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c["nbytes"] for c in self.spec["columns"])
+
+    def _column(self, column: Dict[str, Any]) -> List[Any]:
+        rows = self.spec["rows"]
+        dtype = np.dtype(_DTYPES[column["dtype"]])
+        start = self.base + column["offset"]
+        if self.compressed:
+            array = np.frombuffer(zlib.decompress(self.buffer[start:start + column["nbytes"]]), dtype=dtype, count=rows)
+        else:
+            array = np.frombuffer(self.buffer, dtype=dtype, count=rows, offset=start)
+        if column["dtype"] == "str":
+            return np.asarray(self.strings, dtype=object)[array].tolist() if rows else []
+        return array.tolist()
+
+    def decode(self) -> List[Any]:
+        columns = [self._column(c) for c in self.spec["columns"]]
+        record = RECORD_TYPES.get(tuple(self.spec["fields"]))
+        fields = self.spec["fields"]
+        # Rows only hold strings and numbers, so they cannot form cycles; without
+        # this, allocating them triggers collections that rescan the whole heap
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if record is not None:
+                return list(map(record, *columns))
+            return [dict(zip(fields, row)) for row in zip(*columns)]
+        finally:
+            if was_enabled:
+                gc.enable()
+
+
+class LazyDataset(dict):
+    """Dataset dict whose columnar lists are decoded on first access; `materialize()` decodes them all"""
+
+    def _resolve(self, key: Any, value: Any) -> Any:
+        if isinstance(value, _LazyTable):
+            value = value.decode()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._resolve(key, dict.__getitem__(self, key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def __iter__(self):
+        # Defining __iter__ keeps dict(lazy) / {**lazy} off the raw-copy fast path
+        return dict.__iter__(self)
+
+    def items(self):
+        return [(key, self[key]) for key in dict.keys(self)]
+
+    def values(self):
+        return [self[key] for key in dict.keys(self)]
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def pending_keys(self) -> List[str]:
+        """Keys whose lists have not been decoded yet"""
+        return [key for key, value in dict.items(self) if isinstance(value, _LazyTable)]
+
+    def pending_nbytes(self) -> int:
+        """Encoded size of the lists that have not been decoded yet"""
+        return sum(value.nbytes for value in dict.values(self) if isinstance(value, _LazyTable))
+
+    def loaded_items(self) -> List[Tuple[Any, Any]]:
+        """Items whose values are already decoded, without decoding the rest"""
+        return [(key, value) for key, value in dict.items(self) if not isinstance(value, _LazyTable)]
+
+    def materialize(self) -> Dict[str, Any]:
+        """Plain dict with every list decoded"""
+        return dict(self.items())
+
+    def __reduce__(self):
+        return (dict, (self.materialize(),))
+
+
+def materialize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a fully decoded plain dict for `data` (no-op for ordinary dicts)"""
+    return data.materialize() if isinstance(data, LazyDataset) else data
+
+
+def read_dataset(path: str, lazy: bool = True) -> Dict[str, Any]:
+    """Load a dataset written by `write_dataset`, memory-mapped and decoded on access when `lazy`"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is empty")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if buffer[:4] != MAGIC:
+            raise ValueError(f"{path} is not a binary dataset")
+        (header_len,) = struct.unpack_from("<I", buffer, 4)
+        header = json.loads(buffer[8:8 + header_len])
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported binary dataset version: {header.get('version')}")
+    except Exception:
+        buffer.close()
+        raise
+    base = 8 + header_len
+    base += -base % _ALIGN
+
+    compressed = header.get("compression") == "zlib"
+    data = LazyDataset(header["data"])
+    for key, spec in header["tables"].items():
+        dict.__setitem__(data, key, _LazyTable(spec, buffer, base, header["strings"], compressed))
+    return data if lazy else data.materialize()
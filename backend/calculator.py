@@ -1,3 +1,6 @@
+import math
+import numpy as np
+
 def budget_allocation(income: float):
     return {
         "needs": income * 0.5,
@@ -11,20 +14,76 @@ def emergency_fund(monthly_expenses: float):
     }
 
 def debt_payoff(principal: float, annual_interest_rate: float, monthly_payment: float):
-    monthly_rate = annual_interest_rate / 12 / 100
-    balance = principal
-    months = 0
-    total_interest = 0.0
+    batch = debt_payoff_batch(principal, annual_interest_rate, monthly_payment)
+    if not batch["feasible"][0]:
+        return {
+            "months_to_payoff": None,
+            "total_interest": None,
+            "error": "Monthly payment does not cover the monthly interest"
+        }
+    return {
+        "months_to_payoff": int(batch["months_to_payoff"][0]),
+        "total_interest": float(batch["total_interest"][0])
+    }
 
-    while balance > 0 and months < 1000:
-        interest = balance * monthly_rate
-        total_interest += interest
-        balance += interest - monthly_payment
-        months += 1
+def debt_payoff_batch(principal, annual_interest_rate, monthly_payment):
+    """Closed-form payoff for broadcast arrays of loans; NaN months and interest where infeasible"""
+    balance, annual, payment = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_interest_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(monthly_payment, dtype=np.float64)),
+    )
+    r = annual / 12 / 100
+    paid_off = balance <= 0
+    feasible = paid_off | ((payment > 0) & (payment > balance * r))
 
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # n = -ln(1 - rB/P) / ln(1 + r); for r = 0 it is simply B/P
+        exact = np.where(r > 0, -np.log1p(-r * balance / payment) / np.log1p(r), balance / payment)
+        # Tolerance absorbs float noise when the payoff lands exactly on a month boundary
+        months = np.where(paid_off, 0, np.ceil(exact - 1e-9))
+
+        # Balance left before the final (partial) payment
+        k = np.maximum(months - 1, 0)
+        growth = (1 + r) ** k
+        remaining = np.where(r > 0, balance * growth - payment * (growth - 1) / r, balance - payment * k)
+        total_interest = np.where(paid_off, 0.0, k * payment + remaining * (1 + r) - balance)
+
+    months = np.where(feasible, months, np.nan)
+    total_interest = np.where(feasible, total_interest, np.nan)
     return {
         "months_to_payoff": months,
-        "total_interest": total_interest
+        "total_interest": total_interest,
+        "feasible": feasible
+    }
+
+def amortization_schedule(principal, annual_interest_rate, monthly_payment, max_months: int = 360):
+    """Month-by-month payment, interest, principal and balance as (loans, months) matrices, zero after payoff"""
+    balance, annual, payment = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_interest_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(monthly_payment, dtype=np.float64)),
+    )
+    r = (annual / 12 / 100)[:, None]
+    B = balance[:, None]
+    P = payment[:, None]
+    t = np.arange(max_months + 1)[None, :]
+
+    # Closed-form balance after t payments, clipped once the loan is repaid
+    growth = (1 + r) ** t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balances = np.where(r > 0, B * growth - P * (growth - 1) / np.where(r > 0, r, 1), B - P * t)
+    # Past payoff the closed form goes negative; those months carry a zero balance
+    balances = np.maximum(balances, 0)
+
+    opening = balances[:, :-1]
+    interest = opening * r
+    payments = np.minimum(P, opening + interest)
+    return {
+        "payment": payments,
+        "interest": interest,
+        "principal": payments - interest,
+        "balance": balances[:, 1:]
     }
 
 def investment_growth(principal: float, annual_return_rate: float, years: int):
@@ -36,8 +95,14 @@ def investment_growth(principal: float, annual_return_rate: float, years: int):
 def mortgage_payment(loan_amount: float, annual_interest_rate: float, years: int):
     r = annual_interest_rate / 12 / 100
     n = years * 12
+    if n <= 0:
+        raise ValueError("years must be positive")
 
-    monthly_payment = loan_amount * r * (1 + r) ** n / ((1 + r) ** n - 1)
+    if r == 0:
+        # A zero rate degenerates to straight-line repayment, as in mortgage_payment_grid
+        monthly_payment = loan_amount / n
+    else:
+        monthly_payment = loan_amount * r * (1 + r) ** n / ((1 + r) ** n - 1)
     total_cost = monthly_payment * n
 
     return {
@@ -45,3 +110,74 @@ def mortgage_payment(loan_amount: float, annual_interest_rate: float, years: int
         "total_cost": total_cost,
         "total_interest": total_cost - loan_amount
     }
+
+def sweep_axis_length(spec) -> int:
+    """Number of points `sweep_axis(spec)` would produce, computed without allocating them"""
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        if not (math.isfinite(start) and math.isfinite(stop)):
+            raise ValueError("Range start and stop must be finite")
+        if "num" in spec:
+            num = int(spec["num"])
+            if num < 0:
+                raise ValueError("Range num must not be negative")
+            return num
+        step = float(spec.get("step", 1))
+        if not step > 0:
+            raise ValueError("Range step must be positive")
+        return max(math.floor((stop - start) / step + 1e-9) + 1, 0)
+    if isinstance(spec, (list, tuple)):
+        return len(spec)
+    return 1
+
+def sweep_axis(spec, max_points=None):
+    """
+    Expand a number, a list or a {"start", "stop", "step" | "num"} range into a 1-D array.
+    Raises ValueError before allocating when the axis would exceed `max_points`.
+    """
+    count = sweep_axis_length(spec)
+    if max_points is not None and count > max_points:
+        raise ValueError(f"Axis has {count} points (limit {max_points})")
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        if "num" in spec:
+            return np.linspace(start, stop, count)
+        return start + float(spec.get("step", 1)) * np.arange(count)
+    return np.atleast_1d(np.asarray(spec, dtype=np.float64))
+
+def _grid(*axes):
+    """Reshape 1-D axes so they broadcast into their Cartesian grid"""
+    ndim = len(axes)
+    return [
+        np.asarray(axis, dtype=np.float64).reshape([-1 if i == j else 1 for j in range(ndim)])
+        for i, axis in enumerate(axes)
+    ]
+
+def investment_growth_grid(principal, annual_return_rate, years):
+    """`investment_growth` over every (principal, rate, years) combination; arrays are (P, R, Y)"""
+    P, rate, n = _grid(principal, annual_return_rate, years)
+    return {
+        "future_value": P * (1 + rate / 100) ** n
+    }
+
+def mortgage_payment_grid(loan_amount, annual_interest_rate, years):
+    """`mortgage_payment` over every (amount, rate, years) combination; arrays are (L, R, Y)"""
+    L, annual, Y = _grid(loan_amount, annual_interest_rate, years)
+    r = annual / 12 / 100
+    n = Y * 12
+    growth = (1 + r) ** n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A zero rate degenerates to straight-line repayment
+        monthly_payment = np.where(r > 0, L * r * growth / (growth - 1), L / n)
+    total_cost = monthly_payment * n
+    return {
+        "monthly_payment": monthly_payment,
+        "total_cost": total_cost,
+        "total_interest": total_cost - L
+    }
+
+# Sweepable functions and the order of their grid axes
+SWEEP_FUNCTIONS = {
+    "investment_growth": (investment_growth_grid, ["principal", "annual_return_rate", "years"]),
+    "mortgage_payment": (mortgage_payment_grid, ["loan_amount", "annual_interest_rate", "years"]),
+}
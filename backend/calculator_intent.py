@@ -0,0 +1,174 @@
+"""Local intent and parameter extraction for calculator queries, so clear queries skip the LLM"""
+import re
+from typing import Any, Dict, List, Optional
+
+# Map function names/keywords (from the LLM or the local parser) to internal functions
+FUNCTION_ALIASES = {
+    "budget": "budget_allocation",
+    "budgeting": "budget_allocation",
+    "emergency": "emergency_fund",
+    "emergency_fund": "emergency_fund",
+    "debt": "debt_payoff",
+    "debt_payoff": "debt_payoff",
+    "investment": "investment_growth",
+    "invest": "investment_growth",
+    "mortgage": "mortgage_payment",
+    "loan": "mortgage_payment"
+}
+
+# Allowed parameters per function
+PARAM_WHITELIST = {
+    "budget_allocation": {"income"},
+    "emergency_fund": {"monthly_expenses"},
+    "debt_payoff": {"principal", "annual_interest_rate", "monthly_payment"},
+    "investment_growth": {"principal", "annual_return_rate", "years"},
+    "mortgage_payment": {"loan_amount", "annual_interest_rate", "years"},
+}
+
+# Extra keywords per function on top of FUNCTION_ALIASES
+_KEYWORDS = {
+    "budget_allocation": ["50/30/20", "allocate", "split my salary", "split my income"],
+    "emergency_fund": ["rainy day", "contingency"],
+    "debt_payoff": ["pay off", "payoff", "credit card", "repay", "clear my"],
+    "investment_growth": ["grow", "growth", "future value", "compound", "returns", "fd", "fixed deposit"],
+    "mortgage_payment": ["home loan", "emi", "housing loan", "car loan"],
+}
+
+_UNIT_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "m": 1e6, "mn": 1e6, "million": 1e6,
+}
+
+_QUANTITY = re.compile(
+    r"(?:(?:₹|rs\.?|inr|\$)\s*)?"
+    r"(?P<num>(?:\d[\d,]*(?:\.\d+)?|\.\d+)(?:e[+-]?\d+)?)\s*"
+    r"(?P<unit>%|percent\b|per\s*cent\b|k\b|thousand\b|lakhs?\b|lacs?\b|crores?\b|cr\b|million\b|mn\b|m\b"
+    r"|years?\b|yrs?\b|months?\b|mos?\b)?",
+    re.IGNORECASE,
+)
+
+_MONTHLY_AFTER = re.compile(r"^\s*(?:/\s*m(?:onth|o)?\b|per\s+month\b|a\s+month\b|monthly\b|every\s+month\b|pm\b|p\.m\.)", re.IGNORECASE)
+_MONTHLY_BEFORE = re.compile(r"(?:monthly|emi\s+of|paying|pay|payment\s+of|installment\s+of)\s*(?:₹|rs\.?|inr|\$)?\s*$", re.IGNORECASE)
+
+
+def extract_quantities(query: str) -> List[Dict[str, Any]]:
+    """Numbers in `query` with their `kind`: percent, years (months converted), monthly_amount or amount"""
+    quantities = []
+    for match in _QUANTITY.finditer(query):
+        value = float(match.group("num").replace(",", ""))
+        unit = (match.group("unit") or "").lower().replace(" ", "")
+        if unit in ("%", "percent"):
+            kind = "percent"
+        elif unit.startswith(("year", "yr")):
+            kind = "years"
+        elif unit.startswith(("month", "mo")):
+            kind = "years"
+            value = value / 12
+        else:
+            value *= _UNIT_MULTIPLIERS.get(unit, 1)
+            monthly = _MONTHLY_AFTER.match(query[match.end():]) or _MONTHLY_BEFORE.search(query[:match.start()])
+            kind = "monthly_amount" if monthly else "amount"
+        quantities.append({"value": value, "kind": kind, "start": match.start()})
+    return quantities
+
+
+def detect_functions(query: str) -> Dict[str, int]:
+    """Keyword hit counts per calculator function"""
+    q = query.lower()
+    scores: Dict[str, int] = {}
+    keywords = {name: list(words) for name, words in _KEYWORDS.items()}
+    for alias, name in FUNCTION_ALIASES.items():
+        keywords.setdefault(name, []).append(alias)
+    for name, words in keywords.items():
+        hits = sum(1 for w in words if re.search(r"(?<![a-z])" + re.escape(w), q))
+        if hits:
+            scores[name] = hits
+    return scores
+
+
+def _pick_function(scores: Dict[str, int], quantities: List[Dict[str, Any]]) -> Optional[str]:
+    if not scores:
+        return None
+    kinds = {q["kind"] for q in quantities}
+    # "loan" alone is ambiguous: a fixed monthly payment without a term is a payoff question
+    if "mortgage_payment" in scores and "monthly_amount" in kinds and "years" not in kinds:
+        scores = dict(scores, debt_payoff=scores.get("debt_payoff", 0) + 2)
+    if "debt_payoff" in scores and "years" in kinds and "monthly_amount" not in kinds:
+        scores = dict(scores, mortgage_payment=scores.get("mortgage_payment", 0) + 1)
+    best = max(scores.values())
+    winners = [name for name, score in scores.items() if score == best]
+    return winners[0] if len(winners) == 1 else None
+
+
+def _take(quantities: List[Dict[str, Any]], kind: str) -> Optional[float]:
+    for q in quantities:
+        if q["kind"] == kind and not q.get("used"):
+            q["used"] = True
+            return q["value"]
+    return None
+
+
+def _take_amount(quantities: List[Dict[str, Any]], prefer_largest: bool = True) -> Optional[float]:
+    amounts = [q for q in quantities if q["kind"] == "amount" and not q.get("used")]
+    if not amounts:
+        return None
+    chosen = max(amounts, key=lambda q: q["value"]) if prefer_largest else amounts[0]
+    chosen["used"] = True
+    return chosen["value"]
+
+
+def _take_either(quantities: List[Dict[str, Any]], first: str, second: str) -> Optional[float]:
+    """Take a quantity of kind `first`, else of kind `second`; a stated 0 counts as found"""
+    for kind in (first, second):
+        value = _take_amount(quantities) if kind == "amount" else _take(quantities, kind)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_calculator_query(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolve `query` to {"function_name", "parameters", "confidence"}, or None when no function matched.
+    Confidence is 1.0 only when every parameter was filled and no numbers were left over.
+    """
+    scores = detect_functions(query)
+    # The rule name is a keyword, not a set of amounts
+    quantities = extract_quantities(query.replace("50/30/20", " "))
+    function_name = _pick_function(scores, quantities)
+    if function_name is None:
+        return None
+
+    params: Dict[str, Optional[float]] = {}
+    if function_name == "budget_allocation":
+        params["income"] = _take_either(quantities, "amount", "monthly_amount")
+    elif function_name == "emergency_fund":
+        params["monthly_expenses"] = _take_either(quantities, "monthly_amount", "amount")
+    elif function_name == "debt_payoff":
+        params["principal"] = _take_amount(quantities)
+        params["annual_interest_rate"] = _take(quantities, "percent")
+        params["monthly_payment"] = _take_either(quantities, "monthly_amount", "amount")
+    elif function_name == "investment_growth":
+        params["principal"] = _take_amount(quantities)
+        params["annual_return_rate"] = _take(quantities, "percent")
+        years = _take(quantities, "years")
+        params["years"] = int(years) if years is not None and years == int(years) else years
+    elif function_name == "mortgage_payment":
+        params["loan_amount"] = _take_amount(quantities)
+        params["annual_interest_rate"] = _take(quantities, "percent")
+        years = _take(quantities, "years")
+        params["years"] = int(years) if years is not None and years == int(years) else years
+
+    required = PARAM_WHITELIST[function_name]
+    filled = {k: v for k, v in params.items() if v is not None and k in required}
+    leftovers = sum(1 for q in quantities if not q.get("used"))
+
+    confidence = len(filled) / len(required)
+    if leftovers:
+        confidence *= 0.5
+    return {
+        "function_name": function_name,
+        "parameters": filled,
+        "confidence": confidence,
+    }
@@ -0,0 +1,136 @@
+"""Column-wise type inference and coercion for uploaded tables"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Tokens stripped from numeric cells before validation (matched case-insensitively)
+CURRENCY_TOKENS = ("₹", "$", "€", "£", "¥", "rs.", "rs", "inr", "usd", "%", ",", "_", " ")
+
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?")
+_DATE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}(?:[ t].*)?|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}")
+
+# Fraction of non-blank sample cells that must match for a type to be inferred
+INFER_THRESHOLD = 0.9
+INFER_SAMPLE = 200
+
+
+def _blank_mask(arr: np.ndarray) -> np.ndarray:
+    return np.equal(arr, None) | np.equal(arr, "")
+
+
+def clean_numeric_text(values: Sequence[Any]) -> np.ndarray:
+    """Lowercased string array with currency symbols/separators removed and (x) turned into -x"""
+    text = np.char.lower(np.char.strip(np.asarray(values, dtype=object).astype(str)))
+    for token in CURRENCY_TOKENS:
+        text = np.char.replace(text, token, "")
+    negative = np.char.startswith(text, "(") & np.char.endswith(text, ")")
+    if negative.any():
+        text[negative] = np.char.add("-", np.char.strip(text[negative], "()"))
+    return text
+
+
+def coerce_numeric(values: Sequence[Any], clean: Optional[bool] = None) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Convert a column to float64, returning (values, error_count, valid_mask).
+    Blank and unparseable cells become 0; only the latter count as errors.
+    """
+    arr = np.asarray(values, dtype=object)
+    n = len(arr)
+    if n == 0:
+        return np.zeros(0, dtype=np.float64), 0, np.zeros(0, dtype=bool)
+    blank = _blank_mask(arr)
+
+    if clean is not True:
+        try:
+            # One cast for the whole column; any dirty cell sends it to the cleaning path
+            out = np.where(blank, 0, arr).astype(np.float64)
+            if np.isfinite(out).all():
+                return out, 0, ~blank
+        except (TypeError, ValueError):
+            if clean is False:
+                raise
+
+    text = clean_numeric_text(arr)
+    valid = np.fromiter((_NUMBER.fullmatch(t) is not None for t in text), dtype=bool, count=n) & ~blank
+    out = np.zeros(n, dtype=np.float64)
+    if valid.any():
+        out[valid] = text[valid].astype(np.float64)
+    return out, int((~valid & ~blank).sum()), valid
+
+
+def infer_column_type(values: Iterable[Any], sample: int = INFER_SAMPLE) -> str:
+    """
+    Infer "empty", "number" (plain numerals), "currency" (numbers with symbols
+    or separators), "date" or "text" from up to `sample` non-blank cells.
+    """
+    cells = []
+    for v in values:
+        if v is None or v == "":
+            continue
+        cells.append(v)
+        if len(cells) >= sample:
+            break
+    if not cells:
+        return "empty"
+
+    threshold = INFER_THRESHOLD * len(cells)
+    if sum(1 for v in cells if isinstance(v, (int, float)) and not isinstance(v, bool)) >= threshold:
+        return "number"
+    text = [str(v).strip().lower() for v in cells]
+    if sum(1 for t in text if _NUMBER.fullmatch(t)) >= threshold:
+        return "number"
+    if sum(1 for t in clean_numeric_text(text) if _NUMBER.fullmatch(t)) >= threshold:
+        return "currency"
+    if sum(1 for t in text if _DATE.fullmatch(t)) >= threshold:
+        return "date"
+    return "text"
+
+
+class ColumnCoercer:
+    """Coerces a file's numeric columns chunk by chunk, inferring each type once and counting errors"""
+
+    def __init__(self):
+        self.types: Dict[str, str] = {}
+        self.errors: Dict[str, int] = {}
+        self.blanks: Dict[str, int] = {}
+
+    def numeric(self, name: str, values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """(float64 values, valid mask) for column `name`"""
+        column_type = self.types.get(name)
+        if column_type is None or column_type == "empty":
+            column_type = self.types[name] = infer_column_type(values)
+        out, errors, valid = coerce_numeric(values, clean=True if column_type == "currency" else None)
+        self.errors[name] = self.errors.get(name, 0) + errors
+        self.blanks[name] = self.blanks.get(name, 0) + int(len(values) - valid.sum() - errors)
+        return out, valid
+
+    def report(self, rows: int, skipped_rows: int = 0) -> Dict[str, Any]:
+        return {
+            "rows": rows,
+            "skipped_rows": skipped_rows,
+            "columns": {
+                name: {"type": self.types[name], "errors": self.errors.get(name, 0), "blanks": self.blanks.get(name, 0)}
+                for name in self.types
+            },
+        }
+
+
+def merge_reports(reports: List[Dict[str, Any]], prefixes: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
+    """
+    Combine ingest reports from several sheets or chunks. Column names are
+    qualified as "<prefix>.<column>" when a prefix is given for the report.
+    """
+    merged: Dict[str, Any] = {"rows": 0, "skipped_rows": 0, "columns": {}}
+    for i, report in enumerate(reports):
+        if not report:
+            continue
+        prefix = prefixes[i] if prefixes else None
+        merged["rows"] += report.get("rows", 0)
+        merged["skipped_rows"] += report.get("skipped_rows", 0)
+        for name, column in report.get("columns", {}).items():
+            if prefix:
+                name = f"{prefix}.{name}"
+            target = merged["columns"].setdefault(name, {"type": column["type"], "errors": 0, "blanks": 0})
+            target["errors"] += column["errors"]
+            target["blanks"] += column["blanks"]
+    return merged
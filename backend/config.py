@@ -9,3 +9,78 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Models confirmed available for your API key
 TEXT_MODEL = "models/gemini-2.0-flash"
 EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Process-wide dataset snapshot cache (see data_loader.SnapshotCache)
+DATA_CACHE_MAX_ENTRIES = int(os.getenv("DATA_CACHE_MAX_ENTRIES", "64"))
+DATA_CACHE_MAX_BYTES = int(os.getenv("DATA_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Engineered CSV history window. With ENGINEERED_READ_LATEST the window is read
+# from the end of the file (chronological order, newest row last).
+ENGINEERED_HISTORY_MONTHS = int(os.getenv("ENGINEERED_HISTORY_MONTHS", "12"))
+ENGINEERED_READ_LATEST = os.getenv("ENGINEERED_READ_LATEST", "false").lower() in ("1", "true", "yes")
+
+# Per-call timeout for Gemini requests made through llm_gateway
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+# LLM-backed panels requested through /dashboard/bundle are dropped after this long
+DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS", "8"))
+
+# Local cache directory (Vercel only allows writes under /tmp)
+CACHE_DIR = "/tmp/cache" if os.environ.get("VERCEL") else "cache"
+
+# Two-tier LLM response cache (see llm_cache.ResponseCache)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600)))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_DISK_MAX_BYTES = int(os.getenv("LLM_CACHE_DISK_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Semantic cache for /ask (see semantic_cache.SemanticCache)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_CAPACITY = int(os.getenv("SEMANTIC_CACHE_CAPACITY", "1024"))
+
+# Local vector index used for retrieval in rag.py (built offline with vector_store.py)
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector_index"))
+RAG_TOP_K = int(os.getenv("RAG_TOP_K", "4"))
+RAG_NPROBE = int(os.getenv("RAG_NPROBE", "4"))
+
+# Batched embedding requests (see embedding.get_embeddings)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+
+# Calculator queries parsed locally at or above this confidence skip the LLM
+LOCAL_PARSER_MIN_CONFIDENCE = float(os.getenv("LOCAL_PARSER_MIN_CONFIDENCE", "1.0"))
+
+# Upper bound on cells returned by the batch/sweep calculator endpoints
+CALCULATOR_MAX_CELLS = int(os.getenv("CALCULATOR_MAX_CELLS", "1000000"))
+
+# Monte Carlo goal simulation (see goal_simulation.py)
+MONTE_CARLO_PATHS = int(os.getenv("MONTE_CARLO_PATHS", "2000"))
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED", "42"))
+MONTE_CARLO_MAX_CELLS = int(os.getenv("MONTE_CARLO_MAX_CELLS", "5000000"))
+MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", "100000"))
+
+# Upload ingestion limits (see file_parser.FileParser.parse_stream)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+MAX_UPLOAD_ROWS = int(os.getenv("MAX_UPLOAD_ROWS", "1000000"))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+
+# Parallel upload parsing (workbook sheets, large engineered files): "process", "thread" or "serial"
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", os.getenv("SHEET_PARSE_EXECUTOR", "process")).lower()
+PARSE_MAX_WORKERS = int(os.getenv("PARSE_MAX_WORKERS", os.getenv("SHEET_PARSE_MAX_WORKERS", "4")))
+# Engineered CSVs with at least this many rows are parsed in chunks across workers
+ENGINEERED_PARALLEL_MIN_ROWS = int(os.getenv("ENGINEERED_PARALLEL_MIN_ROWS", "50000"))
+# Workbooks whose recognized sheets declare at least this many rows in total are parsed across workers
+SHEET_PARALLEL_MIN_ROWS = int(os.getenv("SHEET_PARALLEL_MIN_ROWS", "20000"))
+
+# Binary dataset files written for uploads (see binary_store.py); zlib-compress each column when true
+BINARY_STORE_COMPRESS = os.getenv("BINARY_STORE_COMPRESS", "false").lower() in ("1", "true", "yes")
+
+# Uploaded datasets held in memory (see dataset_store.DatasetStore); colder ones are reloaded from disk
+DATASET_STORE_MAX_BYTES = int(os.getenv("DATASET_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Background upload ingestion (/upload?async=1, see ingest_jobs.JobManager)
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "2"))
+# Jobs waiting for a worker beyond this are rejected with 503
+INGEST_MAX_QUEUED = int(os.getenv("INGEST_MAX_QUEUED", "16"))
+# Finished jobs kept for GET /jobs/{id}
+INGEST_JOB_RETENTION = int(os.getenv("INGEST_JOB_RETENTION", "256"))
@@ -1,8 +1,168 @@
 import json
 import csv
+import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, Tuple
 import os
+from itertools import islice
+from engineered_dataset import EngineeredDataset
+from records import Record
+from coercion import ColumnCoercer
+from aggregates import attach_aggregates, get_aggregates
+from binary_store import LazyDataset, read_dataset, write_dataset
+from config import (
+    DATA_CACHE_MAX_ENTRIES,
+    DATA_CACHE_MAX_BYTES,
+    ENGINEERED_HISTORY_MONTHS,
+    ENGINEERED_READ_LATEST,
+)
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate deep memory footprint of a JSON-like object (dicts, lists, records) in bytes"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, LazyDataset):
+            # Undecoded lists are still in the memory map; count their encoded size only
+            total += item.pending_nbytes()
+            for key, value in item.loaded_items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, Record):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class SnapshotCache:
+    """Process-wide LRU of parsed datasets keyed by (path, mtime, size), bounded by entries and bytes"""
+
+    def __init__(self, max_entries: int = DATA_CACHE_MAX_ENTRIES, max_bytes: int = DATA_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_key(path: str) -> Optional[Tuple[str, int, int]]:
+        """Return the (path, mtime, size) identity of `path`, or None if missing"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def get_or_load(self, path: str, loader: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the cached snapshot for `path`, building it with `loader` on a miss"""
+        key = self.file_key(path)
+        if key is None:
+            return loader(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        data = loader(path)
+        self._store(key, data)
+        return data
+
+    def _store(self, key: Tuple[str, int, int], data: Dict[str, Any]):
+        size = estimate_size(data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # Drop stale snapshots of the same file before inserting the new one
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                self._bytes -= self._entries.pop(old_key)[1]
+            self._entries[key] = (data, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, path: str):
+        """Drop every snapshot of `path`"""
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == abs_path]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every DataLoader in the process
+snapshot_cache = SnapshotCache()
+
+
+def _read_tail_lines(path: str, count: int, block_size: int = 64 * 1024) -> List[str]:
+    """Return the last `count` non-empty lines of `path` without scanning the whole file"""
+    lines: List[bytes] = []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        # Bytes before the first newline seen so far; only complete once the block before it is read
+        head = b""
+        while pos > 0 and len(lines) < count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            parts = (f.read(step) + head).split(b"\n")
+            head = parts[0]
+            lines[:0] = [line for line in parts[1:] if line.strip()]
+    # `head` is now either a partial line or, when the whole file was read, the header
+    return [line.rstrip(b"\r").decode('utf-8') for line in lines[-count:]] if count > 0 else []
+
+
+def read_engineered_window(path: str, limit: int, latest: bool = False) -> List[Dict[str, str]]:
+    """
+    Read at most `limit` rows of an engineered CSV, latest month first.
+    With `latest=True` the file is chronological and its tail is read backwards.
+    """
+    with open(path, mode='r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        # Normalize fieldnames to lowercase
+        reader.fieldnames = [name.lower().strip() for name in reader.fieldnames] if reader.fieldnames else []
+        if not latest:
+            return list(islice(reader, limit))
+        fieldnames = reader.fieldnames
+
+    tail = _read_tail_lines(path, limit)
+    rows = [dict(zip(fieldnames, values)) for values in csv.reader(tail)]
+    rows.reverse()
+    return rows
+
 
 class DataLoader:
     """Load and manage user financial data"""
@@ -12,55 +172,76 @@ class DataLoader:
         # Use /tmp on Vercel for temporary file access
         base_dir = "/tmp/user_data" if os.environ.get("VERCEL") else "user_data"
         self.data_file = f"{base_dir}/{user_id}.json"
+        self.binary_file = f"{base_dir}/{user_id}.fgb"
         self.data = self.load_user_data()
     
     def load_user_data(self) -> Dict[str, Any]:
-        """Load user data from JSON file, engineered CSV, or return sample data"""
+        """Load user data from binary or JSON file, engineered CSV, or return sample data"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
+            # Saves write the binary file, but the JSON file may be edited by hand afterwards:
+            # whichever was written last wins
+            candidates = [
+                (os.path.getmtime(path), path, reader)
+                for path, reader in ((self.binary_file, self._read_binary), (self.data_file, self._read_json))
+                if os.path.exists(path)
+            ]
+            if candidates:
+                _, path, reader = max(candidates, key=lambda c: c[0])
+                return snapshot_cache.get_or_load(path, reader)
         except Exception as e:
             print(f"Error loading data: {e}")
         
         # Try loading from engineered_data.csv (module-relative) or legacy engineered_data.csv
         try:
             engineered_path = os.path.join(os.path.dirname(__file__), "engineered_data.csv")
-            if os.path.exists(engineered_path):
-                return self.load_from_engineered_csv(engineered_path)
-            if os.path.exists("engineered_data.csv"):
+            if not os.path.exists(engineered_path) and os.path.exists("engineered_data.csv"):
                 # legacy filename support (cwd-based)
-                return self.load_from_engineered_csv(os.path.abspath("engineered_data.csv"))
+                engineered_path = os.path.abspath("engineered_data.csv")
+            if os.path.exists(engineered_path):
+                snapshot = snapshot_cache.get_or_load(engineered_path, self.load_from_engineered_csv)
+                # The snapshot is shared between users; only the owner field differs
+                return dict(snapshot, user_id=self.user_id)
         except Exception as e:
             print(f"Error loading engineered data: {e}")
         
         # Return sample data if file doesn't exist
         return self.get_sample_data()
     
-    def load_from_engineered_csv(self, path: str) -> Dict[str, Any]:
-        """Load and parse the engineered CSV file at relative or absolute `path`"""
-        rows = []
+    @staticmethod
+    def _read_json(path: str) -> Dict[str, Any]:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        # Files written before aggregates existed get them computed once here
+        get_aggregates(data)
+        return data
+
+    @staticmethod
+    def _read_binary(path: str) -> Dict[str, Any]:
+        data = read_dataset(path)
+        get_aggregates(data)
+        return data
+
+    def load_from_engineered_csv(
+        self,
+        path: str,
+        history_limit: int = ENGINEERED_HISTORY_MONTHS,
+        latest: bool = ENGINEERED_READ_LATEST,
+    ) -> Dict[str, Any]:
+        """Load and parse the history window of the engineered CSV file at relative or absolute `path`"""
+        # We will treat consecutive rows as a time series for "Monthly History".
+        # Take up to `history_limit` rows (12 by default) to simulate the last year.
         try:
-            with open(path, mode='r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                # Normalize fieldnames to lowercase
-                reader.fieldnames = [name.lower().strip() for name in reader.fieldnames] if reader.fieldnames else []
-                for row in reader:
-                    rows.append(row)
+            history_rows = read_engineered_window(path, history_limit, latest)
         except Exception as e:
             print(f"Failed to read CSV at {path}: {e}")
             return self.get_sample_data()
 
-        # We will treat consecutive rows as a time series for "Monthly History".
-        # Let's take up to 12 rows to simulate the last year.
-        
-        num_rows = len(rows)
-        if num_rows == 0:
+        if not history_rows:
             return self.get_sample_data()
-        
-        # Take up to 12 rows for history
-        history_limit = 12
-        history_rows = rows[:history_limit]
+
+        # Columnar view used for all numeric reductions below
+        coercer = ColumnCoercer()
+        dataset = EngineeredDataset.from_rows(history_rows, coercer=coercer)
         
         # Generate month labels ending with current month (Dec)
         # 12 months ago to now
@@ -97,38 +278,29 @@ class DataLoader:
         latest_row = history_rows[0]
         
         # Build Monthly History (chronological for charts)
-        # We need to reverse the slice so index 0 is the oldest, and last index is current month.
-        chronological_rows = history_rows[::-1]
+        # We need to reverse the columns so index 0 is the oldest, and last index is current month.
+        # Total expense falls back to the category sum where `total_expenses` is missing or zero.
+        chronological_income = dataset.income[::-1].tolist()
+        chronological_expense = dataset.total_expenses()[::-1].tolist()
+        chronological_savings = dataset.savings[::-1].tolist()
         
-        for i, row in enumerate(chronological_rows):
+        for i in range(len(dataset)):
             # Calculate month offset: (len - 1 - i) months ago
-            months_ago = len(chronological_rows) - 1 - i
+            months_ago = len(dataset) - 1 - i
             dt = current_date - timedelta(days=30 * months_ago)
             month_name = dt.strftime("%b") # Jan, Feb
             
-            income = float(row.get('income', 0))
-            
-            # Calculate total expense from columns
-            total_exp = float(row.get('total_expenses', 0))
-            # If total_expenses missing, sum specific columns
-            if total_exp == 0:
-                 for col in cat_map.keys():
-                     if col != 'savings' and col in row: # Check if column exists in the row
-                         total_exp += float(row.get(col, 0))
-            
-            investment = float(row.get('savings', 0))
-            
             monthly_history.append({
                 "month": month_name,
-                "income": income,
-                "expense": total_exp,
-                "investment": investment
+                "income": chronological_income[i],
+                "expense": chronological_expense[i],
+                "investment": chronological_savings[i]
             })
 
         # --- Data for "Current Month" (Dashboard Summary) ---
         current_data_row = latest_row
-        current_income = float(current_data_row.get('income', 0))
-        current_savings = float(current_data_row.get('savings', 0))
+        current_income = float(dataset.income[0])
+        current_savings = float(dataset.savings[0])
         
         # Calculate current total expenses breakdown
         current_expenses_list = []
@@ -137,8 +309,8 @@ class DataLoader:
         for csv_col, display_cat in cat_map.items():
             if csv_col == 'savings': continue
             
-            if csv_col in latest_row:
-                amt = float(current_data_row.get(csv_col, 0))
+            if csv_col in dataset:
+                amt = float(dataset.columns[csv_col][0])
                 if amt > 0:
                     current_expenses_list.append({
                         "category": display_cat,
@@ -170,7 +342,7 @@ class DataLoader:
             "monthly_income": current_income,
              # Infer from columns if exist
             "occupation": str(current_data_row.get('occupation', 'Professional')),
-            "age": int(current_data_row.get('age', 30))
+            "age": int(dataset.age[0]) if 'age' in dataset else 30
         }
 
         # --- Goals ---
@@ -188,7 +360,7 @@ class DataLoader:
                 "id": 2,
                 "name": "Retirement Corpus", 
                 "target": 20000000, 
-                "saved": float(current_data_row.get('savings', 0)) * 20, 
+                "saved": current_savings * 20, 
                 "deadline": "2045-01-01",
                 "icon": "👴"
             }
@@ -335,41 +507,13 @@ class DataLoader:
         # The `monthly_history` list only has total expense.
         # We need to scan `history_rows` (which is the last 12-N rows) to get category averages.
         
-        # category totals across all parsed history rows
-        category_sums = {}
-        history_count = len(history_rows)
-        
-        for row in history_rows:
-            for csv_col in cat_map.keys():
-                if csv_col == 'savings': continue
-                if csv_col in row:
-                    val = float(row.get(csv_col, 0))
-                    category_sums[csv_col] = category_sums.get(csv_col, 0) + val
-                    
         # Create budget objects
         budget_id_counter = 1
 
-        # We need to aggregate by DISPLAY category to match UI
-        ui_category_stats = {} # { "Food": { budget_sum, spent_sum } }
-        
-        # 1. Calculate 'Spent' (Current Month)
-        for csv_col, display_cat in cat_map.items():
-            if csv_col == 'savings': continue
-            if csv_col in latest_row:
-                current_val = float(latest_row.get(csv_col, 0))
-                
-                # For Budget (Average from history)
-                total_val = category_sums.get(csv_col, 0)
-                avg_val = total_val / history_count if history_count > 0 else current_val
-                
-                # Add 10% buffer to budget to make it "allowable"
-                target_budget = avg_val * 1.0
-                
-                if display_cat not in ui_category_stats:
-                    ui_category_stats[display_cat] = {"budget": 0, "spent": 0}
-                
-                ui_category_stats[display_cat]["budget"] += target_budget
-                ui_category_stats[display_cat]["spent"] += current_val
+        # We need to aggregate by DISPLAY category to match UI.
+        # Budget = per-category average across the history window, Spent = current month,
+        # both summed per display category: { "Food": { budget, spent } }
+        ui_category_stats = dataset.budget_vs_actual(cat_map)
 
         # Icons map
         icon_map = {
@@ -511,13 +655,14 @@ class DataLoader:
             "budgets": budgets_list, # New field
             "insights": insights, # New field
             "monthly_history": monthly_history,
-            "loaded_from": os.path.abspath(path)
+            "loaded_from": os.path.abspath(path),
+            "ingest_report": coercer.report(len(dataset))
         }
-        return data
+        return attach_aggregates(data)
     
     def get_sample_data(self) -> Dict[str, Any]:
         """Return sample financial data for demo purposes"""
-        return {
+        return attach_aggregates({
             "user_id": self.user_id,
             "profile": {
                 "name": "John Doe",
@@ -568,7 +713,7 @@ class DataLoader:
                 {"id": 1, "title": "Great savings!", "description": "You saved 20% of your income this month.", "type": "positive", "value": "20%", "trend": "up"},
                 {"id": 2, "title": "Entertainment over budget", "description": "You exceeded your entertainment budget by ₹500.", "type": "negative", "value": "-₹500", "trend": "up"},
             ]
-        }
+        })
     
     def get_user_profile(self) -> Dict[str, Any]:
         """Get user profile"""
@@ -583,13 +728,7 @@ class DataLoader:
     
     def get_expense_summary(self) -> Dict[str, float]:
         """Get expense summary by category"""
-        expenses = self.data.get("expenses", [])
-        summary = {}
-        for expense in expenses:
-            category = expense.get("category", "Other")
-            amount = expense.get("amount", 0)
-            summary[category] = summary.get(category, 0) + amount
-        return summary
+        return get_aggregates(self.data)["category_totals"]
     
     def get_investment_portfolio(self) -> List[Dict[str, Any]]:
         """Get investment portfolio"""
@@ -601,16 +740,17 @@ class DataLoader:
     
     def calculate_total_investment(self) -> float:
         """Calculate total investment amount"""
-        return sum(inv.get("amount", 0) for inv in self.get_investment_portfolio())
+        return get_aggregates(self.data)["total_investment"]
     
     def calculate_total_expenses(self) -> float:
         """Calculate total expenses"""
-        return sum(exp.get("amount", 0) for exp in self.data.get("expenses", []))
+        return get_aggregates(self.data)["total_expenses"]
     
     def save_user_data(self, data: Dict[str, Any]):
         """Save user data to file"""
         base_dir = "/tmp/user_data" if os.environ.get("VERCEL") else "user_data"
         os.makedirs(base_dir, exist_ok=True)
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        attach_aggregates(data)
+        write_dataset(data, self.binary_file)
+        snapshot_cache.invalidate(self.binary_file)
         self.data = data
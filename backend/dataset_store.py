@@ -0,0 +1,212 @@
+"""Store for uploaded datasets: a memory-budgeted LRU in front of .fgb files"""
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+from binary_store import LazyDataset, read_dataset, write_dataset
+from data_loader import estimate_size
+from file_parser import FileParser, UploadDigests, iter_chunks
+from config import DATASET_STORE_MAX_BYTES, MAX_UPLOAD_BYTES
+
+_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+
+def default_store_dir() -> str:
+    # Use /tmp on Vercel for temporary file access
+    return "/tmp/user_data" if os.environ.get("VERCEL") else "user_data"
+
+
+class DatasetStore:
+    """Dict-like store of parsed uploads keyed by dataset ID; lookups fall back to the file on disk"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DATASET_STORE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # dataset ID -> (dataset, accounted bytes, undecoded bytes when it was accounted)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.uploads = {"uploads": 0, "content_hits": 0, "row_hits": 0, "misses": 0}
+
+    @staticmethod
+    def new_id() -> str:
+        return f"uploaded_{uuid.uuid4().hex}"
+
+    @staticmethod
+    def content_id(digest: str) -> str:
+        """Dataset ID for an upload whose bytes hash to `digest`"""
+        return f"uploaded_{digest[:32]}"
+
+    def path(self, dataset_id: str, suffix: str = ".fgb") -> str:
+        if not _ID_PATTERN.fullmatch(dataset_id):
+            raise KeyError(dataset_id)
+        return os.path.join(self.directory or default_store_dir(), f"{dataset_id}{suffix}")
+
+    def set_alias(self, alias: str, dataset_id: str):
+        """Point `alias` at an existing dataset (stored as a small file so other workers see it)"""
+        path = self.path(alias, ".alias")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(dataset_id)
+
+    def resolve_alias(self, alias: str) -> Optional[str]:
+        """Dataset ID `alias` points at, if that dataset still exists"""
+        try:
+            with open(self.path(alias, ".alias")) as f:
+                dataset_id = f.read().strip()
+        except (KeyError, OSError):
+            return None
+        return dataset_id if dataset_id in self else None
+
+    def ingest(self, fileobj: BinaryIO, filename: str,
+               parse: Callable[..., Dict[str, Any]] = FileParser.parse_stream) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """
+        Store an upload, reusing an existing dataset when the same bytes or the
+        same normalized rows were uploaded before.
+        Returns (dataset ID, dataset, "content" | "rows" | None for a new dataset).
+        """
+        # A byte-identical re-upload is answered from its hash alone, without parsing
+        content = hashlib.sha256()
+        for _ in iter_chunks(fileobj, max_bytes=MAX_UPLOAD_BYTES, digest=content):
+            pass
+        fileobj.seek(0)
+        dataset_id = self.content_id(content.hexdigest())
+        existing = dataset_id if dataset_id in self else self.resolve_alias(dataset_id)
+        if existing is not None:
+            return self._count_upload(existing, self[existing], "content")
+
+        digests = UploadDigests()
+        data = parse(fileobj, filename, digests=digests)
+        rows = digests.rows_hexdigest()
+        rows_alias = f"rows_{rows[:32]}" if rows else None
+        existing = self.resolve_alias(rows_alias) if rows_alias else None
+        if existing is not None:
+            # Remember these bytes too, so the next identical upload is a content hit
+            self.set_alias(dataset_id, existing)
+            return self._count_upload(existing, self[existing], "rows")
+
+        self.add(data, dataset_id)
+        if rows_alias:
+            self.set_alias(rows_alias, dataset_id)
+        return self._count_upload(dataset_id, data, None)
+
+    def _count_upload(self, dataset_id: str, data: Dict[str, Any], hit: Optional[str]) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        with self._lock:
+            self.uploads["uploads"] += 1
+            self.uploads[{"content": "content_hits", "rows": "row_hits", None: "misses"}[hit]] += 1
+        return dataset_id, data, hit
+
+    def add(self, data: Dict[str, Any], dataset_id: Optional[str] = None) -> str:
+        """Persist `data`, keep it in memory if it fits the budget, and return its ID"""
+        dataset_id = dataset_id or self.new_id()
+        write_dataset(data, self.path(dataset_id))
+        self._remember(dataset_id, data)
+        return dataset_id
+
+    @staticmethod
+    def _pending(data: Dict[str, Any]) -> int:
+        return data.pending_nbytes() if isinstance(data, LazyDataset) else 0
+
+    def _remember(self, dataset_id: str, data: Dict[str, Any]):
+        pending = self._pending(data)
+        size = estimate_size(data)
+        with self._lock:
+            old = self._entries.pop(dataset_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[dataset_id] = (data, size, pending)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get(self, dataset_id: str, default: Any = None) -> Any:
+        try:
+            return self[dataset_id]
+        except KeyError:
+            return default
+
+    def __getitem__(self, dataset_id: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                self._entries.move_to_end(dataset_id)
+                self.hits += 1
+        if entry is not None:
+            data, _, pending = entry
+            if self._pending(data) != pending:
+                # Lists decoded since the last lookup now take real memory; account for them
+                self._remember(dataset_id, data)
+            return data
+
+        path = self.path(dataset_id)
+        try:
+            # Lists stay encoded in the memory map until a request reads them
+            data = read_dataset(path)
+        except FileNotFoundError:
+            raise KeyError(dataset_id) from None
+        with self._lock:
+            self.reloads += 1
+        self._remember(dataset_id, data)
+        return data
+
+    def __contains__(self, dataset_id: object) -> bool:
+        if not isinstance(dataset_id, str):
+            return False
+        with self._lock:
+            if dataset_id in self._entries:
+                return True
+        try:
+            return os.path.exists(self.path(dataset_id))
+        except KeyError:
+            return False
+
+    def __len__(self) -> int:
+        """Number of datasets currently held in memory"""
+        with self._lock:
+            return len(self._entries)
+
+    def discard(self, dataset_id: str):
+        """Drop `dataset_id` from memory and disk"""
+        with self._lock:
+            entry = self._entries.pop(dataset_id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+        try:
+            os.unlink(self.path(dataset_id))
+        except (KeyError, FileNotFoundError):
+            pass
+
+    def clear(self):
+        """Drop every in-memory copy (files stay on disk)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+    def upload_stats(self) -> Dict[str, Any]:
+        """Deduplication counters for `ingest`"""
+        with self._lock:
+            stats = dict(self.uploads)
+        hits = stats["content_hits"] + stats["row_hits"]
+        stats["hit_rate"] = hits / stats["uploads"] if stats["uploads"] else 0.0
+        return stats
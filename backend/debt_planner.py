@@ -0,0 +1,195 @@
+"""
+Repayment planning across a portfolio of debts: minimum payments first, then the rest of
+the budget by priority (avalanche, snowball or a custom order), one month at a time.
+"""
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from calculator import debt_payoff_batch, mortgage_payment
+
+STRATEGIES = ("avalanche", "snowball", "custom")
+
+
+def normalize_loans(loans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fill in names and minimum payments (`min_payment`, or the EMI for a positive `term_years`).
+    Raises ValueError on duplicate names, which identify loans in plans and custom orders.
+    """
+    normalized = []
+    seen = set()
+    for i, loan in enumerate(loans):
+        balance = float(loan.get("balance", loan.get("principal", 0)))
+        rate = float(loan.get("annual_interest_rate", 0))
+        term_years = loan.get("term_years")
+        term_years = float(term_years) if term_years is not None else None
+        name = str(loan.get("name") or f"Loan {i + 1}")
+        if term_years is not None and not term_years > 0:
+            raise ValueError(f"term_years must be positive for {name}")
+        min_payment = loan.get("min_payment")
+        if min_payment is None:
+            if term_years and rate > 0:
+                min_payment = mortgage_payment(balance, rate, term_years)["monthly_payment"]
+            elif term_years:
+                min_payment = balance / (term_years * 12)
+            else:
+                min_payment = 0.0
+        if name in seen:
+            raise ValueError(f"Duplicate loan name: {name}")
+        seen.add(name)
+        normalized.append({
+            "name": name,
+            "balance": balance,
+            "annual_interest_rate": rate,
+            "min_payment": float(min_payment),
+        })
+    return normalized
+
+
+def priority_order(loans: List[Dict[str, Any]], strategy: str, order: Optional[List[str]] = None) -> List[int]:
+    """Indices of `loans` in the order extra money is applied"""
+    if strategy == "avalanche":
+        return sorted(range(len(loans)), key=lambda i: (-loans[i]["annual_interest_rate"], loans[i]["balance"]))
+    if strategy == "snowball":
+        return sorted(range(len(loans)), key=lambda i: (loans[i]["balance"], -loans[i]["annual_interest_rate"]))
+    if strategy == "custom":
+        names = [loan["name"] for loan in loans]
+        ranked = []
+        for key in order or []:
+            idx = names.index(key) if key in names else None
+            if idx is None:
+                raise ValueError(f"Unknown loan in custom order: {key}")
+            if idx not in ranked:
+                ranked.append(idx)
+        # Loans left out of the custom order follow in their original order
+        return ranked + [i for i in range(len(loans)) if i not in ranked]
+    raise ValueError(f"Unknown strategy: {strategy}. Use one of {', '.join(STRATEGIES)}")
+
+
+def iter_repayment_schedule(
+    loans: List[Dict[str, Any]],
+    monthly_budget: float,
+    strategy: str = "avalanche",
+    order: Optional[List[str]] = None,
+    max_months: int = 600,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield per-loan payments, interest and balances for each month until every loan is repaid.
+    Raises ValueError when the budget does not cover the minimum payments.
+    """
+    loans = normalize_loans(loans)
+    if not loans:
+        return
+    names = [loan["name"] for loan in loans]
+    balances = np.array([loan["balance"] for loan in loans], dtype=np.float64)
+    rates = np.array([loan["annual_interest_rate"] for loan in loans], dtype=np.float64) / 12 / 100
+    minimums = np.array([loan["min_payment"] for loan in loans], dtype=np.float64)
+    ranked = np.array(priority_order(loans, strategy, order))
+
+    if monthly_budget < minimums.sum():
+        raise ValueError(f"Monthly budget {monthly_budget:.2f} is below the total minimum payment {minimums.sum():.2f}")
+
+    for month in range(1, max_months + 1):
+        if not (balances > 0).any():
+            return
+        interest = balances * rates
+        owed = balances + interest
+
+        # Minimum payments first, capped at what is owed
+        payments = np.minimum(minimums, owed)
+        # Money freed by repaid loans rolls into the extra pool
+        extra = monthly_budget - payments.sum()
+
+        # Extra goes to loans in priority order: each takes up to its remaining amount
+        remaining = (owed - payments)[ranked]
+        before = np.concatenate([[0.0], np.cumsum(remaining)[:-1]])
+        allocation = np.clip(extra - before, 0, remaining)
+        payments[ranked] += allocation
+
+        balances = np.maximum(owed - payments, 0)
+        # Settle float dust so loans close cleanly
+        balances[balances < 1e-6] = 0.0
+
+        yield {
+            "month": month,
+            "loans": names,
+            "payments": payments.tolist(),
+            "interest": interest.tolist(),
+            "balances": balances.tolist(),
+            "total_paid": float(payments.sum()),
+            "total_interest": float(interest.sum()),
+            "remaining_balance": float(balances.sum()),
+        }
+
+
+def summarize_plan(
+    loans: List[Dict[str, Any]],
+    monthly_budget: float,
+    strategy: str = "avalanche",
+    order: Optional[List[str]] = None,
+    max_months: int = 600,
+) -> Dict[str, Any]:
+    """
+    Consume the schedule and keep only totals and per-loan payoff months.
+    Loans that start with nothing owed are reported as paid off in month 0.
+    """
+    normalized = normalize_loans(loans)
+    payoff_month: Dict[str, Optional[int]] = {
+        loan["name"]: 0 if loan["balance"] <= 0 else None for loan in normalized
+    }
+    months = 0
+    total_interest = 0.0
+    total_paid = 0.0
+    remaining = sum(loan["balance"] for loan in normalized)
+
+    for row in iter_repayment_schedule(normalized, monthly_budget, strategy, order, max_months):
+        months = row["month"]
+        total_interest += row["total_interest"]
+        total_paid += row["total_paid"]
+        remaining = row["remaining_balance"]
+        for name, balance in zip(row["loans"], row["balances"]):
+            if balance == 0 and payoff_month[name] is None:
+                payoff_month[name] = months
+
+    return {
+        "strategy": strategy,
+        "months": months,
+        "debt_free": remaining == 0,
+        "total_interest": total_interest,
+        "total_paid": total_paid,
+        "payoff_month": payoff_month,
+    }
+
+
+def minimum_only_baseline(loans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Months and interest per loan when only minimum payments are made (closed form)"""
+    normalized = normalize_loans(loans)
+    if not normalized:
+        return {"months": {}, "total_interest": 0.0}
+    batch = debt_payoff_batch(
+        [loan["balance"] for loan in normalized],
+        [loan["annual_interest_rate"] for loan in normalized],
+        [loan["min_payment"] for loan in normalized],
+    )
+    months = {
+        loan["name"]: (int(m) if ok else None)
+        for loan, m, ok in zip(normalized, batch["months_to_payoff"], batch["feasible"])
+    }
+    interest = batch["total_interest"][batch["feasible"]]
+    return {
+        "months": months,
+        "total_interest": float(interest.sum()),
+        "all_feasible": bool(batch["feasible"].all()),
+    }
+
+
+def compare_strategies(
+    loans: List[Dict[str, Any]],
+    monthly_budget: float,
+    order: Optional[List[str]] = None,
+    max_months: int = 600,
+) -> Dict[str, Any]:
+    """Summaries for avalanche, snowball and (if `order` is given) custom, plus the minimum-only baseline"""
+    strategies = ["avalanche", "snowball"] + (["custom"] if order else [])
+    return {
+        "plans": {s: summarize_plan(loans, monthly_budget, s, order, max_months) for s in strategies},
+        "minimum_only": minimum_only_baseline(loans),
+    }
@@ -1,10 +1,122 @@
-from gemini_client import get_gemini_client
-from config import EMBEDDING_MODEL
+import asyncio
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+import numpy as np
+from llm_gateway import embed_texts, aembed_text
+from config import CACHE_DIR, EMBEDDING_MODEL, EMBED_BATCH_SIZE, EMBED_MAX_CONCURRENCY
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (model, sha256(text)), stored as float32 blobs in SQLite"""
+
+    def __init__(self, path: str = os.path.join(CACHE_DIR, "embeddings.sqlite3")):
+        self.path = path
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            if not self._ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model TEXT, hash TEXT, vector BLOB, PRIMARY KEY (model, hash))"
+                )
+                self._ready = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        found = {}
+        if not hashes:
+            return found
+        try:
+            with self._connect() as conn:
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(hashes), 500):
+                    chunk = hashes[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                        [model, *chunk],
+                    ).fetchall()
+                    for h, blob in rows:
+                        found[h] = np.frombuffer(blob, dtype=np.float32).tolist()
+        except sqlite3.Error:
+            pass
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]):
+        if not vectors:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                    [(model, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in vectors.items()],
+                )
+        except sqlite3.Error:
+            # The cache is best effort; callers already have the vectors
+            pass
+
+
+embedding_cache = EmbeddingCache()
+
+
+def get_embeddings(
+    texts: Sequence[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_concurrency: int = EMBED_MAX_CONCURRENCY,
+    model: str = EMBEDDING_MODEL,
+) -> List[List[float]]:
+    """Embed `texts` in order: duplicates once, cached texts from disk, the rest in concurrent batches"""
+    hashes = [text_hash(t) for t in texts]
+    unique = dict(zip(hashes, texts))
+
+    vectors = embedding_cache.get_many(model, list(unique))
+    missing = [h for h in unique if h not in vectors]
+
+    if missing:
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+
+        def embed_batch(batch: List[str]) -> Dict[str, List[float]]:
+            return dict(zip(batch, embed_texts([unique[h] for h in batch], model=model)))
+
+        fresh = {}
+        if len(batches) == 1 or max_concurrency <= 1:
+            for batch in batches:
+                fresh.update(embed_batch(batch))
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+                for result in pool.map(embed_batch, batches):
+                    fresh.update(result)
+        embedding_cache.put_many(model, fresh)
+        vectors.update(fresh)
+
+    return [vectors[h] for h in hashes]
+
 
 def get_embedding(text: str):
-    client = get_gemini_client()
-    response = client.models.embed_content(
-        model=EMBEDDING_MODEL,
-        contents=text
-    )
-    return response.embeddings[0].values
+    return get_embeddings([text])[0]
+
+
+async def aget_embedding(text: str):
+    h = text_hash(text)
+    # SQLite calls block, so keep them off the event loop
+    cached = (await asyncio.to_thread(embedding_cache.get_many, EMBEDDING_MODEL, [h])).get(h)
+    if cached is not None:
+        return cached
+    vector = await aembed_text(text)
+    await asyncio.to_thread(embedding_cache.put_many, EMBEDDING_MODEL, {h: vector})
+    return vector
@@ -0,0 +1,101 @@
+from typing import Dict, List, Any, Optional
+import numpy as np
+from coercion import ColumnCoercer
+
+# Expense columns of the engineered dataset, in file order
+EXPENSE_COLUMNS = [
+    'rent', 'loan_repayment', 'insurance', 'groceries', 'transport',
+    'eating_out', 'entertainment', 'utilities', 'healthcare', 'education',
+    'miscellaneous'
+]
+
+# Numeric columns kept alongside the expense categories
+EXTRA_COLUMNS = ['savings', 'income', 'age', 'total_expenses']
+
+
+class EngineeredDataset:
+    """Columnar view of engineered financial rows: one float64 array per column present, row 0 the latest month"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], num_rows: int):
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], fieldnames: Optional[List[str]] = None,
+                  coercer: Optional[ColumnCoercer] = None) -> "EngineeredDataset":
+        """Build the dataset from dict rows with lowercase field names; share a `coercer` across chunks of one file"""
+        if fieldnames is None:
+            fieldnames = list(rows[0].keys()) if rows else []
+        coercer = coercer or ColumnCoercer()
+        wanted = [c for c in EXPENSE_COLUMNS + EXTRA_COLUMNS if c in fieldnames]
+        columns = {c: coercer.numeric(c, [row.get(c) for row in rows])[0] for c in wanted}
+        return cls(columns, len(rows))
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def column(self, name: str) -> np.ndarray:
+        """Return column `name`, or zeros if the source did not have it"""
+        col = self.columns.get(name)
+        return col if col is not None else np.zeros(self.num_rows, dtype=np.float64)
+
+    @property
+    def income(self) -> np.ndarray:
+        return self.column('income')
+
+    @property
+    def age(self) -> np.ndarray:
+        return self.column('age')
+
+    @property
+    def savings(self) -> np.ndarray:
+        return self.column('savings')
+
+    @property
+    def expense_columns(self) -> List[str]:
+        """Expense categories present in the source, in canonical order"""
+        return [c for c in EXPENSE_COLUMNS if c in self.columns]
+
+    def expense_matrix(self) -> np.ndarray:
+        """(rows, categories) matrix of expense amounts, ordered like `expense_columns`"""
+        cols = self.expense_columns
+        if not cols:
+            return np.zeros((self.num_rows, 0), dtype=np.float64)
+        return np.column_stack([self.columns[c] for c in cols])
+
+    def total_expenses(self) -> np.ndarray:
+        """Per-row total expense, using `total_expenses` where set and the category sum otherwise"""
+        category_total = self.expense_matrix().sum(axis=1)
+        if 'total_expenses' not in self.columns:
+            return category_total
+        given = self.columns['total_expenses']
+        return np.where(given == 0, category_total, given)
+
+    def category_means(self) -> Dict[str, float]:
+        """Average amount per expense category across all rows"""
+        if self.num_rows == 0:
+            return {c: 0.0 for c in self.expense_columns}
+        means = self.expense_matrix().mean(axis=0)
+        return dict(zip(self.expense_columns, means.tolist()))
+
+    def budget_vs_actual(self, display_map: Dict[str, str], row: int = 0) -> Dict[str, Dict[str, float]]:
+        """Budget (historical average) vs actual (row `row`), summed per display name of `display_map`"""
+        cols = [c for c in display_map if c in EXPENSE_COLUMNS and c in self.columns]
+        if not cols:
+            return {}
+        matrix = np.column_stack([self.columns[c] for c in cols])
+        actual = matrix[row]
+        budget = matrix.mean(axis=0) if self.num_rows > 0 else actual
+
+        names = [display_map[c] for c in cols]
+        unique_names = list(dict.fromkeys(names))
+        group = np.array([unique_names.index(n) for n in names])
+        budget_sums = np.bincount(group, weights=budget, minlength=len(unique_names))
+        actual_sums = np.bincount(group, weights=actual, minlength=len(unique_names))
+        return {
+            name: {"budget": float(b), "spent": float(s)}
+            for name, b, s in zip(unique_names, budget_sums, actual_sums)
+        }
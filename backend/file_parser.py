@@ -1,10 +1,736 @@
+import codecs
 import csv
+import hashlib
 import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import StringIO, BytesIO
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
-import random
+from itertools import chain
+from typing import Dict, Any, Callable, List, Iterable, Iterator, Optional, Tuple, BinaryIO
+from datetime import date, datetime, timedelta
+import numpy as np
 import openpyxl
+from engineered_dataset import EngineeredDataset
+from coercion import ColumnCoercer, merge_reports
+from records import Transaction, Investment, Goal, intern_label
+from aggregates import AGGREGATES_KEY, attach_aggregates, merge_aggregates
+from config import (
+    MAX_UPLOAD_BYTES, MAX_UPLOAD_ROWS, UPLOAD_CHUNK_BYTES,
+    PARSE_EXECUTOR, PARSE_MAX_WORKERS, ENGINEERED_PARALLEL_MIN_ROWS, SHEET_PARALLEL_MIN_ROWS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify the engineered dataset format
+ENGINEERED_COLUMNS = {'income', 'rent', 'groceries', 'transport', 'eating_out', 'utilities', 'healthcare'}
+
+# Engineered rows are converted to columns this many at a time
+ENGINEERED_CHUNK_ROWS = 5000
+
+# List fields of the standardized dataset that sheets/files contribute to
+DATASET_LISTS = ("expenses", "investments", "goals", "subscriptions", "monthly_history")
+
+# Called with the number of rows just read, as parsing advances
+ProgressCallback = Callable[[int], None]
+
+
+def detect_schema(fieldnames: Iterable[str]) -> Optional[str]:
+    """
+    Identify a table by its header: "engineered", "expenses", "investments",
+    "goals", "subscriptions", or None if it is not recognized.
+    """
+    fields = set(fieldnames)
+    if ENGINEERED_COLUMNS.issubset(fields):
+        return "engineered"
+    if {'date', 'category', 'amount'}.issubset(fields):
+        return "expenses"
+    if {'type', 'amount', 'return'}.issubset(fields):
+        return "investments"
+    if {'name', 'target', 'current'}.issubset(fields):
+        return "goals"
+    if {'name', 'cost'}.issubset(fields):
+        return "subscriptions"
+    return None
+
+
+class UploadLimitError(ValueError):
+    """An upload exceeded MAX_UPLOAD_BYTES or MAX_UPLOAD_ROWS"""
+
+
+def iter_chunks(fileobj: BinaryIO, chunk_size: int = UPLOAD_CHUNK_BYTES,
+                max_bytes: Optional[int] = MAX_UPLOAD_BYTES, digest=None) -> Iterator[bytes]:
+    """Read a binary file chunk by chunk, feeding `digest` if given; raises UploadLimitError past `max_bytes`"""
+    total = 0
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if max_bytes is not None and total > max_bytes:
+            raise UploadLimitError(f"File exceeds the upload limit of {max_bytes} bytes")
+        if digest is not None:
+            digest.update(chunk)
+        yield chunk
+
+
+def iter_text_lines(fileobj: BinaryIO, encoding: str = "utf-8-sig", chunk_size: int = UPLOAD_CHUNK_BYTES,
+                    max_bytes: Optional[int] = MAX_UPLOAD_BYTES) -> Iterator[str]:
+    """Decode a binary file chunk by chunk and yield its lines (with line endings)"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in iter_chunks(fileobj, chunk_size, max_bytes):
+        text = pending + decoder.decode(chunk)
+        lines = text.splitlines(keepends=True)
+        # The last piece may be an unfinished line (or a lone \r before \n)
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        yield from lines
+    tail = pending + decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Split CSV text lines into (lowercased fieldnames, iterator of row dicts), skipping blank lines"""
+    reader = csv.reader(lines)
+    header = next(reader, None) or []
+    fieldnames = [col.lower().strip() for col in header]
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        for values in reader:
+            if values:
+                yield dict(zip(fieldnames, values))
+
+    return fieldnames, rows()
+
+
+def _excel_value(value: Any) -> Any:
+    """Normalize a cell value: midnight datetimes become ISO dates, everything else passes through"""
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _header_names(header: Iterable[Any]) -> List[str]:
+    return [str(value).lower().strip() if value is not None else "" for value in header]
+
+
+def read_sheet_headers(source) -> List[Tuple[str, List[str], Optional[int]]]:
+    """(title, lowercased field names, declared row count or None) for every sheet of a workbook"""
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        headers = []
+        for sheet in wb.worksheets:
+            declared_rows = sheet.max_row
+            sheet.reset_dimensions()
+            first = next(sheet.iter_rows(max_row=1, values_only=True), None) or ()
+            headers.append((sheet.title, _header_names(first), declared_rows))
+        return headers
+    finally:
+        wb.close()
+
+
+def iter_excel_rows(source, sheet_name: Optional[str] = None) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """(fieldnames, row iterator) for a sheet (default: the active one), streamed read-only and skipping empty rows"""
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    sheet = wb[sheet_name] if sheet_name is not None else wb.active
+    # Some writers store a wrong sheet dimension; read until the data ends instead
+    sheet.reset_dimensions()
+    sheet_rows = sheet.iter_rows(values_only=True)
+    fieldnames = _header_names(next(sheet_rows, None) or ())
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        try:
+            for excel_row in sheet_rows:
+                if any(value is not None for value in excel_row):
+                    yield dict(zip(fieldnames, map(_excel_value, excel_row)))
+        finally:
+            wb.close()
+
+    return fieldnames, rows()
+
+
+def _base_dataset() -> Dict[str, Any]:
+    return {
+        "user_id": "uploaded",
+        "profile": {"name": "User", "email": "user@example.com", "monthly_income": 85000},
+        "expenses": [],
+        "investments": [],
+        "goals": [],
+        "subscriptions": [],
+        "monthly_history": []
+    }
+
+
+def merge_datasets(parts: List[Tuple[Optional[str], Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Merge (schema, dataset) parts parsed from separate sheets into one dataset.
+    Explicit goals replace the placeholder goals the engineered format generates.
+    """
+    merged = _base_dataset()
+    has_goals = any(kind == "goals" for kind, _ in parts)
+    for kind, data in parts:
+        if kind == "engineered":
+            merged["profile"]["monthly_income"] = data["profile"]["monthly_income"]
+        for key in DATASET_LISTS:
+            if key == "goals" and kind == "engineered" and has_goals:
+                continue
+            merged[key].extend(data.get(key, []))
+    # Each sheet numbers its subscriptions from 1
+    for n, subscription in enumerate(merged["subscriptions"], 1):
+        subscription["id"] = n
+    merged["ingest_report"] = merge_reports(
+        [data.get("ingest_report") for _, data in parts],
+        prefixes=[kind for kind, _ in parts] if len(parts) > 1 else None
+    )
+    # Sheets are disjoint, so their aggregates add up (placeholder goals do not enter them)
+    merged[AGGREGATES_KEY] = merge_aggregates(
+        [data[AGGREGATES_KEY] for _, data in parts if AGGREGATES_KEY in data],
+        merged["profile"]["monthly_income"]
+    )
+    return merged
+
+
+def _fingerprint_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if type(value) is float and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _fingerprint_columns(fieldnames: Iterable[str]) -> List[str]:
+    return sorted(name for name in fieldnames if name)
+
+
+def _fingerprint_chunk(columns: List[str], rows: Iterable[Dict[str, Any]]) -> bytes:
+    """sha256 of the normalized cells of `rows` over `columns`; blank rows are ignored"""
+    digest = hashlib.sha256()
+    for row in rows:
+        line = "\x1f".join([_fingerprint_cell(row.get(name)) for name in columns])
+        if line.strip("\x1f"):
+            digest.update((line + "\n").encode("utf-8"))
+    return digest.digest()
+
+
+class TableFingerprint:
+    """Hash of one table's normalized rows, folded from per-chunk digests in row order"""
+
+    def __init__(self, fieldnames: Iterable[str]):
+        self.columns = _fingerprint_columns(fieldnames)
+        self._digest = hashlib.sha256(("\x1e".join(self.columns) + "\n").encode("utf-8"))
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self._digest.update(_fingerprint_chunk(self.columns, rows))
+
+    def add_chunk(self, chunk_digest: bytes) -> None:
+        self._digest.update(chunk_digest)
+
+    def digest(self) -> bytes:
+        return self._digest.digest()
+
+
+class UploadDigests:
+    """Table fingerprints FileParser.parse_stream collects, one per recognized CSV or sheet"""
+
+    def __init__(self):
+        self.tables: List[bytes] = []
+
+    def rows_hexdigest(self) -> Optional[str]:
+        """None when no recognized table was parsed"""
+        if not self.tables:
+            return None
+        return hashlib.sha256(b"".join(self.tables)).hexdigest()
+
+
+# Numeric fields per schema; True marks fields a row cannot do without
+# (rows where they are blank or invalid are skipped and counted)
+NUMERIC_FIELDS = {
+    "expenses": {"amount": True},
+    "investments": {"amount": True, "return": False},
+    "goals": {"target": True, "current": False},
+    "subscriptions": {"cost": True},
+}
+
+
+class DatasetBuilder:
+    """Build the standardized dataset from rows fed one at a time, converting them `chunk_rows` at a time"""
+
+    def __init__(self, fieldnames: List[str], max_rows: Optional[int] = MAX_UPLOAD_ROWS,
+                 chunk_rows: int = ENGINEERED_CHUNK_ROWS, progress: Optional[ProgressCallback] = None,
+                 fingerprint: Optional[TableFingerprint] = None):
+        self.fieldnames = fieldnames
+        self.max_rows = max_rows
+        self.chunk_rows = chunk_rows
+        self.progress = progress
+        self.fingerprint = fingerprint
+        self.rows_seen = 0
+        self.rows_skipped = 0
+        self.data = _base_dataset()
+        self.coercer = ColumnCoercer()
+        self._pending: List[Dict[str, Any]] = []
+
+        self.kind = detect_schema(fieldnames)
+        self._engineered = _EngineeredAssembler(self.data) if self.kind == "engineered" else None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows_seen += 1
+        if self.max_rows is not None and self.rows_seen > self.max_rows:
+            raise UploadLimitError(f"File exceeds the upload limit of {self.max_rows} rows")
+        if self.kind is None:
+            return
+        self._pending.append(row)
+        if len(self._pending) >= self.chunk_rows:
+            self._flush()
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> "DatasetBuilder":
+        for row in rows:
+            self.add(row)
+        return self
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        chunk, self._pending = self._pending, []
+        if self.progress is not None:
+            self.progress(len(chunk))
+        if self.fingerprint is not None:
+            self.fingerprint.add_rows(chunk)
+        if self._engineered is not None:
+            dataset = EngineeredDataset.from_rows(chunk, self.fieldnames, coercer=self.coercer)
+            self._engineered.add(_engineered_partial(dataset))
+            return
+
+        numbers = {}
+        keep = np.ones(len(chunk), dtype=bool)
+        for field, required in NUMERIC_FIELDS[self.kind].items():
+            values, valid = self.coercer.numeric(field, [row.get(field) for row in chunk])
+            numbers[field] = values.tolist()
+            if required:
+                keep &= valid
+        self.rows_skipped += int((~keep).sum())
+        rows = np.nonzero(keep)[0].tolist()
+
+        if self.kind == "expenses":
+            amount = numbers["amount"]
+            self.data["expenses"].extend(
+                Transaction(intern_label(chunk[i]['date']), intern_label(chunk[i]['category']), amount[i])
+                for i in rows
+            )
+        elif self.kind == "investments":
+            amount, annual_return = numbers["amount"], numbers["return"]
+            self.data["investments"].extend(
+                Investment(intern_label(chunk[i]['type']), amount[i], annual_return[i])
+                for i in rows
+            )
+        elif self.kind == "goals":
+            target, current = numbers["target"], numbers["current"]
+            self.data["goals"].extend(
+                Goal(str(chunk[i]['name']), target[i], current[i], str(chunk[i].get('deadline', '2025-12-31')))
+                for i in rows
+            )
+        elif self.kind == "subscriptions":
+            # Same shape DataLoader produces for the Subscriptions page
+            cost = numbers["cost"]
+            first_id = len(self.data["subscriptions"]) + 1
+            self.data["subscriptions"].extend(
+                {
+                    "id": first_id + n,
+                    "name": str(chunk[i]['name']),
+                    "cost": cost[i],
+                    "nextRenewal": str(chunk[i].get('next_renewal') or chunk[i].get('next renewal') or ''),
+                    "category": str(chunk[i].get('category') or 'Other'),
+                    "logo": "💳",
+                    "isActive": True,
+                    "recommendation": None
+                }
+                for n, i in enumerate(rows)
+            )
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush buffered rows and return the dataset with aggregates attached"""
+        self._flush()
+        self.data["ingest_report"] = self.coercer.report(self.rows_seen, self.rows_skipped)
+        if self._engineered is not None:
+            return self._engineered.finish()
+        return attach_aggregates(self.data)
+
+
+def _engineered_partial(dataset: EngineeredDataset) -> Dict[str, Any]:
+    """Compact result for one chunk of engineered rows: positive cells as arrays, plus partial aggregates"""
+    labels = [c.replace('_', ' ').title() for c in dataset.expense_columns]
+    # Positive cells in row-major order, so expenses keep the row -> category ordering
+    matrix = dataset.expense_matrix()
+    row_idx, cat_idx = np.nonzero(matrix > 0)
+    amounts = matrix[row_idx, cat_idx]
+    if 'savings' in dataset:
+        savings_idx = np.nonzero(dataset.savings > 0)[0]
+        savings = dataset.savings[savings_idx]
+    else:
+        savings_idx = np.zeros(0, dtype=np.int64)
+        savings = np.zeros(0, dtype=np.float64)
+
+    totals = np.bincount(cat_idx, weights=amounts, minlength=len(labels))
+    present = np.bincount(cat_idx, minlength=len(labels)) > 0
+    return {
+        "rows": len(dataset),
+        "income": float(dataset.income[0]) if 'income' in dataset and len(dataset) else None,
+        "labels": labels,
+        "row_idx": row_idx.astype(np.int32),
+        "cat_idx": cat_idx.astype(np.int16),
+        "amounts": amounts,
+        "savings_idx": savings_idx.astype(np.int32),
+        "savings": savings,
+        "aggregates": {
+            "category_totals": {label: float(t) for label, t, p in zip(labels, totals, present) if p},
+            "total_expenses": float(amounts.sum()),
+            "total_investment": float(savings.sum()),
+            "expenses_count": len(amounts),
+            "investments_count": len(savings),
+        },
+    }
+
+
+def _parse_engineered_text(text: str, fieldnames: List[str], fingerprint: bool = False) -> Dict[str, Any]:
+    """Worker: parse a chunk of engineered CSV lines (no header) into a partial"""
+    rows = [dict(zip(fieldnames, values)) for values in csv.reader(StringIO(text)) if values]
+    coercer = ColumnCoercer()
+    partial = _engineered_partial(EngineeredDataset.from_rows(rows, fieldnames, coercer=coercer))
+    partial["report"] = coercer.report(len(rows))
+    if fingerprint:
+        partial["fingerprint"] = _fingerprint_chunk(_fingerprint_columns(fieldnames), rows)
+    return partial
+
+
+class _EngineeredAssembler:
+    """Expands engineered partials, in row order, into the dataset's expense/investment lists"""
+
+    INVESTMENT_TYPES = ["Stocks", "Mutual Funds", "Fixed Deposits", "Gold"]
+
+    def __init__(self, data: Dict[str, Any], fingerprint: Optional[TableFingerprint] = None):
+        self.data = data
+        self.fingerprint = fingerprint
+        self.offset = 0
+        self.aggregates: List[Dict[str, Any]] = []
+        self.reports: List[Dict[str, Any]] = []
+        # Rows are spread over the last 90 days; the labels are computed once per upload
+        base_date = datetime.now() - timedelta(days=90)
+        self.date_labels = [(base_date + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(90)]
+
+    def add(self, partial: Dict[str, Any]) -> None:
+        offset = self.offset
+        if offset == 0:
+            income = partial["income"]
+            self.data["profile"]["monthly_income"] = income if income is not None else 85000.0
+
+        labels = partial["labels"]
+        date_labels = self.date_labels
+        self.data["expenses"].extend(
+            Transaction(date_labels[(offset + r) % 90], labels[c], amount)
+            for r, c, amount in zip(partial["row_idx"].tolist(), partial["cat_idx"].tolist(), partial["amounts"].tolist())
+        )
+
+        savings_idx = partial["savings_idx"].tolist()
+        returns = np.random.uniform(5, 15, size=len(savings_idx)).tolist()
+        investment_types = self.INVESTMENT_TYPES
+        self.data["investments"].extend(
+            Investment(investment_types[(offset + idx) % 4], amount, annual_return)
+            for idx, amount, annual_return in zip(savings_idx, partial["savings"].tolist(), returns)
+        )
+
+        self.offset += partial["rows"]
+        self.aggregates.append(partial["aggregates"])
+        if partial.get("report"):
+            self.reports.append(partial["report"])
+        if self.fingerprint is not None:
+            self.fingerprint.add_chunk(partial["fingerprint"])
+
+    def finish(self) -> Dict[str, Any]:
+        """Add the derived goals and the merged aggregates; returns the dataset"""
+        if self.offset:
+            FileParser._add_engineered_goals(self.data)
+        if self.reports:
+            self.data["ingest_report"] = merge_reports(self.reports)
+        self.data[AGGREGATES_KEY] = merge_aggregates(self.aggregates, self.data["profile"]["monthly_income"])
+        return self.data
+
+
+def _text_chunks(lines: Iterable[str], chunk_rows: int) -> Iterator[Tuple[str, int]]:
+    """Group CSV lines into (text, record count) chunks without splitting quoted fields"""
+    buf: List[str] = []
+    count = 0
+    in_quotes = False
+    for line in lines:
+        if not in_quotes and not line.strip():
+            continue
+        buf.append(line)
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            count += 1
+            if count >= chunk_rows:
+                yield "".join(buf), count
+                buf, count = [], 0
+    if buf:
+        yield "".join(buf), count
+
+
+def parse_engineered_csv(fieldnames: List[str], lines: Iterable[str], max_rows: Optional[int] = MAX_UPLOAD_ROWS,
+                         parallel_min_rows: int = ENGINEERED_PARALLEL_MIN_ROWS,
+                         chunk_rows: int = ENGINEERED_CHUNK_ROWS,
+                         progress: Optional[ProgressCallback] = None,
+                         fingerprint: Optional[TableFingerprint] = None) -> Dict[str, Any]:
+    """
+    Parse the body lines of an engineered CSV in `chunk_rows`-record chunks,
+    on the shared worker pool once the file reaches `parallel_min_rows` records.
+    """
+    assembler = _EngineeredAssembler(_base_dataset(), fingerprint)
+    hash_rows = fingerprint is not None
+    rows = 0
+
+    def counted(chunks: Iterator[Tuple[str, int]]) -> Iterator[str]:
+        nonlocal rows
+        for text, count in chunks:
+            rows += count
+            if max_rows is not None and rows > max_rows:
+                raise UploadLimitError(f"File exceeds the upload limit of {max_rows} rows")
+            if progress is not None:
+                progress(count)
+            yield text
+
+    texts = counted(_text_chunks(lines, chunk_rows))
+    # Read ahead until the file is known to be big enough to be worth a pool
+    head = []
+    for text in texts:
+        head.append(text)
+        if rows >= parallel_min_rows:
+            break
+
+    workers = _pool_size()
+    if rows < parallel_min_rows or workers <= 1 or PARSE_EXECUTOR == "serial":
+        for text in chain(head, texts):
+            assembler.add(_parse_engineered_text(text, fieldnames, hash_rows))
+    else:
+        _parse_chunks_parallel(chain(head, texts), fieldnames, workers, assembler, hash_rows)
+    return assembler.finish()
+
+
+def _parse_chunks_parallel(texts: Iterator[str], fieldnames: List[str], workers: int,
+                           assembler: _EngineeredAssembler, fingerprint: bool = False) -> None:
+    pending = deque()
+
+    def collect_oldest():
+        text, future = pending.popleft()
+        try:
+            assembler.add(future.result())
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            assembler.add(_parse_engineered_text(text, fieldnames, fingerprint))
+
+    pool = _worker_pool()
+    broken = False
+    for text in texts:
+        if not broken:
+            try:
+                pending.append((text, pool.submit(_parse_engineered_text, text, fieldnames, fingerprint)))
+            except (BrokenProcessPool, RuntimeError):
+                logger.warning("Parse worker pool failed, continuing in-process")
+                _discard_pool(pool)
+                broken = True
+        if broken:
+            while pending:
+                collect_oldest()
+            assembler.add(_parse_engineered_text(text, fieldnames, fingerprint))
+        # Bound the chunks in flight so memory stays flat on very large files
+        while len(pending) >= workers * 2:
+            collect_oldest()
+    while pending:
+        collect_oldest()
+
+
+def _parse_csv_lines(lines: Iterable[str], max_rows: Optional[int],
+                     progress: Optional[ProgressCallback] = None,
+                     digests: Optional[UploadDigests] = None) -> Dict[str, Any]:
+    """
+    Parse CSV text lines; engineered files take the chunked (possibly
+    parallel) path. A recognized table's fingerprint is added to `digests`.
+    """
+    lines = iter(lines)
+    fieldnames, rows = iter_csv_rows(lines)
+    kind = detect_schema(fieldnames)
+    fingerprint = TableFingerprint(fieldnames) if digests is not None and kind else None
+    if kind == "engineered":
+        # csv.reader has consumed only the header, so the raw lines continue from the first record
+        data = parse_engineered_csv(fieldnames, lines, max_rows=max_rows, progress=progress, fingerprint=fingerprint)
+    else:
+        data = DatasetBuilder(fieldnames, max_rows=max_rows, progress=progress,
+                              fingerprint=fingerprint).add_rows(rows).finish()
+    if fingerprint is not None:
+        digests.tables.append(fingerprint.digest())
+    return data
+
+
+SheetResult = Tuple[Optional[str], int, Dict[str, Any], Optional[bytes]]
+
+
+def _parse_sheet(source, sheet_name: str, max_rows: Optional[int],
+                 progress: Optional[ProgressCallback] = None, fingerprint: bool = False) -> SheetResult:
+    """
+    Worker: parse one sheet; `source` is a file path or the workbook bytes.
+    Returns (schema, rows read, dataset, table fingerprint if requested).
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    fieldnames, rows = iter_excel_rows(source, sheet_name)
+    table = TableFingerprint(fieldnames) if fingerprint else None
+    builder = DatasetBuilder(fieldnames, max_rows=max_rows, progress=progress, fingerprint=table).add_rows(rows)
+    return builder.kind, builder.rows_seen, builder.finish(), table.digest() if table is not None else None
+
+
+# Parse pool shared by every upload in the process (see _worker_pool)
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return min(PARSE_MAX_WORKERS, os.cpu_count() or 1)
+
+
+def _worker_pool() -> Executor:
+    """The long-lived parse pool, created on first use: processes when configured and available, threads otherwise"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+        if PARSE_EXECUTOR == "process":
+            try:
+                # Forking the multithreaded server can deadlock on locks held by other threads
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                if context.get_start_method() == "forkserver":
+                    context.set_forkserver_preload(["file_parser"])
+                _pool = ProcessPoolExecutor(max_workers=_pool_size(), mp_context=context)
+                return _pool
+            except (OSError, NotImplementedError, ImportError):
+                # e.g. serverless runtimes without /dev/shm semaphores
+                logger.warning("Process pool unavailable, parsing in threads")
+        _pool = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="parse")
+        return _pool
+
+
+def _discard_pool(pool: Executor) -> None:
+    """Drop a broken pool so the next upload starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """Stop the shared parse pool (on app shutdown); it is recreated if needed again"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _parse_sheets(source, sheet_names: List[str], max_rows: Optional[int],
+                  progress: Optional[ProgressCallback] = None, fingerprint: bool = False,
+                  parallel: bool = False) -> List[SheetResult]:
+    """Parse sheets in order, one pool task per sheet when `parallel` is set (`source` must then be a path)"""
+    if not parallel:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return [_parse_sheet(source, name, max_rows, progress, fingerprint) for name in sheet_names]
+
+    def collect(pool: Executor) -> List[SheetResult]:
+        results = []
+        count = len(sheet_names)
+        for result in pool.map(_parse_sheet, [source] * count, sheet_names, [max_rows] * count,
+                               [None] * count, [fingerprint] * count):
+            if progress is not None:
+                progress(result[1])
+            results.append(result)
+        return results
+
+    pool = _worker_pool()
+    try:
+        return collect(pool)
+    except BrokenProcessPool:
+        logger.warning("Sheet worker process died, retrying in threads")
+        _discard_pool(pool)
+        with ThreadPoolExecutor(max_workers=min(len(sheet_names), _pool_size())) as threads:
+            return collect(threads)
+
+
+# Rough compressed size of one workbook row, for sheets that do not declare their dimension
+_WORKBOOK_BYTES_PER_ROW = 32
+
+
+def _estimate_workbook_rows(source, declared: List[Optional[int]]) -> int:
+    """Declared row total, or a size-based guess when any sheet leaves its dimension out"""
+    known = sum(rows for rows in declared if rows is not None)
+    if all(rows is not None for rows in declared):
+        return known
+    if isinstance(source, bytes):
+        size = len(source)
+    elif isinstance(source, str):
+        size = os.path.getsize(source)
+    else:
+        size = source.seek(0, 2)
+        source.seek(0)
+    return max(known, size // _WORKBOOK_BYTES_PER_ROW)
+
+
+def parse_workbook(source, max_rows: Optional[int] = None, progress: Optional[ProgressCallback] = None,
+                   digests: Optional[UploadDigests] = None) -> Dict[str, Any]:
+    """
+    Parse every recognized sheet of a workbook (path, file object or bytes) and merge them.
+    Sheets are parsed on the shared worker pool once they hold SHEET_PARALLEL_MIN_ROWS rows in total.
+    """
+    headers = read_sheet_headers(BytesIO(source) if isinstance(source, bytes) else source)
+    recognized = [(title, rows) for title, fieldnames, rows in headers if detect_schema(fieldnames)]
+    if not recognized:
+        return merge_datasets([])
+    sheet_names = [title for title, _ in recognized]
+    parallel = (len(sheet_names) > 1 and _pool_size() > 1 and PARSE_EXECUTOR != "serial"
+                and _estimate_workbook_rows(source, [rows for _, rows in recognized]) >= SHEET_PARALLEL_MIN_ROWS)
+
+    spilled = None
+    if parallel and not isinstance(source, str):
+        # Workers each open the workbook, so hand them a path rather than the bytes or a shared file object
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+            if isinstance(source, bytes):
+                tmp.write(source)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, tmp)
+        spilled = source = tmp.name
+
+    try:
+        results = _parse_sheets(source, sheet_names, max_rows, progress,
+                                fingerprint=digests is not None, parallel=parallel)
+    finally:
+        if spilled:
+            os.unlink(spilled)
+
+    total_rows = sum(rows for _, rows, _, _ in results)
+    if max_rows is not None and total_rows > max_rows:
+        raise UploadLimitError(f"File exceeds the upload limit of {max_rows} rows")
+    if digests is not None:
+        digests.tables.extend(table for _, _, _, table in results)
+    return merge_datasets([(kind, data) for kind, _, data, _ in results])
+
 
 class FileParser:
     """Parse CSV/Excel financial data into standardized format"""
@@ -15,124 +741,56 @@ class FileParser:
         Parse CSV or Excel data and convert to financial data structure
         """
         try:
-            rows = []
             if filename.endswith('.csv'):
                 if isinstance(file_content, bytes):
-                    file_content = file_content.decode('utf-8')
-                f = StringIO(file_content)
-                reader = csv.DictReader(f)
-                reader.fieldnames = [col.lower().strip() for col in reader.fieldnames] if reader.fieldnames else []
-                rows = list(reader)
-                fieldnames = reader.fieldnames
+                    return _parse_csv_lines(iter_text_lines(BytesIO(file_content), max_bytes=None), max_rows=None)
+                return _parse_csv_lines(StringIO(file_content), max_rows=None)
             elif filename.endswith(('.xlsx', '.xls')):
                 if isinstance(file_content, str):
                     file_content = file_content.encode()
-                wb = openpyxl.load_workbook(BytesIO(file_content), data_only=True)
-                sheet = wb.active
-                fieldnames = [str(cell.value).lower().strip() for cell in sheet[1]]
-                for excel_row in sheet.iter_rows(min_row=2, values_only=True):
-                    row_dict = dict(zip(fieldnames, excel_row))
-                    rows.append(row_dict)
+                return parse_workbook(file_content)
             else:
                 raise ValueError("Unsupported file format. Please upload CSV or Excel file.")
-            
-            # Initialize base data structure
-            data = {
-                "user_id": "uploaded",
-                "profile": {"name": "User", "email": "user@example.com", "monthly_income": 85000},
-                "expenses": [],
-                "investments": [],
-                "goals": [],
-                "monthly_history": []
-            }
-            
-            # Check if this is an engineered dataset
-            engineered_cols = {'income', 'rent', 'groceries', 'transport', 'eating_out', 'utilities', 'healthcare'}
-            if engineered_cols.issubset(set(fieldnames)):
-                return FileParser._parse_engineered_data(rows, fieldnames, data)
-            
-            # Parse expenses
-            if all(col in fieldnames for col in ['date', 'category', 'amount']):
-                for row in rows:
-                    data["expenses"].append({
-                        "date": str(row['date']),
-                        "category": str(row['category']),
-                        "amount": float(row['amount'])
-                    })
-            
-            # Parse investments
-            elif all(col in fieldnames for col in ['type', 'amount']) and 'return' in fieldnames:
-                for row in rows:
-                    data["investments"].append({
-                        "type": str(row['type']),
-                        "amount": float(row['amount']),
-                        "annual_return": float(row.get('return', 0))
-                    })
-            
-            # Parse goals
-            elif all(col in fieldnames for col in ['name', 'target', 'current']):
-                for row in rows:
-                    data["goals"].append({
-                        "name": str(row['name']),
-                        "target": float(row['target']),
-                        "current": float(row['current']),
-                        "deadline": str(row.get('deadline', '2025-12-31'))
-                    })
-            
-            return data
         
         except Exception as e:
             raise ValueError(f"Error parsing file: {str(e)}")
     
     @staticmethod
-    def _parse_engineered_data(rows: List[Dict[str, Any]], fieldnames: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse the engineered financial dataset format"""
-        if not rows:
-            return data
-            
-        sample_row = rows[0]
-        monthly_income = float(sample_row.get('income', 85000))
-        data["profile"]["monthly_income"] = monthly_income
-        
-        expense_categories = [
-            'rent', 'loan_repayment', 'insurance', 'groceries', 'transport',
-            'eating_out', 'entertainment', 'utilities', 'healthcare', 'education',
-            'miscellaneous'
-        ]
-        
-        base_date = datetime.now() - timedelta(days=90)
-        for idx, row in enumerate(rows):
-            for category in expense_categories:
-                if category in row:
-                    try:
-                        amount = float(row.get(category, 0))
-                        if amount > 0:
-                            date = base_date + timedelta(days=(idx % 90))
-                            data["expenses"].append({
-                                "date": date.strftime("%Y-%m-%d"),
-                                "category": category.replace('_', ' ').title(),
-                                "amount": amount
-                            })
-                    except: continue
-        
-        if 'savings' in row:
-            for idx, row in enumerate(rows):
-                try:
-                    savings = float(row.get('savings', 0))
-                    if savings > 0:
-                        data["investments"].append({
-                            "type": ["Stocks", "Mutual Funds", "Fixed Deposits", "Gold"][idx % 4],
-                            "amount": savings,
-                            "annual_return": random.uniform(5, 15)
-                        })
-                except: continue
-        
+    def parse_stream(fileobj: BinaryIO, filename: str, max_bytes: Optional[int] = MAX_UPLOAD_BYTES,
+                     max_rows: Optional[int] = MAX_UPLOAD_ROWS,
+                     progress: Optional[ProgressCallback] = None,
+                     digests: Optional[UploadDigests] = None) -> Dict[str, Any]:
+        """
+        Parse an upload from a binary file object without reading it whole.
+        Raises UploadLimitError when a limit is exceeded, ValueError otherwise.
+        """
+        try:
+            if filename.endswith('.csv'):
+                lines = iter_text_lines(fileobj, max_bytes=max_bytes)
+                return _parse_csv_lines(lines, max_rows=max_rows, progress=progress, digests=digests)
+            elif filename.endswith(('.xlsx', '.xls')):
+                fileobj.seek(0, 2)
+                size = fileobj.tell()
+                fileobj.seek(0)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadLimitError(f"File exceeds the upload limit of {max_bytes} bytes")
+                return parse_workbook(fileobj, max_rows=max_rows, progress=progress, digests=digests)
+            else:
+                raise ValueError("Unsupported file format. Please upload CSV or Excel file.")
+
+        except UploadLimitError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error parsing file: {str(e)}")
+    
+    @staticmethod
+    def _add_engineered_goals(data: Dict[str, Any]) -> None:
+        monthly_income = data["profile"]["monthly_income"]
         data["goals"] = [
-            {"name": "Emergency Fund", "target": monthly_income * 6, "current": monthly_income * 3, "deadline": (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d")},
-            {"name": "Vacation", "target": 200000, "current": 50000, "deadline": (datetime.now() + timedelta(days=180)).strftime("%Y-%m-%d")},
-            {"name": "Home Down Payment", "target": 1000000, "current": 200000, "deadline": (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%d")}
+            Goal("Emergency Fund", monthly_income * 6, monthly_income * 3, (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d")),
+            Goal("Vacation", 200000, 50000, (datetime.now() + timedelta(days=180)).strftime("%Y-%m-%d")),
+            Goal("Home Down Payment", 1000000, 200000, (datetime.now() + timedelta(days=730)).strftime("%Y-%m-%d"))
         ]
-        return data
     
     @staticmethod
     def format_for_display(data: Dict[str, Any]) -> Dict[str, Any]:
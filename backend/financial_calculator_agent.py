@@ -1,11 +1,12 @@
 import json
 import re
-from gemini_client import get_gemini_client
-from config import TEXT_MODEL
+from llm_gateway import generate_text, agenerate_text
 from calculator import *
+from calculator_intent import FUNCTION_ALIASES, PARAM_WHITELIST, parse_calculator_query
+from config import LOCAL_PARSER_MIN_CONFIDENCE
 
-def financial_calculator(query: str):
-    prompt = f"""
+def _build_prompt(query: str) -> str:
+    return f"""
 You are a financial calculator assistant.
 
 Determine which financial function to call and extract numeric parameters.
@@ -17,56 +18,32 @@ Query:
 {query}
 """
 
-    client = get_gemini_client()
-    response = client.models.generate_content(
-        model=TEXT_MODEL,
-        contents=prompt
-    )
-
-    try:
-        # Clean Gemini output
-        response_text = response.text.strip()
-        response_text = re.sub(r"```json|```", "", response_text).strip()
-
-        parsed = json.loads(response_text)
-
-        raw_function = parsed.get("function") or parsed.get("function_name")
-
-        # Map Gemini function names to internal functions
-        FUNCTION_ALIASES = {
-            "budget": "budget_allocation",
-            "budgeting": "budget_allocation",
-            "emergency": "emergency_fund",
-            "emergency_fund": "emergency_fund",
-            "debt": "debt_payoff",
-            "debt_payoff": "debt_payoff",
-            "investment": "investment_growth",
-            "invest": "investment_growth",
-            "mortgage": "mortgage_payment",
-            "loan": "mortgage_payment"
-        }
-
-        function_name = FUNCTION_ALIASES.get(raw_function, raw_function)
-
-        raw_params = parsed.get("parameters", {})
-
-        # Allowed parameters per function
-        PARAM_WHITELIST = {
-            "budget_allocation": {"income"},
-            "emergency_fund": {"monthly_expenses"},
-            "debt_payoff": {"principal", "annual_interest_rate", "monthly_payment"},
-            "investment_growth": {"principal", "annual_return_rate", "years"},
-            "mortgage_payment": {"loan_amount", "annual_interest_rate", "years"},
-        }
-
-        # Apply whitelist
-        allowed_keys = PARAM_WHITELIST.get(function_name, set())
-        parameters = {k: v for k, v in raw_params.items() if k in allowed_keys}
-
+def _parse_locally(query: str):
+    """Local parse of `query`, or None when it is not confident enough to skip the LLM"""
+    parsed = parse_calculator_query(query)
+    if parsed and parsed["confidence"] >= LOCAL_PARSER_MIN_CONFIDENCE:
+        return parsed
+    return None
 
-        if not function_name:
-            return {"error": "No function detected"}
+def financial_calculator(query: str):
+    local = _parse_locally(query)
+    if local:
+        return _execute(local["function_name"], local["parameters"])
+    return _run_calculation(generate_text(_build_prompt(query)))
+
+async def afinancial_calculator(query: str):
+    """Async variant of `financial_calculator`"""
+    local = _parse_locally(query)
+    if local:
+        return _execute(local["function_name"], local["parameters"])
+    return _run_calculation(await agenerate_text(_build_prompt(query)))
+
+def _execute(function_name: str, parameters: dict):
+    """Run a whitelisted calculator function; bad parameters give a structured error"""
+    if not function_name:
+        return {"error": "No function detected"}
 
+    try:
         if function_name == "budget_allocation":
             result = budget_allocation(**parameters)
         elif function_name == "emergency_fund":
@@ -79,16 +56,45 @@ Query:
             result = mortgage_payment(**parameters)
         else:
             return {"error": f"Unknown function: {function_name}"}
-
+    except (TypeError, ValueError, ArithmeticError) as e:
         return {
+            "error": "Failed to execute financial calculation",
             "function_name": function_name,
             "parameters": parameters,
-            "result": result
+            "exception": str(e)
         }
 
+    return {
+        "function_name": function_name,
+        "parameters": parameters,
+        "result": result
+    }
+
+def _run_calculation(raw_response: str):
+    """Parse the model's JSON answer and execute the selected calculator function"""
+    try:
+        # Clean Gemini output
+        response_text = raw_response.strip()
+        response_text = re.sub(r"```json|```", "", response_text).strip()
+
+        parsed = json.loads(response_text)
+
+        raw_function = parsed.get("function") or parsed.get("function_name")
+
+        # Map Gemini function names to internal functions
+        function_name = FUNCTION_ALIASES.get(raw_function, raw_function)
+
+        raw_params = parsed.get("parameters", {})
+
+        # Apply whitelist
+        allowed_keys = PARAM_WHITELIST.get(function_name, set())
+        parameters = {k: v for k, v in raw_params.items() if k in allowed_keys}
+
+        return _execute(function_name, parameters)
+
     except Exception as e:
         return {
             "error": "Failed to parse or execute financial calculation",
-            "raw_response": response.text,
+            "raw_response": raw_response,
             "exception": str(e)
         }
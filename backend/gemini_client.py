@@ -1,6 +1,5 @@
-from google import genai
-from config import GEMINI_API_KEY
+from llm_gateway import get_client
 
 def get_gemini_client():
-    # Lazy initialization (safe for runtime)
-    return genai.Client(api_key=GEMINI_API_KEY)
+    # Shared process-wide client, see llm_gateway
+    return get_client()
@@ -0,0 +1,146 @@
+"""Vectorized Monte Carlo simulation of goal success over one shared matrix of monthly returns"""
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from config import MONTE_CARLO_PATHS, MONTE_CARLO_SEED, MONTE_CARLO_MAX_CELLS
+
+# Annualized volatility per investment type (matched case-insensitively by substring)
+INVESTMENT_VOLATILITY = {
+    "stock": 0.20,
+    "mid-cap": 0.22,
+    "mutual fund": 0.15,
+    "sip": 0.15,
+    "index": 0.15,
+    "gold": 0.15,
+    "fixed deposit": 0.01,
+    "government scheme": 0.01,
+    "ppf": 0.01,
+}
+DEFAULT_ANNUAL_RETURN = 0.10
+DEFAULT_VOLATILITY = 0.15
+
+PERCENTILES = (10, 50, 90)
+
+
+def _volatility_for(investment_type: str) -> float:
+    name = (investment_type or "").lower()
+    for key, vol in INVESTMENT_VOLATILITY.items():
+        if key in name:
+            return vol
+    return DEFAULT_VOLATILITY
+
+
+def _expected_return(investment: Dict[str, Any]) -> Optional[float]:
+    """Annual return as a fraction from `annual_return` (percent) or an "expectedReturns" label like "12-14%" """
+    if investment.get("annual_return") is not None:
+        return float(investment["annual_return"]) / 100
+    numbers = re.findall(r"\d+(?:\.\d+)?", str(investment.get("expectedReturns", "")))
+    if numbers:
+        return float(np.mean([float(n) for n in numbers])) / 100
+    return None
+
+
+def portfolio_assumptions(investments: List[Dict[str, Any]]) -> Tuple[float, float]:
+    """Amount-weighted (annual return, volatility) of a portfolio, assuming perfect correlation"""
+    returns, vols, weights = [], [], []
+    for inv in investments:
+        expected = _expected_return(inv)
+        if expected is None:
+            continue
+        returns.append(expected)
+        vols.append(_volatility_for(inv.get("type") or inv.get("name", "")))
+        weights.append(float(inv.get("amount", 1) or 0))
+    if not returns or sum(weights) <= 0:
+        return DEFAULT_ANNUAL_RETURN, DEFAULT_VOLATILITY
+    w = np.asarray(weights) / sum(weights)
+    return float(np.dot(w, returns)), float(np.dot(w, vols))
+
+
+def months_until(deadline: str, today: Optional[date] = None) -> int:
+    """Whole months from `today` until an ISO `deadline` (0 if passed or unparseable)"""
+    today = today or date.today()
+    try:
+        end = datetime.strptime(str(deadline)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return 0
+    return max(0, (end.year - today.year) * 12 + (end.month - today.month))
+
+
+def simulate_growth_paths(months: int, annual_return: float, volatility: float,
+                          paths: int = MONTE_CARLO_PATHS, seed: int = MONTE_CARLO_SEED) -> np.ndarray:
+    """(paths, months) matrix of cumulative growth factors from lognormal monthly returns"""
+    if paths < 1:
+        raise ValueError("paths must be at least 1")
+    if paths * months > MONTE_CARLO_MAX_CELLS:
+        raise ValueError(f"Simulation too large ({paths} paths x {months} months)")
+    rng = np.random.default_rng(seed)
+    sigma = volatility / np.sqrt(12)
+    # Drift chosen so the expected annual growth equals `annual_return`
+    mu = np.log1p(annual_return) / 12 - 0.5 * sigma ** 2
+    log_returns = rng.normal(mu, sigma, size=(paths, months))
+    return np.exp(np.cumsum(log_returns, axis=1))
+
+
+def simulate_goal(target: float, saved: float, months: int, growth: np.ndarray,
+                  monthly_contribution: float = 0.0, band_points: int = 24) -> Dict[str, Any]:
+    """Success probability and percentile bands for one goal over `growth` paths from `simulate_growth_paths`"""
+    if growth.shape[0] < 1:
+        raise ValueError("paths must be at least 1")
+    if months <= 0:
+        reached = saved >= target
+        return {
+            "probability": 1.0 if reached else 0.0,
+            "months": 0,
+            "percentiles": {f"p{p}": float(saved) for p in PERCENTILES},
+            "bands": {"month": [], **{f"p{p}": [] for p in PERCENTILES}},
+        }
+
+    G = growth[:, :months]
+    # Contributions land at month end: value_t = G_t * (saved + c * sum_{s<=t} 1 / G_s)
+    values = G * (saved + monthly_contribution * np.cumsum(1.0 / G, axis=1))
+    final = values[:, -1]
+
+    # Sample the band at most `band_points` months, always including the deadline
+    band_months = np.unique(np.linspace(1, months, min(band_points, months)).round().astype(int))
+    band = np.percentile(values[:, band_months - 1], PERCENTILES, axis=0)
+    final_pct = np.percentile(final, PERCENTILES)
+
+    return {
+        "probability": float(np.mean(final >= target)),
+        "months": months,
+        "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, final_pct)},
+        "bands": {
+            "month": band_months.tolist(),
+            **{f"p{p}": row.tolist() for p, row in zip(PERCENTILES, band)}
+        },
+    }
+
+
+def simulate_goals(goals: List[Dict[str, Any]], investments: List[Dict[str, Any]],
+                   monthly_contribution: float = 0.0, paths: int = MONTE_CARLO_PATHS,
+                   seed: int = MONTE_CARLO_SEED, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Simulate every goal, splitting `monthly_contribution` across goals still open and not yet reached"""
+    annual_return, volatility = portfolio_assumptions(investments)
+    horizons = [months_until(g.get("deadline", ""), today) for g in goals]
+    amounts = [
+        (float(g.get("target", 0) or 0), float(g.get("saved", g.get("current", 0)) or 0))
+        for g in goals
+    ]
+    funded = [saved < target and months > 0 for (target, saved), months in zip(amounts, horizons)]
+    per_goal = monthly_contribution / sum(funded) if any(funded) else 0.0
+
+    growth = simulate_growth_paths(max(horizons, default=0), annual_return, volatility, paths, seed)
+    results = []
+    for (target, saved), months, is_funded in zip(amounts, horizons, funded):
+        contribution = per_goal if is_funded else 0.0
+        result = simulate_goal(target, saved, months, growth, contribution)
+        result["assumptions"] = {
+            "annual_return": annual_return,
+            "volatility": volatility,
+            "monthly_contribution": contribution,
+            "paths": paths,
+            "seed": seed,
+        }
+        results.append(result)
+    return results
@@ -0,0 +1,177 @@
+"""Background ingestion of uploads (/upload?async=1) with progress reported at GET /jobs/{id}"""
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Optional
+from aggregates import get_aggregates
+from dataset_store import DatasetStore
+from file_parser import FileParser, UploadDigests, UploadLimitError
+from config import (
+    MAX_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES,
+    INGEST_MAX_WORKERS, INGEST_MAX_QUEUED, INGEST_JOB_RETENTION,
+)
+
+
+class JobQueueFull(RuntimeError):
+    """More than INGEST_MAX_QUEUED jobs are waiting for a worker"""
+
+
+def upload_summary(file_id: str, filename: str, data: Dict[str, Any], duplicate: Optional[str]) -> Dict[str, Any]:
+    """Response body for a stored upload (shared by /upload and finished jobs)"""
+    return {
+        "file_id": file_id,
+        "filename": filename,
+        "message": "File already uploaded; returning the stored dataset" if duplicate else "File uploaded and parsed successfully",
+        "deduplicated": duplicate,
+        "data_summary": {
+            "expenses_count": len(data.get("expenses", [])),
+            "investments_count": len(data.get("investments", [])),
+            "goals_count": len(data.get("goals", [])),
+            "subscriptions_count": len(data.get("subscriptions", []))
+        },
+        "aggregates": get_aggregates(data),
+        "ingest_report": data.get("ingest_report")
+    }
+
+
+def spool_upload(fileobj: BinaryIO, filename: str, max_bytes: Optional[int] = MAX_UPLOAD_BYTES) -> str:
+    """
+    Copy an upload to a temp file that outlives the request and return its
+    path. Raises UploadLimitError past `max_bytes`.
+    """
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+    total = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = fileobj.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if max_bytes is not None and total > max_bytes:
+                    raise UploadLimitError(f"File exceeds the upload limit of {max_bytes} bytes")
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+class IngestJob:
+    """State of one background upload"""
+
+    def __init__(self, filename: str, size: int):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.size = size
+        self.status = "queued"
+        # Within a running job: "parsing" (the dedup hash, then the parse on a miss), then "storing"
+        self.stage: Optional[str] = None
+        self.rows_processed = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.parse_started_at: Optional[float] = None
+        self.parse_finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.error_status: Optional[int] = None
+
+    def add_rows(self, count: int):
+        self.rows_processed += count
+
+    def parse(self, fileobj: BinaryIO, filename: str, digests: Optional[UploadDigests] = None) -> Dict[str, Any]:
+        """FileParser.parse_stream with progress and parse timing recorded on the job"""
+        self.stage = "parsing"
+        self.parse_started_at = time.time()
+        data = FileParser.parse_stream(fileobj, filename, progress=self.add_rows, digests=digests)
+        self.parse_finished_at = time.time()
+        self.stage = "storing"
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        elapsed = (self.finished_at or now) - self.started_at if self.started_at is not None else None
+        # Throughput covers parsing only; storing does not advance the row count
+        parse_elapsed = (self.parse_finished_at or now) - self.parse_started_at if self.parse_started_at is not None else None
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "size_bytes": self.size,
+            "status": self.status,
+            "stage": self.stage,
+            "rows_processed": self.rows_processed,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": self.rows_processed / parse_elapsed if parse_elapsed else None,
+            "result": self.result,
+            "error": self.error,
+            "error_status": self.error_status,
+        }
+
+
+class JobManager:
+    """Runs upload ingestion on worker threads; `submit` raises JobQueueFull past `max_queued` waiting jobs"""
+
+    def __init__(self, store: DatasetStore, max_workers: int = INGEST_MAX_WORKERS,
+                 max_queued: int = INGEST_MAX_QUEUED, retention: int = INGEST_JOB_RETENTION):
+        self.store = store
+        self.max_queued = max_queued
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, filename: str) -> IngestJob:
+        """Queue ingestion of the spooled file at `path`; the job deletes it when done"""
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} uploads are already waiting; try again later")
+            job = IngestJob(filename, os.path.getsize(path))
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, path)
+        return job
+
+    def _run(self, job: IngestJob, path: str):
+        job.status = "running"
+        job.stage = "parsing"
+        job.started_at = time.time()
+        try:
+            with open(path, "rb") as f:
+                file_id, data, duplicate = self.store.ingest(f, job.filename, job.parse)
+            job.result = upload_summary(file_id, job.filename, data, duplicate)
+            job.status = "completed"
+        except UploadLimitError as e:
+            job.error, job.error_status, job.status = str(e), 413, "failed"
+        except ValueError as e:
+            job.error, job.error_status, job.status = str(e), 400, "failed"
+        except Exception as e:
+            job.error, job.error_status, job.status = f"Error processing file: {str(e)}", 500, "failed"
+        finally:
+            job.stage = None
+            job.finished_at = time.time()
+            os.unlink(path)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from config import (
+    CACHE_DIR,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_DISK_MAX_BYTES,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LLM responses keyed by (model, normalized prompt): an LRU in memory over a size-capped SQLite file, both with one TTL"""
+
+    def __init__(
+        self,
+        path: str = os.path.join(CACHE_DIR, "llm_cache.sqlite3"),
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        disk_max_bytes: int = LLM_CACHE_DISK_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            if not self._disk_ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, model TEXT, response TEXT, "
+                    "size INTEGER, created_at REAL, accessed_at REAL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+                self._disk_ready = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _remember(self, key: str, response: str, created_at: float):
+        with self._lock:
+            self._memory[key] = (response, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Return a cached response, or None on a miss or expired entry"""
+        key = cache_key(model, prompt)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                elif row is not None:
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        self._remember(key, row[0], row[1])
+        with self._lock:
+            self.disk_hits += 1
+        return row[0]
+
+    def set(self, model: str, prompt: str, response: str):
+        """Store `response` in both tiers"""
+        key = cache_key(model, prompt)
+        now = time.time()
+        self._remember(key, response, now)
+        size = len(response.encode("utf-8"))
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now),
+                )
+                self._evict(conn, now)
+        except sqlite3.Error:
+            # The disk tier is best effort; the memory tier still has the entry
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.disk_max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every LLM call in the process
+response_cache = ResponseCache()
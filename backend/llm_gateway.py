@@ -0,0 +1,109 @@
+"""Single entry point for Gemini calls, sharing one client across the process"""
+import asyncio
+import threading
+from typing import List, Optional
+from google import genai
+from google.genai import types
+from config import GEMINI_API_KEY, TEXT_MODEL, EMBEDDING_MODEL, LLM_TIMEOUT_SECONDS, LLM_CACHE_ENABLED
+from llm_cache import response_cache
+
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> genai.Client:
+    """Return the shared Gemini client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Lazy initialization (safe for runtime without an API key)
+                _client = genai.Client(api_key=GEMINI_API_KEY)
+    return _client
+
+
+def _http_options(timeout: Optional[float]) -> Optional[types.HttpOptions]:
+    if timeout is None:
+        return None
+    return types.HttpOptions(timeout=int(timeout * 1000))
+
+
+def _generate_config(timeout: Optional[float]) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(http_options=_http_options(timeout))
+
+
+def _embed_config(timeout: Optional[float]) -> types.EmbedContentConfig:
+    return types.EmbedContentConfig(http_options=_http_options(timeout))
+
+
+def generate_text(
+    prompt: str,
+    model: str = TEXT_MODEL,
+    timeout: Optional[float] = LLM_TIMEOUT_SECONDS,
+    use_cache: bool = LLM_CACHE_ENABLED,
+) -> str:
+    """Generate a text completion for `prompt`"""
+    if use_cache:
+        cached = response_cache.get(model, prompt)
+        if cached is not None:
+            return cached
+    response = get_client().models.generate_content(
+        model=model,
+        contents=prompt,
+        config=_generate_config(timeout)
+    )
+    if use_cache and response.text:
+        response_cache.set(model, prompt, response.text)
+    return response.text
+
+
+async def agenerate_text(
+    prompt: str,
+    model: str = TEXT_MODEL,
+    timeout: Optional[float] = LLM_TIMEOUT_SECONDS,
+    use_cache: bool = LLM_CACHE_ENABLED,
+) -> str:
+    """Async variant of `generate_text`"""
+    if use_cache:
+        # The disk tier is SQLite, so cache access runs off the event loop
+        cached = await asyncio.to_thread(response_cache.get, model, prompt)
+        if cached is not None:
+            return cached
+    response = await get_client().aio.models.generate_content(
+        model=model,
+        contents=prompt,
+        config=_generate_config(timeout)
+    )
+    if use_cache and response.text:
+        await asyncio.to_thread(response_cache.set, model, prompt, response.text)
+    return response.text
+
+
+def embed_text(text: str, model: str = EMBEDDING_MODEL, timeout: Optional[float] = LLM_TIMEOUT_SECONDS) -> List[float]:
+    """Embed a single string"""
+    response = get_client().models.embed_content(
+        model=model,
+        contents=text,
+        config=_embed_config(timeout)
+    )
+    return response.embeddings[0].values
+
+
+def embed_texts(texts: List[str], model: str = EMBEDDING_MODEL, timeout: Optional[float] = LLM_TIMEOUT_SECONDS) -> List[List[float]]:
+    """Embed several strings in one request, preserving order"""
+    response = get_client().models.embed_content(
+        model=model,
+        contents=texts,
+        config=_embed_config(timeout)
+    )
+    return [embedding.values for embedding in response.embeddings]
+
+
+async def aembed_text(text: str, model: str = EMBEDDING_MODEL, timeout: Optional[float] = LLM_TIMEOUT_SECONDS) -> List[float]:
+    """Async variant of `embed_text`"""
+    response = await get_client().aio.models.embed_content(
+        model=model,
+        contents=text,
+        config=_embed_config(timeout)
+    )
+    return response.embeddings[0].values
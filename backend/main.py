@@ -1,14 +1,41 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from financial_calculator_agent import financial_calculator
-from rag import get_financial_advice_with_rag
-from data_loader import DataLoader
-from file_parser import FileParser
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from financial_calculator_agent import afinancial_calculator
+from rag import aget_financial_advice_with_rag
+from data_loader import DataLoader, snapshot_cache
+from file_parser import UploadLimitError, shutdown_worker_pool
+from aggregates import get_aggregates
+from dataset_store import DatasetStore
+from ingest_jobs import JobManager, JobQueueFull, spool_upload, upload_summary
+from llm_cache import response_cache
+from semantic_cache import semantic_cache
+from calculator import debt_payoff_batch, amortization_schedule, sweep_axis, sweep_axis_length, SWEEP_FUNCTIONS
+from goal_simulation import simulate_goals
+from debt_planner import STRATEGIES, compare_strategies, iter_repayment_schedule, summarize_plan
+from config import (
+    SEMANTIC_CACHE_ENABLED, CALCULATOR_MAX_CELLS, MONTE_CARLO_PATHS, MONTE_CARLO_SEED, MONTE_CARLO_MAX_PATHS,
+    DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS,
+)
+from typing import Optional, Dict, Any, List, Union
+import asyncio
+import contextlib
+import inspect
 import json
+import math
+import os
+import numpy as np
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Let background uploads finish, then stop the shared parse worker processes
+    ingest_jobs.shutdown()
+    shutdown_worker_pool()
 
-app = FastAPI(title="FinGenius AI Agent")
+app = FastAPI(title="FinGenius AI Agent", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -19,14 +46,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for uploaded user data (in production, use a database)
-# NOTE: This will reset when the Vercel function spins down.
-uploaded_data_store = {}
+# Uploaded datasets: kept in memory up to DATASET_STORE_MAX_BYTES, reloaded from user_data/*.fgb after eviction
+# NOTE: On Vercel the files live in /tmp and are lost when the function spins down.
+uploaded_data_store = DatasetStore()
+# Background parsing for /upload?async=1
+ingest_jobs = JobManager(uploaded_data_store)
 
 class QueryRequest(BaseModel):
     query: str
     user_id: Optional[str] = "default"
 
+class DebtPayoffBatchRequest(BaseModel):
+    principal: List[float]
+    annual_interest_rate: List[float]
+    monthly_payment: List[float]
+    schedule: bool = False
+    max_months: int = 360
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    step: Optional[float] = Field(None, gt=0)
+    num: Optional[int] = Field(None, ge=0, le=CALCULATOR_MAX_CELLS)
+
+class SweepRequest(BaseModel):
+    function: str
+    # Each parameter is a number, a list, or {"start", "stop", "step" | "num"}
+    parameters: Dict[str, Union[float, List[float], SweepRange]]
+
+class DebtPlanRequest(BaseModel):
+    # Each loan: name, balance, annual_interest_rate and min_payment or term_years
+    loans: List[Dict[str, Any]]
+    monthly_budget: float
+    strategy: str = "avalanche"
+    order: Optional[List[str]] = None
+    max_months: int = 600
+    stream: bool = False
+
+def _to_json_list(values: np.ndarray) -> list:
+    """ndarray -> nested lists with NaN replaced by None"""
+    return np.where(np.isnan(values), None, values).tolist() if values.dtype.kind == "f" else values.tolist()
+
 # Initialize data loader
 data_loader = DataLoader()
 
@@ -42,170 +102,222 @@ def read_root():
         "endpoints": {
             "upload": "/upload",
             "ask": "/ask",
-            "dashboard": "/dashboard/*"
+            "dashboard": "/dashboard/*",
+            "bundle": "/dashboard/bundle"
         }
     }
 
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), run_async: bool = Query(False, alias="async")):
     """
     Upload CSV or Excel file with financial data.
-    Returns a file_id to be used in subsequent API calls.
+    Returns a file_id to be used in subsequent API calls, or with ?async=1 a job to poll.
     """
     try:
-        contents = await file.read()
-        
-        # Decode for CSV, keep as bytes for Excel
-        if file.filename.endswith('.csv'):
-            file_content = contents.decode('utf-8')
-        else:
-            file_content = contents
-        
-        # Parse the file
-        parsed_data = FileParser.parse_file(file_content, file.filename)
-        
-        # Generate a simple file ID (in production, use UUID + database)
-        file_id = f"uploaded_{len(uploaded_data_store)}"
-        uploaded_data_store[file_id] = parsed_data
-        
-        # For Vercel, we use /tmp for temporary storage. 
-        # Note: This is NOT persistent across requests.
-        import os
-        upload_dir = "/tmp/user_data" if os.environ.get("VERCEL") else "user_data"
-        os.makedirs(upload_dir, exist_ok=True)
-        with open(f"{upload_dir}/{file_id}.json", "w") as f:
-            json.dump(parsed_data, f, indent=2)
-        
-        return {
-            "file_id": file_id,
-            "filename": file.filename,
-            "message": "File uploaded and parsed successfully",
-            "data_summary": {
-                "expenses_count": len(parsed_data.get("expenses", [])),
-                "investments_count": len(parsed_data.get("investments", [])),
-                "goals_count": len(parsed_data.get("goals", []))
-            }
-        }
+        if run_async:
+            if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
+                raise ValueError("Unsupported file format. Please upload CSV or Excel file.")
+            # The request's upload file is closed after the response, so the job gets its own copy
+            path = await run_in_threadpool(spool_upload, file.file, file.filename)
+            try:
+                job = ingest_jobs.submit(path, file.filename)
+            except JobQueueFull as e:
+                os.unlink(path)
+                raise HTTPException(status_code=503, detail=str(e))
+            return JSONResponse(status_code=202, content={**job.to_dict(), "status_url": f"/jobs/{job.id}"})
+
+        # UploadFile is spooled to disk past a small threshold; hash and parse it in chunks off the event loop.
+        # Re-uploads of the same bytes or rows return the stored dataset instead of storing it again.
+        file_id, parsed_data, duplicate = await run_in_threadpool(uploaded_data_store.ingest, file.file, file.filename)
+        return upload_summary(file_id, file.filename, parsed_data, duplicate)
+    except HTTPException:
+        raise
+    except UploadLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status, rows processed, throughput and result of a background upload"""
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Hit/miss counters for the in-process caches"""
+    return {
+        "llm": response_cache.stats(),
+        "semantic": semantic_cache.stats(),
+        "datasets": snapshot_cache.stats(),
+        "upload_store": uploaded_data_store.stats(),
+        "uploads": uploaded_data_store.upload_stats(),
+        "ingest_jobs": ingest_jobs.stats()
+    }
+
+@app.post("/calculator/debt_payoff")
+def calculate_debt_payoff_batch(req: DebtPayoffBatchRequest):
+    """
+    Closed-form payoff for many loans in one call.
+    Lists are broadcast against each other (a single-element list applies to every loan).
+    """
+    try:
+        result = debt_payoff_batch(req.principal, req.annual_interest_rate, req.monthly_payment)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = {
+        "months_to_payoff": _to_json_list(result["months_to_payoff"]),
+        "total_interest": _to_json_list(result["total_interest"]),
+        "feasible": result["feasible"].tolist()
+    }
+    if req.schedule:
+        if len(result["feasible"]) * req.max_months > CALCULATOR_MAX_CELLS:
+            raise HTTPException(status_code=400, detail=f"Schedule too large (limit {CALCULATOR_MAX_CELLS} cells)")
+        schedule = amortization_schedule(req.principal, req.annual_interest_rate, req.monthly_payment, req.max_months)
+        response["schedule"] = {key: _to_json_list(values) for key, values in schedule.items()}
+    return response
+
+@app.post("/calculator/sweep")
+def calculate_sweep(req: SweepRequest):
+    """
+    Evaluate investment_growth or mortgage_payment over the Cartesian grid of parameter ranges.
+    Result matrices are indexed in the order of `axes`.
+    """
+    if req.function not in SWEEP_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown sweep function: {req.function}")
+    grid_fn, axis_names = SWEEP_FUNCTIONS[req.function]
+
+    missing = [name for name in axis_names if name not in req.parameters]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing parameters: {', '.join(missing)}")
+    specs = {
+        name: spec.model_dump(exclude_none=True) if isinstance(spec, SweepRange) else spec
+        for name, spec in ((name, req.parameters[name]) for name in axis_names)
+    }
+    try:
+        # Size the grid from the specs before any axis is allocated
+        shape = [sweep_axis_length(spec) for spec in specs.values()]
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid range: {e}")
+    if math.prod(shape) > CALCULATOR_MAX_CELLS:
+        raise HTTPException(status_code=400, detail=f"Grid too large (limit {CALCULATOR_MAX_CELLS} cells)")
+    axes = {name: sweep_axis(spec, max_points=CALCULATOR_MAX_CELLS) for name, spec in specs.items()}
+
+    results = grid_fn(*axes.values())
+    return {
+        "function": req.function,
+        "axes": {name: axis.tolist() for name, axis in axes.items()},
+        "shape": shape,
+        "results": {key: _to_json_list(values) for key, values in results.items()}
+    }
+
+@app.post("/calculator/debt_plan")
+def calculate_debt_plan(req: DebtPlanRequest):
+    """
+    Repayment plan for several loans sharing one monthly budget.
+    With stream=true the month-by-month schedule is streamed as NDJSON.
+    """
+    if req.strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy: {req.strategy}")
+    if req.strategy == "custom" and not req.order:
+        raise HTTPException(status_code=400, detail="Custom strategy requires an order")
+    if len(req.loans) * req.max_months > CALCULATOR_MAX_CELLS:
+        raise HTTPException(status_code=400, detail=f"Plan too large (limit {CALCULATOR_MAX_CELLS} cells)")
+    try:
+        if req.stream:
+            schedule = iter_repayment_schedule(req.loans, req.monthly_budget, req.strategy, req.order, req.max_months)
+            # Prime the generator so validation errors surface as a 400, not mid-stream
+            first = next(schedule, None)
+
+            def lines():
+                if first is None:
+                    return
+                yield json.dumps(first) + "\n"
+                for month in schedule:
+                    yield json.dumps(month) + "\n"
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+        return {
+            "plan": summarize_plan(req.loans, req.monthly_budget, req.strategy, req.order, req.max_months),
+            "comparison": compare_strategies(req.loans, req.monthly_budget, req.order, req.max_months)
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/ask")
-def ask_agent(req: QueryRequest):
+async def ask_agent(req: QueryRequest):
     q = req.query.lower()
-    data_loader_user = DataLoader(req.user_id)
 
     if any(k in q for k in ["budget", "invest", "loan", "mortgage", "debt", "interest"]):
-        return financial_calculator(req.query)
-    result = get_financial_advice_with_rag(req.query)
+        return await afinancial_calculator(req.query)
+
+    # Near-identical questions are answered from the semantic cache
+    query_vector = None
+    if SEMANTIC_CACHE_ENABLED:
+        try:
+            query_vector = await run_in_threadpool(semantic_cache.embed, req.query)
+            cached = semantic_cache.search(query_vector)
+            if cached is not None:
+                return cached
+        except Exception:
+            # Embedding failures only disable the cache for this request
+            query_vector = None
+
+    result = await aget_financial_advice_with_rag(req.query)
     # If the RAG function returned an error object, convert to HTTP error
     if isinstance(result, dict) and result.get("error"):
         raise HTTPException(status_code=502, detail=result.get("error"))
+    if query_vector is not None:
+        semantic_cache.add(query_vector, req.query, result)
     return result
 
 # New endpoints for dashboard data
-@app.get("/dashboard/summary")
-def get_dashboard_summary(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get overall dashboard summary"""
+def _resolve_data(file_id: Optional[str], user_id: str) -> Dict[str, Any]:
+    """Return the uploaded dataset for `file_id`, or the user's DataLoader data"""
     # Use uploaded data if file_id is provided
     if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
-    profile = data.get("profile", {})
+        return uploaded_data_store[file_id]
+    loader = DataLoader(user_id)
+    return loader.data or {}
+
+def _summary_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     monthly = data.get("monthly_history", [])
-    current_month = monthly[-1] if monthly else {}
-    
-    # Calculate totals
-    total_investment = sum(inv.get("amount", 0) for inv in data.get("investments", []))
-    total_expenses = sum(exp.get("amount", 0) for exp in data.get("expenses", []))
-    
     return {
-        "profile": profile,
-        "current_month": current_month,
-        "total_investment": total_investment,
-        "total_expenses": total_expenses
+        "profile": data.get("profile", {}),
+        "current_month": monthly[-1] if monthly else {},
+        "total_investment": agg["total_investment"],
+        "total_expenses": agg["total_expenses"]
     }
 
-@app.get("/dashboard/expenses")
-def get_expenses(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get expense breakdown"""
-    # Use uploaded data if file_id is provided
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
-    expenses = data.get("expenses", [])
-    
-    # Create summary by category
-    summary = {}
-    for expense in expenses:
-        category = expense.get("category", "Other")
-        amount = expense.get("amount", 0)
-        summary[category] = summary.get(category, 0) + amount
-    
+def _expenses_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "expenses": expenses,
-        "summary": summary
+        "expenses": data.get("expenses", []),
+        "summary": agg["category_totals"]
     }
 
-@app.get("/dashboard/investments")
-def get_investments(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get investment recommendation requests"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
+def _investments_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "investments": data.get("investments", [])
     }
 
-@app.get("/dashboard/goals")
-def get_goals(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get financial goals"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
+def _goals_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "goals": data.get("goals", [])
     }
 
-@app.get("/dashboard/budgets")
-def get_budgets(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get budget vs actuals"""
-
-    # 1️⃣ Try uploaded file
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-
-    # 2️⃣ Try DataLoader
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data or {}
-
-    # 3️⃣ If budgets exist, return
+def _budgets_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
+    # 1️⃣ If budgets exist, return
     if data.get("budgets"):
         return {"budgets": data["budgets"]}
 
-    # 4️⃣ If expenses exist, derive budgets
-    expenses = data.get("expenses", [])
-    if expenses:
-        category_totals = {}
-        for exp in expenses:
-            cat = exp.get("category", "Others")
-            amt = float(exp.get("amount", 0))
-            category_totals[cat] = category_totals.get(cat, 0) + amt
-
+    # 2️⃣ If expenses exist, derive budgets
+    if data.get("expenses"):
         return {
             "budgets": [
                 {
@@ -214,11 +326,11 @@ def get_budgets(file_id: Optional[str] = None, user_id: str = "default"):
                     "spent": round(spent),
                     "icon": "💰"
                 }
-                for cat, spent in category_totals.items()
+                for cat, spent in agg["category_totals"].items()
             ]
         }
 
-    # 5️⃣ 🚨 ABSOLUTE FALLBACK (UI MUST NEVER BE EMPTY)
+    # 3️⃣ 🚨 ABSOLUTE FALLBACK (UI MUST NEVER BE EMPTY)
     return {
         "budgets": [
             {"name": "Food", "budget": 12000, "spent": 14500, "icon": "🍔"},
@@ -227,58 +339,23 @@ def get_budgets(file_id: Optional[str] = None, user_id: str = "default"):
         ]
     }
 
-
-
-@app.get("/dashboard/subscriptions")
-def get_subscriptions(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get subscriptions"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
+def _subscriptions_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "subscriptions": data.get("subscriptions", [])
     }
 
-@app.get("/dashboard/history")
-def get_monthly_history(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get monthly financial history"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
+def _history_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "history": data.get("monthly_history", [])
     }
 
-@app.get("/dashboard/analytics")
-def get_analytics(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get AI-generated analytics"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
-    # Calculate expense summary
-    expenses = {}
-    for expense in data.get("expenses", []):
-        category = expense.get("category", "Other")
-        amount = expense.get("amount", 0)
-        expenses[category] = expenses.get(category, 0) + amount
-    
+async def _analytics_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
     profile = data.get("profile", {})
-    total_expenses = sum(exp.get("amount", 0) for exp in data.get("expenses", []))
-    total_investments = sum(inv.get("amount", 0) for inv in data.get("investments", []))
     
     # Create a query for the AI agent
-    query = f"Analyze my finances: Income: {profile.get('monthly_income', 0)}, Expenses: {total_expenses}, Investments: {total_investments}"
+    query = f"Analyze my finances: Income: {profile.get('monthly_income', 0)}, Expenses: {agg['total_expenses']}, Investments: {agg['total_investment']}"
     
-    analytics = get_financial_advice_with_rag(query)
+    analytics = await aget_financial_advice_with_rag(query)
     if isinstance(analytics, dict) and analytics.get("error"):
         # Return structured error to frontend instead of 500
         raise HTTPException(status_code=502, detail=analytics.get("error"))
@@ -286,41 +363,156 @@ def get_analytics(file_id: Optional[str] = None, user_id: str = "default"):
     return {
         "analytics": analytics,
         "summary": {
-            "expenses": expenses,
+            "expenses": agg["category_totals"],
             "monthly_data": data.get("monthly_history", [])
         }
     }
 
-@app.get("/dashboard/insights")
-def get_insights(file_id: Optional[str] = None, user_id: str = "default"):
-    """Get AI generated insights"""
-    if file_id and file_id in uploaded_data_store:
-        data = uploaded_data_store[file_id]
-    else:
-        loader = DataLoader(user_id)
-        data = loader.data
-    
-    # Calculate Monthly Summary Stats for the top cards
-    profile = data.get("profile", {})
-    monthly_income = profile.get("monthly_income", 0)
-    
-    current_month_history = data.get("monthly_history", [])[-1] if data.get("monthly_history") else {}
-    total_expenses = current_month_history.get("expense", 0) if current_month_history else 0
-    # Or sum from expense list if we want exact current month
-    # Let's use the detailed list for accuracy if available, else history
-    # The loader puts detailed expenses in `expenses`
-    detailed_expenses_sum = sum(e["amount"] for e in data.get("expenses", []))
-    
-    # Savings
-    savings = monthly_income - detailed_expenses_sum
-    savings_rate = (savings / monthly_income * 100) if monthly_income > 0 else 0
-    
+def _insights_panel(data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
+    # Monthly Summary Stats for the top cards; expenses are the sum of the detailed `expenses` list
     return {
         "insights": data.get("insights", []),
         "summary": {
-            "income": monthly_income,
-            "expenses": detailed_expenses_sum,
-            "savings": savings,
-            "savingsRate": round(savings_rate, 1)
+            "income": agg["monthly_income"],
+            "expenses": agg["total_expenses"],
+            "savings": agg["savings"],
+            "savingsRate": round(agg["savings_rate"], 1)
         }
     }
+
+DASHBOARD_PANELS = {
+    "summary": _summary_panel,
+    "expenses": _expenses_panel,
+    "investments": _investments_panel,
+    "goals": _goals_panel,
+    "budgets": _budgets_panel,
+    "subscriptions": _subscriptions_panel,
+    "history": _history_panel,
+    "analytics": _analytics_panel,
+    "insights": _insights_panel,
+}
+
+# Panels fetched by the dashboard on mount. Analytics calls the LLM, so the
+# dashboard requests it separately rather than waiting on it here.
+DEFAULT_BUNDLE_PANELS = "summary,expenses,investments,goals,history"
+
+async def _build_panel(panel: str, data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
+    # Panels backed by the LLM are coroutines; the rest are plain functions
+    result = DASHBOARD_PANELS[panel](data, agg)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+async def _panel_response(panel: str, file_id: Optional[str], user_id: str) -> Dict[str, Any]:
+    # Dataset resolution may touch disk, keep it off the event loop
+    data = await run_in_threadpool(_resolve_data, file_id, user_id)
+    return await _build_panel(panel, data, get_aggregates(data))
+
+async def _bundle_panel(panel: str, data: Dict[str, Any], agg: Dict[str, Any]) -> Dict[str, Any]:
+    # Like _build_panel, but LLM-backed panels are capped at DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS
+    result = DASHBOARD_PANELS[panel](data, agg)
+    if inspect.isawaitable(result):
+        result = await asyncio.wait_for(result, DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS)
+    return result
+
+@app.get("/dashboard/bundle")
+async def get_dashboard_bundle(panels: str = DEFAULT_BUNDLE_PANELS, file_id: Optional[str] = None, user_id: str = "default"):
+    """
+    Get the comma-separated `panels` in one response, each shaped like its /dashboard/<panel> endpoint.
+    Panels that fail or time out are reported under `errors` instead of failing the whole bundle.
+    """
+    requested = [p.strip() for p in panels.split(",") if p.strip()]
+    unknown = [p for p in requested if p not in DASHBOARD_PANELS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown panels: {', '.join(unknown)}")
+
+    data = await run_in_threadpool(_resolve_data, file_id, user_id)
+    agg = get_aggregates(data)
+
+    bundle = {}
+    errors = {}
+    results = await asyncio.gather(*(_bundle_panel(p, data, agg) for p in requested), return_exceptions=True)
+    for panel, result in zip(requested, results):
+        if isinstance(result, asyncio.TimeoutError):
+            errors[panel] = f"Timed out after {DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS:g}s"
+        elif isinstance(result, HTTPException):
+            errors[panel] = result.detail
+        elif isinstance(result, Exception):
+            errors[panel] = f"Error building panel: {str(result)}"
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            bundle[panel] = result
+    # Keep the requested order
+    bundle = {panel: bundle[panel] for panel in requested if panel in bundle}
+    bundle["errors"] = errors
+    return bundle
+
+@app.get("/dashboard/summary")
+async def get_dashboard_summary(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get overall dashboard summary"""
+    return await _panel_response("summary", file_id, user_id)
+
+@app.get("/dashboard/expenses")
+async def get_expenses(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get expense breakdown"""
+    return await _panel_response("expenses", file_id, user_id)
+
+@app.get("/dashboard/investments")
+async def get_investments(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get investment recommendation requests"""
+    return await _panel_response("investments", file_id, user_id)
+
+@app.get("/dashboard/goals")
+async def get_goals(
+    file_id: Optional[str] = None,
+    user_id: str = "default",
+    simulate: bool = False,
+    paths: int = Query(MONTE_CARLO_PATHS, ge=1, le=MONTE_CARLO_MAX_PATHS),
+    seed: int = Query(MONTE_CARLO_SEED, ge=0)
+):
+    """
+    Get financial goals.
+    With `simulate=true` each goal gets a Monte Carlo `simulation` of its success probability.
+    """
+    if not simulate:
+        return await _panel_response("goals", file_id, user_id)
+
+    data = await run_in_threadpool(_resolve_data, file_id, user_id)
+    goals = data.get("goals", [])
+    monthly = data.get("monthly_history", [])
+    contribution = float(monthly[-1].get("investment", 0)) if monthly else 0.0
+    try:
+        results = await run_in_threadpool(
+            simulate_goals, goals, data.get("investments", []), contribution, paths, seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "goals": [dict(goal, simulation=result) for goal, result in zip(goals, results)]
+    }
+
+@app.get("/dashboard/budgets")
+async def get_budgets(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get budget vs actuals"""
+    return await _panel_response("budgets", file_id, user_id)
+
+@app.get("/dashboard/subscriptions")
+async def get_subscriptions(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get subscriptions"""
+    return await _panel_response("subscriptions", file_id, user_id)
+
+@app.get("/dashboard/history")
+async def get_monthly_history(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get monthly financial history"""
+    return await _panel_response("history", file_id, user_id)
+
+@app.get("/dashboard/analytics")
+async def get_analytics(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get AI-generated analytics"""
+    return await _panel_response("analytics", file_id, user_id)
+
+@app.get("/dashboard/insights")
+async def get_insights(file_id: Optional[str] = None, user_id: str = "default"):
+    """Get AI generated insights"""
+    return await _panel_response("insights", file_id, user_id)
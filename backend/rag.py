@@ -1,34 +1,78 @@
 import os
-from gemini_client import get_gemini_client
-from config import TEXT_MODEL
+from typing import Any, Dict, List
+from llm_gateway import generate_text, agenerate_text
+from embedding import get_embedding, aget_embedding
+from vector_store import get_vector_store
+from config import RAG_TOP_K, RAG_NPROBE
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_financial_advice_with_rag(question: str):
-    """
-    Generate financial advice. 
-    Note: Dynamic RAG (ChromaDB) removed to meet Vercel size limits.
-    """
-    
-    prompt = f"""
-You are a financial advisor. Provide expert guidance on the user's question.
+def retrieve_context(question: str, k: int = RAG_TOP_K) -> List[Dict[str, Any]]:
+    """Top-k passages from the local vector index; empty when no index is built"""
+    store = get_vector_store()
+    if store is None:
+        return []
+    try:
+        return store.search(get_embedding(question), k=k, nprobe=RAG_NPROBE)
+    except Exception:
+        logger.exception("Retrieval failed, answering without context")
+        return []
 
+async def aretrieve_context(question: str, k: int = RAG_TOP_K) -> List[Dict[str, Any]]:
+    """Async variant of `retrieve_context`"""
+    store = get_vector_store()
+    if store is None:
+        return []
+    try:
+        return store.search(await aget_embedding(question), k=k, nprobe=RAG_NPROBE)
+    except Exception:
+        logger.exception("Retrieval failed, answering without context")
+        return []
+
+def _build_prompt(question: str, passages: List[Dict[str, Any]]) -> str:
+    context = ""
+    if passages:
+        context = "\nReference material (use it where relevant):\n" + "\n\n".join(
+            f"[{i}] ({p.get('source', 'unknown')})\n{p['text']}" for i, p in enumerate(passages, 1)
+        ) + "\n"
+    return f"""
+You are a financial advisor. Provide expert guidance on the user's question.
+{context}
 Question:
 {question}
 
 Answer clearly in markdown.
 """
 
-    client = get_gemini_client()
+def _sources(passages: List[Dict[str, Any]]) -> List[str]:
+    sources = list(dict.fromkeys(p.get("source", "unknown") for p in passages))
+    return sources or ["AI General Knowledge"]
+
+def get_financial_advice_with_rag(question: str):
+    """
+    Generate financial advice, grounded in passages from the local vector index
+    when one has been built (see vector_store.py).
+    """
+    passages = retrieve_context(question)
+    try:
+        text = generate_text(_build_prompt(question, passages))
+        return {
+            "response": text,
+            "sources": _sources(passages)
+        }
+    except Exception as e:
+        logger.exception("Advice generation failed")
+        return {"error": "AI generation failed: %s" % str(e)}
+
+async def aget_financial_advice_with_rag(question: str):
+    """Async variant of `get_financial_advice_with_rag`"""
+    passages = await aretrieve_context(question)
     try:
-        response = client.models.generate_content(
-            model=TEXT_MODEL,
-            contents=prompt
-        )
+        text = await agenerate_text(_build_prompt(question, passages))
         return {
-            "response": response.text,
-            "sources": ["AI General Knowledge"]
+            "response": text,
+            "sources": _sources(passages)
         }
     except Exception as e:
         logger.exception("Advice generation failed")
@@ -0,0 +1,74 @@
+"""Compact `__slots__` records for the large lists of a parsed dataset, read like immutable dicts"""
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+
+class Record(Mapping):
+    """Fixed-field record that reads like an immutable dict"""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields}
+
+
+class Transaction(Record):
+    """An expense: {"date", "category", "amount"}"""
+
+    __slots__ = _fields = ("date", "category", "amount")
+
+    def __init__(self, date: str, category: str, amount: float):
+        self.date = date
+        self.category = category
+        self.amount = amount
+
+
+class Investment(Record):
+    """{"type", "amount", "annual_return"}"""
+
+    __slots__ = _fields = ("type", "amount", "annual_return")
+
+    def __init__(self, type: str, amount: float, annual_return: float):
+        self.type = type
+        self.amount = amount
+        self.annual_return = annual_return
+
+
+class Goal(Record):
+    """{"name", "target", "current", "deadline"}"""
+
+    __slots__ = _fields = ("name", "target", "current", "deadline")
+
+    def __init__(self, name: str, target: float, current: float, deadline: str):
+        self.name = name
+        self.target = target
+        self.current = current
+        self.deadline = deadline
+
+
+def intern_label(value: Any) -> str:
+    """str() a low-cardinality label (date, category, type) and intern it so rows share one copy"""
+    return sys.intern(str(value))
+
+
+def json_default(obj: Any) -> Any:
+    """`default=` hook for json.dump(s) so records serialize as plain objects"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,102 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from config import SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_CAPACITY
+
+
+def _default_embedder(text: str) -> Sequence[float]:
+    # Imported lazily so the cache can be used with a local embedder without the Gemini SDK
+    from embedding import get_embedding
+    return get_embedding(text)
+
+
+class SemanticCache:
+    """Answer cache that matches queries by cosine similarity of their embeddings, overwriting the LRU entry when full"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Sequence[float]] = _default_embedder,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        capacity: int = SEMANTIC_CACHE_CAPACITY,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.capacity = capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._queries: List[Optional[str]] = [None] * capacity
+        self._answers: List[Any] = [None] * capacity
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed `text` and L2-normalize it so dot products are cosine similarities"""
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def search(self, vector: np.ndarray) -> Optional[Any]:
+        """Return the answer stored for the closest query, or None below the threshold"""
+        with self._lock:
+            if self._size == 0 or self._vectors is None or vector.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+            scores = self._vectors[:self._size] @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            self.hits += 1
+            return self._answers[best]
+
+    def add(self, vector: np.ndarray, query: str, answer: Any):
+        """Store `answer` for the query embedded as `vector`"""
+        with self._lock:
+            if self._vectors is None or vector.shape[0] != self._vectors.shape[1]:
+                # First entry (or embedding model changed): size the matrix for this dimension
+                self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+                self._size = 0
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._queries[slot] = query
+            self._answers[slot] = answer
+            self._last_used[slot] = self._clock
+
+    def lookup(self, query: str) -> Optional[Any]:
+        """Embed `query` and return a cached answer if a similar query was seen"""
+        return self.search(self.embed(query))
+
+    def clear(self):
+        with self._lock:
+            self._vectors = None
+            self._size = 0
+            self._queries = [None] * self.capacity
+            self._answers = [None] * self.capacity
+            self._last_used[:] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared cache for /ask answers
+semantic_cache = SemanticCache()
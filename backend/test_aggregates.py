@@ -0,0 +1,47 @@
+import pytest
+from aggregates import AGGREGATES_KEY, compute_aggregates, get_aggregates, merge_aggregates
+
+DATA = {
+    "profile": {"monthly_income": 1000},
+    "expenses": [
+        {"category": "Food", "amount": 100},
+        {"category": "Rent", "amount": 500},
+        {"category": "Food", "amount": 50},
+        {"amount": 25},
+    ],
+    "investments": [{"amount": 200}, {"amount": 300}],
+}
+
+
+def test_compute_aggregates():
+    agg = compute_aggregates(DATA)
+    assert agg["category_totals"] == {"Food": 150, "Rent": 500, "Other": 25}
+    assert agg["total_expenses"] == 675
+    assert agg["total_investment"] == 500
+    assert agg["savings"] == 325
+    assert agg["savings_rate"] == pytest.approx(32.5)
+    assert (agg["expenses_count"], agg["investments_count"]) == (4, 2)
+
+
+def test_zero_income_and_empty_dataset():
+    agg = compute_aggregates({})
+    assert agg["total_expenses"] == 0 and agg["category_totals"] == {}
+    assert agg["savings_rate"] == 0
+
+
+def test_merge_matches_whole_dataset():
+    halves = [
+        {"expenses": DATA["expenses"][:2], "investments": DATA["investments"][:1]},
+        {"expenses": DATA["expenses"][2:], "investments": DATA["investments"][1:]},
+    ]
+    merged = merge_aggregates((compute_aggregates(part) for part in halves), monthly_income=1000)
+    assert merged == compute_aggregates(DATA)
+
+
+def test_get_aggregates_computes_once():
+    data = {key: list(value) if isinstance(value, list) else value for key, value in DATA.items()}
+    agg = get_aggregates(data)
+    assert data[AGGREGATES_KEY] is agg
+    # Stored aggregates are returned as-is until recomputed
+    data["expenses"].append({"category": "Food", "amount": 1})
+    assert get_aggregates(data) is agg
@@ -0,0 +1,129 @@
+import json
+import mmap
+import pickle
+import struct
+import pytest
+import binary_store
+from binary_store import MAGIC, LazyDataset, read_dataset, write_dataset
+from data_loader import DataLoader, estimate_size, snapshot_cache
+from file_parser import FileParser
+from records import Transaction, Investment, Goal, json_default
+
+EXPENSES_CSV = "date,category,amount\n" + "".join(
+    f"2025-{m:02d}-{d:02d},{cat},{(m * d * 37) % 900 + 0.25}\n"
+    for m in range(1, 13) for d in range(1, 4) for cat in ("Rent", "Food", "Travel")
+)
+INVESTMENTS_CSV = "type,amount,annual_return\n" + "".join(
+    f"{t},{i * 1000},{6 + i % 5}\n" for i in range(1, 21) for t in ("Stocks", "Gold")
+)
+
+
+def as_json(data):
+    return json.loads(json.dumps(data, default=json_default))
+
+
+@pytest.fixture
+def dataset():
+    data = FileParser.parse_file(EXPENSES_CSV.encode(), "expenses.csv")
+    investments = FileParser.parse_file(INVESTMENTS_CSV.encode(), "investments.csv")
+    data["investments"] = investments["investments"]
+    data["goals"] = [Goal(f"Goal {i}", 1000.0 * i, 10.0 * i, "2026-12-31") for i in range(20)]
+    data["monthly_history"] = [{"month": f"M{i}", "income": 100 + i, "expenses": 50.5 + i} for i in range(24)]
+    data["subscriptions"] = [{"id": i, "name": "Netflix", "cost": 649.0, "isActive": True, "recommendation": None} for i in range(20)]
+    return data
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip_matches_json(tmp_path, dataset, compress):
+    path = tmp_path / "upload.fgb"
+    write_dataset(dataset, str(path), compress=compress)
+
+    loaded = read_dataset(str(path))
+    assert as_json(loaded) == as_json(dataset)
+    assert as_json(read_dataset(str(path), lazy=False)) == as_json(dataset)
+
+
+def test_records_are_restored(tmp_path, dataset):
+    path = tmp_path / "upload.fgb"
+    write_dataset(dataset, str(path))
+    loaded = read_dataset(str(path))
+
+    assert all(type(e) is Transaction for e in loaded["expenses"])
+    assert all(type(i) is Investment for i in loaded["investments"])
+    assert all(type(g) is Goal for g in loaded["goals"])
+    assert type(loaded["monthly_history"][0]) is dict
+
+
+def test_lists_decode_on_first_access(tmp_path, dataset):
+    path = tmp_path / "upload.fgb"
+    write_dataset(dataset, str(path))
+    loaded = read_dataset(str(path))
+
+    assert isinstance(loaded, LazyDataset)
+    assert "expenses" in loaded.pending_keys()
+    assert loaded["profile"] == as_json(dataset)["profile"]
+    assert "expenses" in loaded.pending_keys()
+    assert len(loaded["expenses"]) == len(dataset["expenses"])
+    assert "expenses" not in loaded.pending_keys()
+    # Copies and pickles see decoded lists, never placeholders
+    assert as_json(dict(loaded)) == as_json(dataset)
+    assert as_json(pickle.loads(pickle.dumps(read_dataset(str(path))))) == as_json(dataset)
+
+
+def test_lazy_size_counts_encoded_bytes(tmp_path, dataset):
+    path = tmp_path / "upload.fgb"
+    write_dataset(dataset, str(path))
+    loaded = read_dataset(str(path))
+
+    estimate_size(loaded)
+    assert loaded.pending_keys()
+
+
+def test_irregular_lists_stay_in_header(tmp_path):
+    data = {
+        "expenses": [{"date": "2025-01-01", "category": "Rent", "amount": 1.0}] * 10
+        + [{"date": "2025-01-02", "category": "Food", "amount": None}] * 10,
+        "insights": [{"title": "a"}, {"title": "b", "value": 3}] * 10,
+    }
+    path = tmp_path / "irregular.fgb"
+    write_dataset(data, str(path))
+    loaded = read_dataset(str(path))
+
+    assert loaded.pending_keys() == []
+    assert as_json(loaded) == data
+
+
+@pytest.mark.parametrize("content", [
+    b'{"expenses": []}',
+    MAGIC + struct.pack("<I", 16) + b'{"version": 99} ',
+])
+def test_rejects_other_files(tmp_path, monkeypatch, content):
+    path = tmp_path / "upload.fgb"
+    path.write_bytes(content)
+    opened = []
+    real_mmap = mmap.mmap
+
+    def tracked_mmap(*args, **kwargs):
+        opened.append(real_mmap(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(binary_store.mmap, "mmap", tracked_mmap)
+    with pytest.raises(ValueError):
+        read_dataset(str(path))
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_data_loader_prefers_binary_file(tmp_path, monkeypatch, dataset):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("VERCEL", raising=False)
+    snapshot_cache.clear()
+    (tmp_path / "user_data").mkdir()
+    (tmp_path / "user_data" / "u1.json").write_text(json.dumps({"expenses": []}))
+    write_dataset(dataset, str(tmp_path / "user_data" / "u1.fgb"))
+
+    loader = DataLoader("u1")
+    assert len(loader.data["expenses"]) == len(dataset["expenses"])
+    assert loader.calculate_total_expenses() == pytest.approx(sum(e["amount"] for e in dataset["expenses"]))
+
+    loader.save_user_data(dict(loader.data, user_id="u1"))
+    assert DataLoader("u1").data["user_id"] == "u1"
+    snapshot_cache.clear()
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from calculator import (
+    SWEEP_FUNCTIONS, amortization_schedule, debt_payoff, debt_payoff_batch,
+    investment_growth, mortgage_payment, sweep_axis, sweep_axis_length,
+)
+
+
+def simulate_payoff(principal, annual_interest_rate, monthly_payment, max_months=10_000):
+    """Month-by-month reference: (months, total interest), or None if never repaid"""
+    r = annual_interest_rate / 12 / 100
+    balance, interest_paid = principal, 0.0
+    if balance <= 0:
+        return 0, 0.0
+    for month in range(1, max_months + 1):
+        interest = balance * r
+        interest_paid += interest
+        balance = balance + interest - min(monthly_payment, balance + interest)
+        if balance <= 1e-9:
+            return month, interest_paid
+    return None
+
+
+@pytest.mark.parametrize("principal, rate, payment", [
+    (100_000, 12, 5_000),
+    (250_000, 36, 10_000),
+    (5_000, 18, 150),
+    (50_000, 0, 1_000),     # 0%: exact division, no partial month
+    (50_001, 0, 1_000),     # 0%: one cent-sized final payment
+    (1_000, 24, 1_000),     # settled in two payments
+    (0, 10, 500),           # nothing owed
+])
+def test_debt_payoff_matches_simulation(principal, rate, payment):
+    months, interest = simulate_payoff(principal, rate, payment)
+    result = debt_payoff(principal, rate, payment)
+    assert result["months_to_payoff"] == months
+    assert result["total_interest"] == pytest.approx(interest, abs=1e-6)
+
+
+@pytest.mark.parametrize("payment", [1_000, 500])
+def test_payment_not_covering_interest(payment):
+    # 12% on 100k accrues 1000 a month; paying that or less never reduces the balance
+    assert simulate_payoff(100_000, 12, payment) is None
+    result = debt_payoff(100_000, 12, payment)
+    assert result["months_to_payoff"] is None and "error" in result
+
+
+def test_batch_matches_scalar_and_schedule():
+    principal = np.array([100_000, 5_000, 50_000, 100_000])
+    rate = np.array([12, 18, 0, 12])
+    payment = np.array([5_000, 150, 1_000, 900])
+    batch = debt_payoff_batch(principal, rate, payment)
+    schedule = amortization_schedule(principal, rate, payment, max_months=120)
+    for i in range(len(principal)):
+        scalar = debt_payoff(principal[i], rate[i], payment[i])
+        assert bool(batch["feasible"][i]) == (scalar["months_to_payoff"] is not None)
+        if scalar["months_to_payoff"] is None:
+            assert np.isnan(batch["months_to_payoff"][i])
+            continue
+        assert batch["months_to_payoff"][i] == scalar["months_to_payoff"]
+        assert schedule["interest"][i].sum() == pytest.approx(scalar["total_interest"])
+        assert np.count_nonzero(schedule["payment"][i]) == scalar["months_to_payoff"]
+
+
+def test_mortgage_grid_matches_scalar():
+    grid_fn, names = SWEEP_FUNCTIONS["mortgage_payment"]
+    axes = [sweep_axis([1_000_000, 2_500_000]), sweep_axis({"start": 0, "stop": 12, "step": 4}), sweep_axis([5, 20])]
+    grid = grid_fn(*axes)
+    assert names == ["loan_amount", "annual_interest_rate", "years"]
+    assert grid["monthly_payment"].shape == (2, 4, 2)
+    for i, loan in enumerate(axes[0]):
+        for j, rate in enumerate(axes[1]):
+            for k, years in enumerate(axes[2]):
+                scalar = mortgage_payment(loan, rate, int(years))
+                for key in ("monthly_payment", "total_cost", "total_interest"):
+                    assert grid[key][i, j, k] == pytest.approx(scalar[key])
+
+
+def test_investment_grid_matches_scalar():
+    grid_fn, _ = SWEEP_FUNCTIONS["investment_growth"]
+    axes = [sweep_axis(10_000), sweep_axis({"start": 4, "stop": 12, "num": 5}), sweep_axis({"start": 1, "stop": 30, "step": 7})]
+    grid = grid_fn(*axes)
+    assert grid["future_value"].shape == (1, 5, 5)
+    for j, rate in enumerate(axes[1]):
+        for k, years in enumerate(axes[2]):
+            assert grid["future_value"][0, j, k] == pytest.approx(investment_growth(10_000, rate, years)["future_value"])
+
+
+def test_sweep_axis_limits():
+    assert sweep_axis({"start": 0, "stop": 1, "step": 0.25}).tolist() == [0, 0.25, 0.5, 0.75, 1]
+    with pytest.raises(ValueError):
+        sweep_axis({"start": 0, "stop": 1e9, "step": 1}, max_points=1000)
+
+
+@pytest.mark.parametrize("spec", [
+    5, [1, 2, 3], {"start": 0, "stop": 10, "step": 2.5}, {"start": 1, "stop": 2, "num": 7},
+    {"start": 5, "stop": 1, "step": 1}, {"start": 0, "stop": 0.3, "step": 0.1},
+])
+def test_sweep_axis_length_matches_axis(spec):
+    assert sweep_axis_length(spec) == len(sweep_axis(spec))
+
+
+@pytest.mark.parametrize("spec", [
+    {"start": 0, "stop": 1, "step": 0}, {"start": 0, "stop": float("inf")}, {"start": 0, "stop": 1, "num": -1},
+])
+def test_sweep_axis_length_rejects_bad_ranges(spec):
+    with pytest.raises(ValueError):
+        sweep_axis_length(spec)
@@ -0,0 +1,80 @@
+import pytest
+from calculator_intent import extract_quantities, parse_calculator_query
+from financial_calculator_agent import financial_calculator
+
+
+@pytest.mark.parametrize("query, function_name, parameters", [
+    ("mortgage of 50 lakh at 8.5% for 20 years", "mortgage_payment",
+     {"loan_amount": 5_000_000, "annual_interest_rate": 8.5, "years": 20}),
+    ("home loan of 1.2 crore at 9 percent for 240 months", "mortgage_payment",
+     {"loan_amount": 12_000_000, "annual_interest_rate": 9, "years": 20}),
+    ("invest 1,00,000 at 12% for 10 years", "investment_growth",
+     {"principal": 100_000, "annual_return_rate": 12, "years": 10}),
+    ("how big should my emergency fund be if I spend 40k a month", "emergency_fund",
+     {"monthly_expenses": 40_000}),
+    ("50/30/20 budget on 1 lakh", "budget_allocation", {"income": 100_000}),
+    ("pay off credit card debt of 2 lakh at 36% paying 10000 per month", "debt_payoff",
+     {"principal": 200_000, "annual_interest_rate": 36, "monthly_payment": 10_000}),
+])
+def test_matched_intents(query, function_name, parameters):
+    parsed = parse_calculator_query(query)
+    assert parsed["function_name"] == function_name
+    assert parsed["parameters"] == pytest.approx(parameters)
+    assert parsed["confidence"] == 1.0
+
+
+def test_units():
+    quantities = extract_quantities("₹2.5 cr, $300k, 7.5 per cent, 15 yrs, 18 months, 12000 per month")
+    assert [(q["kind"], q["value"]) for q in quantities] == [
+        ("amount", 25_000_000),
+        ("amount", 300_000),
+        ("percent", 7.5),
+        ("years", 15),
+        ("years", 1.5),
+        ("monthly_amount", 12_000),
+    ]
+
+
+def test_scientific_notation_is_one_number():
+    assert [q["value"] for q in extract_quantities("1e5, 2.5E-1 and .5e2 lakh")] == [100_000, 0.25, 5_000_000]
+    parsed = parse_calculator_query("invest 1e5 at 12% for 10 years")
+    assert parsed["parameters"] == {"principal": 100_000, "annual_return_rate": 12, "years": 10}
+
+
+def test_zero_amounts_are_kept():
+    parsed = parse_calculator_query("pay off credit card debt of 2 lakh at 36% paying 0 per month")
+    assert parsed["parameters"]["monthly_payment"] == 0
+    assert parsed["confidence"] == 1.0
+    assert parse_calculator_query("50/30/20 budget on 0")["parameters"] == {"income": 0}
+
+
+@pytest.mark.parametrize("query", [
+    "what is the weather today",
+    "tell me a joke",
+])
+def test_unrelated_queries_are_rejected(query):
+    assert parse_calculator_query(query) is None
+
+
+@pytest.mark.parametrize("query", [
+    # Missing rate and term
+    "loan of 5 lakh",
+    # Unknown unit suffix leaves the amount unreliable
+    "I want to invest 2L",
+    # A number the parser could not place
+    "invest 5000 at 12% for 10 years and 3 months extra 7",
+])
+def test_incomplete_queries_are_not_confident(query):
+    assert parse_calculator_query(query)["confidence"] < 1.0
+
+
+def test_zero_rate_mortgage_is_straight_line():
+    result = financial_calculator("home loan 50 lakh at 0% for 20 years")
+    assert result["result"]["monthly_payment"] == pytest.approx(5_000_000 / 240)
+    assert result["result"]["total_interest"] == pytest.approx(0)
+
+
+def test_invalid_local_parameters_return_structured_error():
+    result = financial_calculator("home loan 50 lakh at 8% for 0 years")
+    assert result["function_name"] == "mortgage_payment"
+    assert "error" in result and "exception" in result
@@ -0,0 +1,99 @@
+import json
+import os
+import pytest
+from data_loader import SnapshotCache, _read_tail_lines, read_engineered_window
+
+
+@pytest.fixture
+def engineered_csv(tmp_path):
+    path = tmp_path / "engineered.csv"
+    rows = "".join(f"{i},{i * 10}\n" + ("\n" if i % 7 == 0 else "") for i in range(2000))
+    path.write_bytes(b"Month,Total\r\n" + rows.encode())
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7, 16, 64, 1000, 64 * 1024])
+@pytest.mark.parametrize("count", [1, 3, 10, 1999, 2000, 5000])
+def test_tail_lines_independent_of_block_size(engineered_csv, block_size, count):
+    expected = [f"{i},{i * 10}" for i in range(2000)][-count:]
+    assert _read_tail_lines(engineered_csv, count, block_size) == expected
+
+
+def test_latest_window(engineered_csv):
+    rows = read_engineered_window(engineered_csv, 3, latest=True)
+    assert rows == [{"month": str(i), "total": str(i * 10)} for i in (1999, 1998, 1997)]
+    assert read_engineered_window(engineered_csv, 2) == [{"month": "0", "total": "0"}, {"month": "1", "total": "10"}]
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_snapshot_follows_file_changes(tmp_path):
+    path = str(tmp_path / "user.json")
+    with open(path, "w") as f:
+        json.dump({"expenses": [1, 2]}, f)
+    cache = SnapshotCache()
+
+    first = cache.get_or_load(path, load_json)
+    assert cache.get_or_load(path, load_json) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same size, newer mtime
+    with open(path, "w") as f:
+        json.dump({"expenses": [3, 4]}, f)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert cache.get_or_load(path, load_json) == {"expenses": [3, 4]}
+
+    # Different size, mtime forced back to the previous value
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "w") as f:
+        json.dump({"expenses": [3, 4, 5]}, f)
+    os.utime(path, ns=(mtime, mtime))
+    assert cache.get_or_load(path, load_json) == {"expenses": [3, 4, 5]}
+    # Stale snapshots of the file are dropped
+    assert cache.stats()["entries"] == 1
+
+    cache.invalidate(path)
+    assert cache.stats()["entries"] == 0
+
+
+def test_snapshot_eviction(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"{i}.json"))
+        with open(paths[-1], "w") as f:
+            json.dump({"i": i}, f)
+    cache = SnapshotCache(max_entries=2)
+    for path in paths:
+        cache.get_or_load(path, load_json)
+    assert cache.stats()["entries"] == 2
+    cache.get_or_load(paths[0], load_json)
+    assert cache.misses == 4
+
+    small = SnapshotCache(max_bytes=10)
+    small.get_or_load(paths[0], load_json)
+    assert small.stats()["entries"] == 0
+
+
+def test_newest_user_file_wins(tmp_path, monkeypatch):
+    from data_loader import DataLoader, snapshot_cache
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("VERCEL", raising=False)
+    os.makedirs("user_data")
+    loader = DataLoader("someone")
+    loader.save_user_data({"profile": {"monthly_income": 1}, "expenses": []})
+    assert DataLoader("someone").data["profile"]["monthly_income"] == 1
+
+    # A hand edit of the JSON file after the save takes precedence
+    with open(loader.data_file, "w") as f:
+        json.dump({"profile": {"monthly_income": 2}, "expenses": []}, f)
+    binary_mtime = os.stat(loader.binary_file).st_mtime_ns
+    os.utime(loader.data_file, ns=(binary_mtime + 10 ** 9, binary_mtime + 10 ** 9))
+    assert DataLoader("someone").data["profile"]["monthly_income"] == 2
+
+    loader.save_user_data({"profile": {"monthly_income": 3}, "expenses": []})
+    os.utime(loader.binary_file, ns=(binary_mtime + 2 * 10 ** 9, binary_mtime + 2 * 10 ** 9))
+    assert DataLoader("someone").data["profile"]["monthly_income"] == 3
+    snapshot_cache.clear()
@@ -0,0 +1,88 @@
+import io
+import pytest
+from dataset_store import DatasetStore
+from file_parser import FileParser
+from data_loader import estimate_size
+from binary_store import LazyDataset
+from records import Transaction
+
+
+def make_dataset(n: int):
+    return {"profile": {"monthly_income": 1000}, "expenses": [Transaction("2025-01-01", "Rent", float(i)) for i in range(n)]}
+
+
+def test_ids_are_unique(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    ids = {store.add(make_dataset(20)) for _ in range(5)}
+    assert len(ids) == 5
+    assert all(i in store for i in ids)
+
+
+def test_evicted_dataset_reloads_from_disk(tmp_path):
+    size = estimate_size(make_dataset(200))
+    store = DatasetStore(str(tmp_path), max_bytes=int(size * 1.5))
+    first = store.add(make_dataset(200))
+    store.add(make_dataset(200))
+
+    assert store.stats()["evictions"] == 1
+    assert first in store
+    reloaded = store[first]
+    # Reloads stay encoded until read, and are accounted at their decoded size on the next lookup
+    assert isinstance(reloaded, LazyDataset) and reloaded.pending_keys() == ["expenses"]
+    assert store.stats()["entries"] == 2
+    assert [e["amount"] for e in reloaded["expenses"]] == [float(i) for i in range(200)]
+    assert store[first] is reloaded
+    # Decoded, the two datasets no longer fit together
+    assert store.stats()["entries"] == 1 and store.stats()["evictions"] == 2
+    assert store.stats()["reloads"] == 1
+    assert store.stats()["bytes"] <= store.max_bytes
+
+
+def test_unknown_and_unsafe_ids(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    assert "uploaded_missing" not in store
+    assert "../secrets" not in store
+    assert store.get("../secrets") is None
+
+
+EXPENSES_CSV = b"Date,Category,Amount\n2025-01-10,Food,516.59\n2025-02-11,Rent,237.01\n"
+
+
+def test_reupload_reuses_dataset(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    calls = []
+
+    def parse(fileobj, filename, digests):
+        calls.append(filename)
+        return FileParser.parse_stream(fileobj, filename, digests=digests)
+
+    first, data, hit = store.ingest(io.BytesIO(EXPENSES_CSV), "a.csv", parse)
+    assert hit is None and len(data["expenses"]) == 2
+
+    assert store.ingest(io.BytesIO(EXPENSES_CSV), "a.csv", parse)[::2] == (first, "content")
+    # Same rows with CRLF endings, reordered columns and padded cells
+    reexport = b"amount , category,date\r\n 516.59,Food,2025-01-10\r\n237.01,Rent ,2025-02-11\r\n\r\n"
+    assert store.ingest(io.BytesIO(reexport), "b.csv", parse)[::2] == (first, "rows")
+    assert store.ingest(io.BytesIO(reexport), "b.csv", parse)[::2] == (first, "content")
+
+    # Byte-identical re-uploads are not parsed; duplicates are not stored again
+    assert calls == ["a.csv", "b.csv"]
+    assert len(list(tmp_path.glob("*.fgb"))) == 1
+    stats = store.upload_stats()
+    assert (stats["uploads"], stats["misses"], stats["row_hits"], stats["content_hits"]) == (4, 1, 1, 2)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_workbook_with_same_rows_is_a_row_hit(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.append(["Category", "Date", "Amount"])
+    sheet.append(["Food", "2025-01-10", 516.59])
+    sheet.append(["Rent", "2025-02-11", 237.01])
+    workbook = io.BytesIO()
+    wb.save(workbook)
+
+    store = DatasetStore(str(tmp_path))
+    first = store.ingest(io.BytesIO(EXPENSES_CSV), "a.csv")[0]
+    assert store.ingest(io.BytesIO(workbook.getvalue()), "a.xlsx")[::2] == (first, "rows")
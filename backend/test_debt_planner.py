@@ -0,0 +1,80 @@
+import pytest
+from debt_planner import compare_strategies, iter_repayment_schedule, priority_order, normalize_loans, summarize_plan
+
+LOANS = [
+    {"name": "Card", "balance": 150_000, "annual_interest_rate": 36, "min_payment": 4_500},
+    {"name": "Personal", "balance": 40_000, "annual_interest_rate": 14, "min_payment": 1_000},
+    {"name": "Car", "balance": 300_000, "annual_interest_rate": 9, "min_payment": 6_500},
+]
+BUDGET = 20_000
+
+
+def test_priority_orders():
+    loans = normalize_loans(LOANS)
+    assert priority_order(loans, "avalanche") == [0, 1, 2]
+    assert priority_order(loans, "snowball") == [1, 0, 2]
+    assert priority_order(loans, "custom", ["Car"]) == [2, 0, 1]
+    with pytest.raises(ValueError):
+        priority_order(loans, "custom", ["Boat"])
+
+
+def test_avalanche_vs_snowball():
+    plans = compare_strategies(LOANS, BUDGET)["plans"]
+    avalanche, snowball = plans["avalanche"], plans["snowball"]
+    assert avalanche["debt_free"] and snowball["debt_free"]
+
+    # Snowball clears the small loan first, avalanche the expensive one
+    assert snowball["payoff_month"]["Personal"] < avalanche["payoff_month"]["Personal"]
+    assert avalanche["payoff_month"]["Card"] < snowball["payoff_month"]["Card"]
+    # ...which makes avalanche cheaper overall
+    assert avalanche["total_interest"] < snowball["total_interest"]
+
+    for plan in (avalanche, snowball):
+        principal = sum(loan["balance"] for loan in LOANS)
+        assert plan["total_paid"] == pytest.approx(principal + plan["total_interest"])
+        assert plan["months"] == max(plan["payoff_month"].values())
+
+
+def test_schedule_spends_the_budget():
+    rows = list(iter_repayment_schedule(LOANS, BUDGET, "avalanche"))
+    assert all(row["total_paid"] == pytest.approx(BUDGET) for row in rows[:-1])
+    assert rows[-1]["remaining_balance"] == 0
+    assert summarize_plan(LOANS, BUDGET)["months"] == len(rows)
+
+
+def test_budget_below_minimums():
+    with pytest.raises(ValueError):
+        list(iter_repayment_schedule(LOANS, 5_000))
+
+
+def test_duplicate_names_are_rejected():
+    loans = [{"name": "Card", "balance": 1_000, "annual_interest_rate": 30},
+             {"name": "Card", "balance": 5_000, "annual_interest_rate": 20}]
+    with pytest.raises(ValueError, match="Duplicate loan name"):
+        summarize_plan(loans, 2_000)
+    # Generated names count too
+    with pytest.raises(ValueError):
+        normalize_loans([{"balance": 1_000}, {"name": "Loan 1", "balance": 500}])
+
+
+def test_term_years_sets_min_payment():
+    loans = normalize_loans([
+        {"name": "Home", "balance": 1_200_000, "annual_interest_rate": 9, "term_years": "10"},
+        {"name": "Family", "balance": 120_000, "annual_interest_rate": 0, "term_years": 2.5},
+    ])
+    assert loans[0]["min_payment"] == pytest.approx(15_201.09, abs=0.01)
+    assert loans[1]["min_payment"] == pytest.approx(4_000)
+    for term in (0, -5, "nan"):
+        with pytest.raises(ValueError, match="term_years"):
+            normalize_loans([{"name": "Home", "balance": 1_000, "annual_interest_rate": 9, "term_years": term}])
+
+
+def test_zero_balance_loans_are_paid_in_month_zero():
+    loans = LOANS + [{"name": "Closed", "balance": 0, "annual_interest_rate": 10}]
+    plan = summarize_plan(loans, BUDGET)
+    assert plan["payoff_month"]["Closed"] == 0
+    assert plan["payoff_month"]["Card"] > 0
+    assert summarize_plan([loans[-1]], BUDGET) == {
+        "strategy": "avalanche", "months": 0, "debt_free": True,
+        "total_interest": 0.0, "total_paid": 0.0, "payoff_month": {"Closed": 0},
+    }
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import pytest
+import embedding
+from embedding import EmbeddingCache, get_embeddings, text_hash
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    """Fresh on-disk cache and a fake embedding API that records its batches"""
+    monkeypatch.setattr(embedding, "embedding_cache", EmbeddingCache(str(tmp_path / "embeddings.sqlite3")))
+    batches = []
+
+    def embed_texts(texts, model):
+        batches.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    async def aembed_text(text):
+        batches.append([text])
+        return [float(len(text)), 1.0]
+
+    monkeypatch.setattr(embedding, "embed_texts", embed_texts)
+    monkeypatch.setattr(embedding, "aembed_text", aembed_text)
+    return batches
+
+
+def test_cache_hits_by_text_hash(calls):
+    assert get_embeddings(["a", "bb", "a"], batch_size=10) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert calls == [["a", "bb"]]
+
+    assert get_embeddings(["bb", "ccc"]) == [[2.0, 1.0], [3.0, 1.0]]
+    assert calls[-1] == ["ccc"]
+
+    cached = embedding.embedding_cache.get_many(embedding.EMBEDDING_MODEL, [text_hash("bb"), text_hash("zz")])
+    assert cached == {text_hash("bb"): [2.0, 1.0]}
+    # Keys are per model
+    assert embedding.embedding_cache.get_many("other-model", [text_hash("bb")]) == {}
+
+
+def test_batches_and_concurrency(calls):
+    texts = [f"text {i}" for i in range(10)]
+    get_embeddings(texts, batch_size=3, max_concurrency=2)
+    assert sorted(len(batch) for batch in calls) == [1, 3, 3, 3]
+    assert sorted(t for batch in calls for t in batch) == sorted(texts)
+
+
+def test_async_embedding_shares_the_cache(calls):
+    get_embeddings(["hello"])
+    assert asyncio.run(embedding.aget_embedding("hello")) == [5.0, 1.0]
+    assert asyncio.run(embedding.aget_embedding("world!")) == [6.0, 1.0]
+    assert calls == [["hello"], ["world!"]]
+    assert get_embeddings(["world!"]) == [[6.0, 1.0]]
+    assert len(calls) == 2
+
+
+def test_async_cache_access_runs_off_the_event_loop(calls, monkeypatch):
+    cache = embedding.embedding_cache
+    threads = []
+
+    def record(method):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return method(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(cache, "get_many", record(cache.get_many))
+    monkeypatch.setattr(cache, "put_many", record(cache.put_many))
+    asyncio.run(embedding.aget_embedding("hello"))
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
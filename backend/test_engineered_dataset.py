@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from engineered_dataset import EngineeredDataset
+
+ROWS = [
+    {"rent": "1000", "groceries": "300", "eating_out": "100", "income": "5000", "total_expenses": "0"},
+    {"rent": "1200", "groceries": "", "eating_out": "50", "income": "5200", "total_expenses": "1500"},
+    {"rent": "800", "groceries": "200", "eating_out": "abc", "income": "4800", "total_expenses": "1000"},
+]
+
+
+@pytest.fixture
+def dataset():
+    return EngineeredDataset.from_rows(ROWS)
+
+
+def test_columns_and_missing_columns(dataset):
+    assert len(dataset) == 3
+    assert dataset.expense_columns == ["rent", "groceries", "eating_out"]
+    assert dataset.income.tolist() == [5000, 5200, 4800]
+    # Blank and unparseable cells become 0; absent columns read as zeros
+    assert dataset.column("groceries").tolist() == [300, 0, 200]
+    assert dataset.column("eating_out").tolist() == [100, 50, 0]
+    assert "savings" not in dataset and dataset.savings.tolist() == [0, 0, 0]
+
+
+def test_totals_and_means(dataset):
+    # A zero total_expenses falls back to the category sum
+    assert dataset.total_expenses().tolist() == [1400, 1500, 1000]
+    assert dataset.category_means() == pytest.approx({"rent": 1000, "groceries": 500 / 3, "eating_out": 50})
+    assert dataset.expense_matrix().shape == (3, 3)
+
+
+def test_budget_vs_actual_groups_display_names(dataset):
+    result = dataset.budget_vs_actual({"rent": "Housing", "groceries": "Food", "eating_out": "Food", "utilities": "Bills"}, row=1)
+    assert result == {
+        "Housing": {"budget": pytest.approx(1000), "spent": 1200},
+        "Food": {"budget": pytest.approx(500 / 3 + 50), "spent": 50},
+    }
+
+
+def test_empty_dataset():
+    empty = EngineeredDataset.from_rows([], fieldnames=["rent", "income"])
+    assert len(empty) == 0
+    assert empty.category_means() == {"rent": 0.0}
+    assert empty.expense_matrix().shape == (0, 1)
+    assert np.array_equal(empty.total_expenses(), np.zeros(0))
@@ -0,0 +1,230 @@
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+import numpy as np
+import openpyxl
+import pytest
+import file_parser
+from engineered_dataset import EXPENSE_COLUMNS
+from file_parser import (
+    FileParser, UploadLimitError, _parse_csv_lines, iter_csv_rows, iter_excel_rows, iter_text_lines,
+    parse_engineered_csv, read_sheet_headers, shutdown_worker_pool,
+)
+
+
+def parse_csv(content: bytes, chunk_size: int, **kwargs):
+    return _parse_csv_lines(iter_text_lines(io.BytesIO(content), chunk_size=chunk_size, max_bytes=None),
+                            max_rows=None, **kwargs)
+
+
+def engineered_csv(rows: int) -> bytes:
+    header = ["Income", "Occupation"] + [c.title() for c in EXPENSE_COLUMNS] + ["Savings"]
+    lines = [",".join(header)]
+    for i in range(rows):
+        # Every 7th row has a quoted occupation spanning two lines
+        occupation = '"Self\nEmployed"' if i % 7 == 0 else "Professional"
+        lines.append(",".join([str(50_000 + i), occupation] + [str((i + j) % 900) for j in range(len(EXPENSE_COLUMNS))] + [str(i % 500)]))
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def parse_engineered(content: bytes, **kwargs):
+    np.random.seed(0)
+    lines = iter(iter_text_lines(io.BytesIO(content), chunk_size=7, max_bytes=None))
+    fieldnames, _ = iter_csv_rows(lines)
+    return parse_engineered_csv(fieldnames, lines, max_rows=None, **kwargs)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 64 * 1024])
+def test_quoted_multiline_fields_across_chunks(chunk_size):
+    content = 'Date,Category,Amount\n2025-01-10,"Food\nand drink",12.5\n2025-01-11,"Café, bar",3\n'.encode()
+    data = parse_csv(content, chunk_size)
+    assert [(e["category"], e["amount"]) for e in data["expenses"]] == [("Food\nand drink", 12.5), ("Café, bar", 3.0)]
+
+
+def test_bom_and_crlf():
+    content = b"\xef\xbb\xbfDate,Category,Amount\r\n2025-01-10,Food,516.59\r\n\r\n2025-02-11,Rent,237.01\r\n"
+    data = FileParser.parse_stream(io.BytesIO(content), "e.csv")
+    assert [(e["date"], e["category"], e["amount"]) for e in data["expenses"]] == [
+        ("2025-01-10", "Food", 516.59), ("2025-02-11", "Rent", 237.01)]
+
+
+def test_size_and_row_limits():
+    content = b"Date,Category,Amount\n" + b"2025-01-10,Food,1\n" * 10
+    with pytest.raises(UploadLimitError):
+        FileParser.parse_stream(io.BytesIO(content), "e.csv", max_bytes=64)
+    with pytest.raises(UploadLimitError):
+        FileParser.parse_stream(io.BytesIO(content), "e.csv", max_rows=9)
+    assert len(FileParser.parse_stream(io.BytesIO(content), "e.csv", max_rows=10)["expenses"]) == 10
+    with pytest.raises(ValueError):
+        FileParser.parse_stream(io.BytesIO(content), "e.txt")
+
+
+def test_coercion_report():
+    content = b'Date,Category,Amount\n2025-01-10,Rent,"$1,200.50"\n2025-01-11,Refund,(5)\n2025-01-12,Food,abc\n2025-01-13,Misc,\n'
+    data = FileParser.parse_stream(io.BytesIO(content), "e.csv")
+    assert [(e["category"], e["amount"]) for e in data["expenses"]] == [("Rent", 1200.5), ("Refund", -5.0)]
+    assert data["ingest_report"] == {
+        "rows": 4,
+        "skipped_rows": 2,
+        # One bad cell in three is too many to infer "currency", but cells are still cleaned
+        "columns": {"amount": {"type": "text", "errors": 1, "blanks": 1}},
+    }
+
+
+def test_excel_rows_are_streamed_and_normalized():
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "Spending"
+    sheet.append([" Date ", "CATEGORY", "Amount"])
+    sheet.append([datetime(2025, 1, 10), "Food", 12.5])
+    sheet.append([None, None, None])
+    sheet.append([date(2025, 1, 11), "Rent", 700])
+    sheet.append([datetime(2025, 1, 12, 9, 30), "Taxi", 3])
+    other = wb.create_sheet("Other")
+    other.append(["Name", "Cost"])
+    buf = io.BytesIO()
+    wb.save(buf)
+
+    assert read_sheet_headers(io.BytesIO(buf.getvalue())) == [
+        ("Spending", ["date", "category", "amount"], 5), ("Other", ["name", "cost"], 1)]
+    fieldnames, rows = iter_excel_rows(io.BytesIO(buf.getvalue()))
+    assert fieldnames == ["date", "category", "amount"]
+    assert [(row["date"], row["category"], row["amount"]) for row in rows] == [
+        ("2025-01-10", "Food", 12.5), ("2025-01-11", "Rent", 700), ("2025-01-12 09:30:00", "Taxi", 3)]
+    assert iter_excel_rows(io.BytesIO(buf.getvalue()), "Other")[0] == ["name", "cost"]
+
+
+def make_workbook() -> bytes:
+    wb = openpyxl.Workbook()
+    expenses = wb.active
+    expenses.title = "Spending"
+    expenses.append(["Date", "Category", "Amount"])
+    for day in range(1, 31):
+        expenses.append([f"2025-01-{day:02d}", "Food", day * 10.0])
+    expenses.append([None, None, None])
+    expenses.append(["2025-02-01", "Rent", "n/a"])
+    notes = wb.create_sheet("Notes")
+    notes.append(["Anything", "Else"])
+    notes.append(["ignored", 1])
+    goals = wb.create_sheet("Goals")
+    goals.append(["Name", "Target", "Current", "Deadline"])
+    goals.append(["Car", 500_000, 120_000, "2027-06-30"])
+    subs = wb.create_sheet("Subscriptions")
+    subs.append(["Name", "Cost", "Next Renewal", "Category"])
+    subs.append(["Music", 119, "2025-03-01", "Entertainment"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_workbook_sheets_are_detected_and_merged():
+    data = FileParser.parse_stream(io.BytesIO(make_workbook()), "book.xlsx")
+    assert len(data["expenses"]) == 30
+    assert data["expenses"][-1]["amount"] == 300.0
+    assert [g["name"] for g in data["goals"]] == ["Car"]
+    assert data["subscriptions"][0]["name"] == "Music" and data["subscriptions"][0]["cost"] == 119
+    assert data["aggregates"]["total_expenses"] == sum(day * 10.0 for day in range(1, 31))
+    report = data["ingest_report"]
+    assert report["rows"] == 31 + 1 + 1
+    assert report["skipped_rows"] == 1
+    assert report["columns"]["expenses.amount"]["errors"] == 1
+    assert "goals.target" in report["columns"]
+
+
+def test_subscription_ids_are_unique_across_sheets():
+    wb = openpyxl.Workbook()
+    for n, title in enumerate(["Streaming", "Software"]):
+        sheet = wb.active if n == 0 else wb.create_sheet()
+        sheet.title = title
+        sheet.append(["Name", "Cost", "Next Renewal"])
+        sheet.append([f"{title} A", 100, "2025-03-01"])
+        sheet.append([f"{title} B", 200, None])
+    buf = io.BytesIO()
+    wb.save(buf)
+
+    subscriptions = FileParser.parse_stream(io.BytesIO(buf.getvalue()), "subs.xlsx")["subscriptions"]
+    assert [(s["id"], s["name"]) for s in subscriptions] == [
+        (1, "Streaming A"), (2, "Streaming B"), (3, "Software A"), (4, "Software B")]
+    assert subscriptions[1]["nextRenewal"] == "" and subscriptions[0]["isActive"] is True
+
+
+def test_engineered_chunks_keep_quoted_rows_whole():
+    content = engineered_csv(50)
+    whole = parse_engineered(content, chunk_rows=5000)
+    assert whole["ingest_report"]["rows"] == 50
+    for chunk_rows in (1, 3, 7):
+        assert parse_engineered(content, chunk_rows=chunk_rows) == whole
+
+
+@pytest.fixture
+def pooled(monkeypatch, request):
+    """Force the shared worker pool on, whatever the CPU count"""
+    monkeypatch.setattr(file_parser, "PARSE_EXECUTOR", request.param)
+    monkeypatch.setattr(file_parser, "_pool_size", lambda: 2)
+    monkeypatch.setattr(file_parser, "SHEET_PARALLEL_MIN_ROWS", 0)
+    shutdown_worker_pool()
+    yield request.param
+    shutdown_worker_pool()
+
+
+@pytest.mark.parametrize("pooled", ["thread", "process"], indirect=True)
+def test_parallel_matches_serial(pooled, monkeypatch):
+    content = engineered_csv(300)
+    workbook = make_workbook()
+
+    def parse_all(parallel_min_rows):
+        engineered = parse_engineered(content, parallel_min_rows=parallel_min_rows, chunk_rows=40)
+        return engineered, FileParser.parse_file(workbook, "book.xlsx")
+
+    parallel = parse_all(0)
+    assert file_parser._pool is not None
+    monkeypatch.setattr(file_parser, "PARSE_EXECUTOR", "serial")
+    assert parse_all(10 ** 9) == parallel
+
+
+class BrokenPool:
+    """Executor whose workers die after `healthy` tasks"""
+
+    def __init__(self, healthy=0, fail_submit=False):
+        self.healthy = healthy
+        self.fail_submit = fail_submit
+        self.submitted = 0
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if self.fail_submit and self.submitted >= self.healthy:
+            raise BrokenProcessPool("pool is broken")
+        future = Future()
+        if self.submitted < self.healthy:
+            future.set_result(fn(*args))
+        else:
+            future.set_exception(BrokenProcessPool("worker died"))
+        self.submitted += 1
+        return future
+
+    def map(self, fn, *iterables):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+
+@pytest.mark.parametrize("pooled", ["process"], indirect=True)
+@pytest.mark.parametrize("pool", [BrokenPool(healthy=2), BrokenPool(healthy=2, fail_submit=True)])
+def test_broken_pool_falls_back_in_process(pooled, monkeypatch, pool):
+    content = engineered_csv(300)
+    serial = parse_engineered(content, parallel_min_rows=10 ** 9, chunk_rows=40)
+    file_parser._pool = pool
+    assert parse_engineered(content, parallel_min_rows=0, chunk_rows=40) == serial
+    assert pool.shut_down and file_parser._pool is None
+
+
+@pytest.mark.parametrize("pooled", ["process"], indirect=True)
+def test_broken_pool_retries_sheets_in_threads(pooled):
+    workbook = make_workbook()
+    serial = FileParser.parse_file(workbook, "book.xlsx")
+    shutdown_worker_pool()
+    file_parser._pool = pool = BrokenPool()
+    assert FileParser.parse_file(workbook, "book.xlsx") == serial
+    assert pool.shut_down and file_parser._pool is None
@@ -0,0 +1,48 @@
+from datetime import date
+import numpy as np
+import pytest
+from goal_simulation import simulate_goal, simulate_goals, simulate_growth_paths
+
+TODAY = date(2025, 1, 1)
+GOALS = [
+    {"name": "Car", "target": 100_000, "current": 50_000, "deadline": "2027-01-01"},
+    {"name": "Reached", "target": 10, "current": 20, "deadline": "2027-01-01"},
+    {"name": "Out of reach", "target": 10_000_000, "current": 0, "deadline": "2026-01-01"},
+]
+INVESTMENTS = [{"type": "Stocks", "amount": 1, "annual_return": 12}]
+
+
+def run(paths=500, seed=7):
+    return simulate_goals(GOALS, INVESTMENTS, 2000, paths=paths, seed=seed, today=TODAY)
+
+
+def test_fixed_seed_is_deterministic():
+    assert run() == run()
+    assert run(seed=8)[0]["probability"] != run()[0]["probability"]
+
+
+def test_probabilities_and_bands():
+    car, reached, out_of_reach = run()
+    assert car["months"] == 24
+    # The contribution is split between the two goals that still need funding
+    assert car["assumptions"]["monthly_contribution"] == 1000
+    assert car["probability"] == pytest.approx(0.278)
+    assert reached["probability"] == 1.0
+    assert out_of_reach["probability"] == 0.0
+
+    for result in (car, reached, out_of_reach):
+        p = result["percentiles"]
+        assert p["p10"] <= p["p50"] <= p["p90"]
+        bands = result["bands"]
+        assert all(lo <= mid <= hi for lo, mid, hi in zip(bands["p10"], bands["p50"], bands["p90"]))
+        assert bands["p50"][-1] == pytest.approx(p["p50"])
+    assert car["percentiles"] == pytest.approx({"p10": 62628.26, "p50": 85294.91, "p90": 116406.10})
+
+
+def test_zero_paths_are_rejected():
+    with pytest.raises(ValueError):
+        simulate_growth_paths(12, 0.1, 0.15, 0, 1)
+    with pytest.raises(ValueError):
+        simulate_goal(1000, 0, 12, np.empty((0, 12)))
+    with pytest.raises(ValueError):
+        run(paths=0)
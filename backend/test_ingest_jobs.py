@@ -0,0 +1,46 @@
+import io
+import os
+import threading
+import pytest
+from dataset_store import DatasetStore
+from ingest_jobs import JobManager, JobQueueFull, spool_upload
+
+EXPENSES_CSV = b"date,category,amount\n" + b"".join(b"2025-01-%02d,Food,%d.5\n" % (d % 28 + 1, d) for d in range(120))
+
+
+def test_job_reports_rows_and_result(tmp_path):
+    jobs = JobManager(DatasetStore(str(tmp_path)), max_workers=1)
+    job = jobs.submit(spool_upload(io.BytesIO(EXPENSES_CSV), "e.csv"), "e.csv")
+    jobs.shutdown()
+
+    status = jobs.get(job.id).to_dict()
+    assert status["status"] == "completed"
+    assert status["rows_processed"] == 120
+    assert status["rows_per_second"] > 0
+    assert status["result"]["data_summary"]["expenses_count"] == 120
+
+
+def test_failed_job_keeps_error(tmp_path):
+    jobs = JobManager(DatasetStore(str(tmp_path)), max_workers=1)
+    job = jobs.submit(spool_upload(io.BytesIO(b"junk"), "bad.xlsx"), "bad.xlsx")
+    jobs.shutdown()
+
+    assert job.status == "failed"
+    assert job.error_status == 400
+
+
+def test_queue_is_bounded(tmp_path):
+    gate = threading.Event()
+    store = DatasetStore(str(tmp_path))
+    jobs = JobManager(store, max_workers=1, max_queued=1)
+    # Hold the single worker so later jobs stay queued
+    jobs._executor.submit(gate.wait)
+
+    jobs.submit(spool_upload(io.BytesIO(EXPENSES_CSV), "e.csv"), "e.csv")
+    rejected = spool_upload(io.BytesIO(EXPENSES_CSV), "e.csv")
+    with pytest.raises(JobQueueFull):
+        jobs.submit(rejected, "e.csv")
+    os.unlink(rejected)
+    gate.set()
+    jobs.shutdown()
+    assert jobs.stats()["completed"] == 1
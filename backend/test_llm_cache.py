@@ -0,0 +1,70 @@
+import types
+import pytest
+import llm_cache
+from llm_cache import ResponseCache, cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResponseCache(path=str(tmp_path / "llm.sqlite3"), **kwargs)
+
+
+def test_prompt_whitespace_shares_a_key():
+    assert cache_key("m", "How  much\n to save? ") == cache_key("m", "How much to save?")
+    assert cache_key("a", "x") != cache_key("b", "x")
+
+
+def test_memory_then_disk_hits(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get("m", "q") is None
+    cache.set("m", "q", "answer")
+    assert cache.get("m", "q") == "answer"
+
+    # A new process only has the SQLite tier
+    fresh = make_cache(tmp_path)
+    assert fresh.get("m", "q") == "answer"
+    assert fresh.get("m", "q") == "answer"
+    assert fresh.stats() == {"memory_entries": 1, "memory_hits": 1, "disk_hits": 1, "misses": 0}
+
+
+def test_ttl_expiry(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("m", "q", "answer")
+    clock[0] += 59
+    assert cache.get("m", "q") == "answer"
+    clock[0] += 2
+    # Expired in memory, then on disk (where the row is deleted)
+    assert cache.get("m", "q") is None
+    assert make_cache(tmp_path, ttl_seconds=3600).get("m", "q") is None
+
+
+def test_memory_lru_eviction(tmp_path, clock):
+    cache = make_cache(tmp_path, memory_entries=2)
+    for prompt in ("a", "b", "c"):
+        cache.set("m", prompt, prompt.upper())
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.get("m", "a") == "A"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_eviction_by_size(tmp_path, clock):
+    cache = make_cache(tmp_path, disk_max_bytes=250)
+    for prompt in ("a", "b"):
+        clock[0] += 1
+        cache.set("m", prompt, prompt * 100)
+    clock[0] += 1
+    # Reading "a" from disk makes "b" the least recently used row
+    assert make_cache(tmp_path).get("m", "a") == "a" * 100
+    clock[0] += 1
+    cache.set("m", "c", "c" * 100)
+
+    disk = make_cache(tmp_path)
+    assert disk.get("m", "b") is None
+    assert disk.get("m", "a") == "a" * 100
+    assert disk.get("m", "c") == "c" * 100
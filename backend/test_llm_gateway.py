@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import types
+import llm_gateway
+from llm_cache import ResponseCache
+
+
+class FakeModels:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        return types.SimpleNamespace(text=f"answer to {contents}")
+
+
+class FakeSyncModels:
+    def __init__(self):
+        self.prompts = []
+        self.configs = []
+
+    def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        self.configs.append(config)
+        return types.SimpleNamespace(text=f"answer to {contents}")
+
+    def embed_content(self, model, contents, config):
+        texts = [contents] if isinstance(contents, str) else contents
+        return types.SimpleNamespace(embeddings=[types.SimpleNamespace(values=[float(len(t))]) for t in texts])
+
+
+def test_client_is_created_once(monkeypatch):
+    created = []
+    monkeypatch.setattr(llm_gateway.genai, "Client", lambda api_key: created.append(api_key) or object())
+    monkeypatch.setattr(llm_gateway, "_client", None)
+    threads = [threading.Thread(target=llm_gateway.get_client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert llm_gateway.get_client() is llm_gateway.get_client()
+
+
+def test_generate_text_timeout_and_cache(monkeypatch, tmp_path):
+    models = FakeSyncModels()
+    monkeypatch.setattr(llm_gateway, "get_client", lambda: types.SimpleNamespace(models=models))
+    monkeypatch.setattr(llm_gateway, "response_cache", ResponseCache(path=str(tmp_path / "llm.sqlite3")))
+
+    assert llm_gateway.generate_text("q", timeout=2.5, use_cache=True) == "answer to q"
+    assert llm_gateway.generate_text("q", use_cache=True) == "answer to q"
+    assert llm_gateway.generate_text("q", timeout=None, use_cache=False) == "answer to q"
+    assert models.prompts == ["q", "q"]
+    assert models.configs[0].http_options.timeout == 2500
+    assert models.configs[1].http_options is None
+
+
+def test_embed_texts_keeps_order(monkeypatch):
+    models = FakeSyncModels()
+    monkeypatch.setattr(llm_gateway, "get_client", lambda: types.SimpleNamespace(models=models))
+    assert llm_gateway.embed_texts(["a", "bbb", "cc"]) == [[1.0], [3.0], [2.0]]
+    assert llm_gateway.embed_text("dddd") == [4.0]
+
+
+def test_agenerate_text_caches_off_the_event_loop(monkeypatch, tmp_path):
+    models = FakeModels()
+    client = types.SimpleNamespace(aio=types.SimpleNamespace(models=models))
+    monkeypatch.setattr(llm_gateway, "get_client", lambda: client)
+    cache = ResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(cache, name)
+
+        def wrapper(*args, _method=method):
+            threads.append(threading.current_thread())
+            return _method(*args)
+        monkeypatch.setattr(cache, name, wrapper)
+    monkeypatch.setattr(llm_gateway, "response_cache", cache)
+
+    assert asyncio.run(llm_gateway.agenerate_text("q", use_cache=True)) == "answer to q"
+    assert asyncio.run(llm_gateway.agenerate_text("q", use_cache=True)) == "answer to q"
+    assert models.prompts == ["q"]
+    # get, set, then the cached get
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
@@ -0,0 +1,124 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import main
+from dataset_store import DatasetStore
+from ingest_jobs import JobManager
+
+DATA = {
+    "profile": {"monthly_income": 5000},
+    "expenses": [{"date": "2025-01-10", "category": "Food", "amount": 120.0}],
+    "investments": [],
+    "goals": [],
+    "monthly_history": [{"month": "Jan", "income": 5000, "expenses": 120}],
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "_resolve_data", lambda file_id, user_id: DATA)
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def upload_client(monkeypatch, tmp_path):
+    store = DatasetStore(str(tmp_path))
+    monkeypatch.setattr(main, "uploaded_data_store", store)
+    monkeypatch.setattr(main, "ingest_jobs", JobManager(store, max_workers=1))
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_bundle_default_panels(client):
+    bundle = client.get("/dashboard/bundle").json()
+    assert list(bundle) == ["summary", "expenses", "investments", "goals", "history", "errors"]
+    assert bundle["errors"] == {}
+    assert bundle["summary"]["total_expenses"] == 120.0
+    assert bundle["expenses"]["expenses"] == DATA["expenses"]
+
+
+def test_bundle_panel_subset_keeps_order(client):
+    bundle = client.get("/dashboard/bundle", params={"panels": "history, subscriptions"}).json()
+    assert list(bundle) == ["history", "subscriptions", "errors"]
+    assert bundle["history"] == {"history": DATA["monthly_history"]}
+
+
+def test_bundle_unknown_panel(client):
+    response = client.get("/dashboard/bundle", params={"panels": "summary,nope"})
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+
+
+def test_bundle_panel_timeout(client, monkeypatch):
+    async def slow_panel(data, agg):
+        await asyncio.sleep(5)
+
+    monkeypatch.setitem(main.DASHBOARD_PANELS, "analytics", slow_panel)
+    monkeypatch.setattr(main, "DASHBOARD_LLM_PANEL_TIMEOUT_SECONDS", 0.05)
+    bundle = client.get("/dashboard/bundle", params={"panels": "summary,analytics"}).json()
+    assert "analytics" not in bundle and "summary" in bundle
+    assert bundle["errors"] == {"analytics": "Timed out after 0.05s"}
+
+
+def test_bundle_panel_exceptions(client, monkeypatch):
+    def broken_panel(data, agg):
+        raise KeyError("total")
+
+    async def unavailable_panel(data, agg):
+        raise HTTPException(status_code=502, detail="LLM unavailable")
+
+    monkeypatch.setitem(main.DASHBOARD_PANELS, "budgets", broken_panel)
+    monkeypatch.setitem(main.DASHBOARD_PANELS, "analytics", unavailable_panel)
+    bundle = client.get("/dashboard/bundle", params={"panels": "budgets,analytics,goals"}).json()
+    assert list(bundle) == ["goals", "errors"]
+    assert bundle["errors"] == {"budgets": "Error building panel: 'total'", "analytics": "LLM unavailable"}
+
+
+def test_sweep_endpoint(client):
+    response = client.post("/calculator/sweep", json={"function": "mortgage_payment", "parameters": {
+        "loan_amount": [1_000_000, 2_000_000], "annual_interest_rate": {"start": 6, "stop": 9, "step": 1.5}, "years": 20}})
+    body = response.json()
+    assert body["shape"] == [2, 3, 1]
+    assert body["axes"]["annual_interest_rate"] == [6, 7.5, 9]
+    assert body["results"]["monthly_payment"][1][0][0] == pytest.approx(2 * body["results"]["monthly_payment"][0][0][0])
+
+
+@pytest.mark.parametrize("function, parameters, detail", [
+    ("mortgage_payment", {"loan_amount": 1, "annual_interest_rate": 5}, "Missing parameters: years"),
+    ("mortgage_payment", {"loan_amount": {"start": 0, "stop": 1e12, "step": 1}, "annual_interest_rate": 5, "years": 20},
+     "Grid too large"),
+    ("debt_payoff", {}, "Unknown sweep function"),
+])
+def test_sweep_endpoint_rejects_bad_grids(client, function, parameters, detail):
+    response = client.post("/calculator/sweep", json={"function": function, "parameters": parameters})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith(detail)
+
+
+DIRTY_CSV = b'Date,Category,Amount\n2025-01-10,Rent,"$1,200"\n2025-01-11,Food,abc\n2025-01-12,Misc,\n2025-01-13,Food,40\n'
+DIRTY_REPORT = {"rows": 4, "skipped_rows": 2, "columns": {"amount": {"type": "text", "errors": 1, "blanks": 1}}}
+
+
+def test_upload_returns_ingest_report(upload_client):
+    files = {"file": ("dirty.csv", DIRTY_CSV, "text/csv")}
+    first = upload_client.post("/upload", files=files).json()
+    assert first["data_summary"]["expenses_count"] == 2
+    assert first["ingest_report"] == DIRTY_REPORT
+    # A deduplicated re-upload reports on the stored dataset
+    again = upload_client.post("/upload", files=files).json()
+    assert again["deduplicated"] == "content" and again["ingest_report"] == DIRTY_REPORT
+
+
+def test_upload_job_returns_ingest_report(upload_client):
+    response = upload_client.post("/upload", params={"async": 1}, files={"file": ("dirty.csv", DIRTY_CSV, "text/csv")})
+    assert response.status_code == 202
+    for _ in range(200):
+        job = upload_client.get(response.json()["status_url"]).json()
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.01)
+    assert job["status"] == "completed"
+    assert job["result"]["ingest_report"] == DIRTY_REPORT
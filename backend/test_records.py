@@ -0,0 +1,31 @@
+import json
+import pytest
+from fastapi.encoders import jsonable_encoder
+from records import Goal, Investment, Transaction, intern_label, json_default
+
+
+def test_records_read_like_dicts():
+    expense = Transaction("2025-01-10", "Food", 12.5)
+    assert expense["amount"] == 12.5 and expense.get("category") == "Food"
+    assert expense.get("missing", 0) == 0 and "date" in expense and "missing" not in expense
+    with pytest.raises(KeyError):
+        expense["missing"]
+    assert list(expense) == ["date", "category", "amount"] and len(expense) == 3
+    assert expense == {"date": "2025-01-10", "category": "Food", "amount": 12.5}
+    assert dict(expense) == expense.to_dict()
+    assert not hasattr(expense, "__dict__")
+
+
+def test_records_serialize_as_objects():
+    data = {"investments": [Investment("Gold", 1000.0, 7.5)], "goals": [Goal("Car", 5e5, 1e5, "2027-06-30")]}
+    expected = {"investments": [{"type": "Gold", "amount": 1000.0, "annual_return": 7.5}],
+                "goals": [{"name": "Car", "target": 5e5, "current": 1e5, "deadline": "2027-06-30"}]}
+    assert json.loads(json.dumps(data, default=json_default)) == expected
+    assert jsonable_encoder(data) == expected
+    with pytest.raises(TypeError):
+        json.dumps(object(), default=json_default)
+
+
+def test_labels_are_interned():
+    assert intern_label("".join(["Fo", "od"])) is intern_label("Food")
+    assert intern_label(2025) == "2025"
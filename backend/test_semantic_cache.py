@@ -0,0 +1,58 @@
+import hashlib
+import re
+import numpy as np
+from semantic_cache import SemanticCache
+
+
+def stub_embedder(text: str, dims: int = 64):
+    """Local bag-of-words embedder: one hashed bucket per lowercase token"""
+    vector = np.zeros(dims, dtype=np.float32)
+    for token in re.findall(r"[a-z]+", text.lower()):
+        vector[int(hashlib.md5(token.encode()).hexdigest(), 16) % dims] += 1.0
+    return vector
+
+
+def test_similar_query_hits():
+    cache = SemanticCache(embed_fn=stub_embedder, threshold=0.8, capacity=8)
+    query = "how much should I save for emergencies"
+    cache.add(cache.embed(query), query, {"response": "Six months of expenses"})
+
+    assert cache.lookup("How much should I save for emergencies?") == {"response": "Six months of expenses"}
+    assert cache.stats()["hits"] == 1
+
+
+def test_unrelated_query_misses():
+    cache = SemanticCache(embed_fn=stub_embedder, threshold=0.8, capacity=8)
+    query = "how much should I save for emergencies"
+    cache.add(cache.embed(query), query, "answer")
+
+    assert cache.lookup("what is a mutual fund expense ratio") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_empty_cache_misses():
+    cache = SemanticCache(embed_fn=stub_embedder)
+    assert cache.lookup("anything") is None
+
+
+def test_capacity_evicts_least_recently_used():
+    cache = SemanticCache(embed_fn=stub_embedder, threshold=0.99, capacity=2)
+    for query in ["alpha bravo", "charlie delta"]:
+        cache.add(cache.embed(query), query, query)
+
+    # Touch the first entry so the second becomes least recently used
+    assert cache.lookup("alpha bravo") == "alpha bravo"
+    cache.add(cache.embed("echo foxtrot"), "echo foxtrot", "echo foxtrot")
+
+    assert len(cache) == 2
+    assert cache.lookup("alpha bravo") == "alpha bravo"
+    assert cache.lookup("echo foxtrot") == "echo foxtrot"
+    assert cache.lookup("charlie delta") is None
+
+
+def test_clear():
+    cache = SemanticCache(embed_fn=stub_embedder, threshold=0.8)
+    cache.add(cache.embed("budget tips"), "budget tips", "answer")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.lookup("budget tips") is None
@@ -0,0 +1,45 @@
+import numpy as np
+from vector_store import VectorStore, build_index, load_corpus
+
+
+def clustered_embedder(texts):
+    """Deterministic vectors around 8 well-separated directions, one per topic"""
+    rng = np.random.default_rng(0)
+    centers = np.eye(32, dtype=np.float32)[:8] * 4
+    return [centers[int(t.split()[1]) % 8] + rng.normal(0, 0.3, 32) for t in texts]
+
+
+DOCS = [{"text": f"topic {i % 8} doc {i}", "source": f"{i}.md"} for i in range(400)]
+
+
+def test_ivf_returns_the_brute_force_top_hits(tmp_path):
+    flat = build_index(DOCS, str(tmp_path / "flat"), clustered_embedder)
+    ivf = build_index(DOCS, str(tmp_path / "ivf"), clustered_embedder, nlist=8)
+    assert flat.centroids is None and ivf.centroids is not None
+    assert sorted(ivf.order.tolist()) == list(range(len(DOCS)))
+
+    queries = clustered_embedder([f"topic {t} q" for t in range(8)])
+    for query in queries:
+        expected = flat.search(query, k=5)
+        got = ivf.search(query, k=5, nprobe=2)
+        assert [d["text"] for d in got] == [d["text"] for d in expected]
+        assert [d["score"] for d in got] == [d["score"] for d in expected]
+        # Probing every list is an exhaustive search
+        assert ivf.search(query, k=5, nprobe=8) == expected
+
+
+def test_load_round_trip(tmp_path):
+    build_index(DOCS[:10], str(tmp_path), clustered_embedder)
+    store = VectorStore.load(str(tmp_path))
+    assert len(store) == 10 and store.dims == 32
+    assert isinstance(store.vectors, np.memmap)
+    top = store.search(clustered_embedder(["topic 3 q"])[0], k=1)[0]
+    assert top["text"] == "topic 3 doc 3" and top["source"] == "3.md"
+
+
+def test_load_corpus_chunks(tmp_path):
+    (tmp_path / "a.md").write_text("one\n\ntwo\n\n" + "x" * 20)
+    (tmp_path / "skip.bin").write_text("ignored")
+    docs = load_corpus(str(tmp_path), max_chars=10)
+    assert [d["text"] for d in docs] == ["one\n\ntwo", "x" * 20]
+    assert {d["source"] for d in docs} == {"a.md"}
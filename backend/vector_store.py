@@ -0,0 +1,180 @@
+"""
+Dependency-light vector store for retrieval, memory-mapped from an index directory.
+Build an index offline with:
+
+    python vector_store.py <corpus_dir> <index_dir> [--nlist N]
+"""
+import argparse
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from config import VECTOR_INDEX_DIR, EMBEDDING_MODEL
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.f32"
+CENTROIDS_FILE = "centroids.f32"
+ORDER_FILE = "order.i32"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Spherical k-means; returns normalized centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(k):
+            members = vectors[assignments == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+    return centroids.astype(np.float32)
+
+
+class VectorStore:
+    """Memory-mapped embedding matrix with brute-force or IVF top-k search"""
+
+    def __init__(self, vectors: np.ndarray, documents: List[Dict[str, Any]],
+                 centroids: Optional[np.ndarray] = None, order: Optional[np.ndarray] = None,
+                 list_offsets: Optional[List[int]] = None):
+        self.vectors = vectors
+        self.documents = documents
+        self.centroids = centroids
+        self.order = order
+        self.list_offsets = list_offsets
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def dims(self) -> int:
+        return self.vectors.shape[1]
+
+    @classmethod
+    def load(cls, index_dir: str) -> "VectorStore":
+        with open(os.path.join(index_dir, META_FILE), "r") as f:
+            meta = json.load(f)
+        count, dims = meta["count"], meta["dims"]
+        vectors = np.memmap(os.path.join(index_dir, VECTORS_FILE), dtype=np.float32, mode="r", shape=(count, dims))
+
+        centroids = order = list_offsets = None
+        ivf = meta.get("ivf")
+        if ivf:
+            centroids = np.memmap(os.path.join(index_dir, CENTROIDS_FILE), dtype=np.float32, mode="r",
+                                  shape=(ivf["nlist"], dims))
+            order = np.memmap(os.path.join(index_dir, ORDER_FILE), dtype=np.int32, mode="r", shape=(count,))
+            list_offsets = ivf["offsets"]
+        return cls(vectors, meta["documents"], centroids, order, list_offsets)
+
+    def search(self, query: Sequence[float], k: int = 4, nprobe: int = 4) -> List[Dict[str, Any]]:
+        """Return up to `k` documents most similar to `query`, each with a `score`"""
+        if len(self) == 0:
+            return []
+        q = _normalize(np.asarray(query, dtype=np.float32))
+
+        if self.centroids is not None:
+            # Only scan the `nprobe` partitions whose centroids are closest to the query
+            probes = np.argsort(-(self.centroids @ q))[:nprobe]
+            candidates = np.concatenate([
+                self.order[self.list_offsets[p]:self.list_offsets[p + 1]] for p in probes
+            ])
+        else:
+            candidates = np.arange(len(self))
+
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ q
+        top = np.argsort(-scores)[:k]
+        return [
+            dict(self.documents[int(candidates[i])], score=float(scores[i]))
+            for i in top
+        ]
+
+
+def build_index(documents: List[Dict[str, Any]], index_dir: str,
+                embed_many: Callable[[List[str]], Sequence[Sequence[float]]], nlist: int = 0) -> VectorStore:
+    """
+    Embed `documents` (dicts with at least `text`) and write an index to `index_dir`.
+    `embed_many` embeds a list of texts in one call (e.g. embedding.get_embeddings).
+    With `nlist` > 1 the index is partitioned into that many IVF lists.
+    """
+    if not documents:
+        raise ValueError("No documents to index")
+    vectors = _normalize(np.array(embed_many([doc["text"] for doc in documents]), dtype=np.float32))
+    count, dims = vectors.shape
+
+    os.makedirs(index_dir, exist_ok=True)
+    vectors.tofile(os.path.join(index_dir, VECTORS_FILE))
+    meta = {"count": count, "dims": dims, "model": EMBEDDING_MODEL, "documents": documents}
+
+    nlist = min(nlist, count)
+    if nlist > 1:
+        centroids = _kmeans(vectors, nlist)
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind="stable").astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=nlist))]).tolist()
+        centroids.tofile(os.path.join(index_dir, CENTROIDS_FILE))
+        order.tofile(os.path.join(index_dir, ORDER_FILE))
+        meta["ivf"] = {"nlist": nlist, "offsets": offsets}
+
+    with open(os.path.join(index_dir, META_FILE), "w") as f:
+        json.dump(meta, f)
+    return VectorStore.load(index_dir)
+
+
+def load_corpus(corpus_dir: str, max_chars: int = 1500) -> List[Dict[str, Any]]:
+    """Split .md/.txt files under `corpus_dir` into paragraph chunks of at most `max_chars`"""
+    documents = []
+    for root, _, files in os.walk(corpus_dir):
+        for name in sorted(files):
+            if not name.endswith((".md", ".txt")):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "r", encoding="utf-8") as f:
+                paragraphs = [p.strip() for p in f.read().split("\n\n") if p.strip()]
+            chunk = ""
+            for paragraph in paragraphs:
+                if chunk and len(chunk) + len(paragraph) > max_chars:
+                    documents.append({"text": chunk, "source": os.path.relpath(path, corpus_dir)})
+                    chunk = ""
+                chunk = f"{chunk}\n\n{paragraph}" if chunk else paragraph
+            if chunk:
+                documents.append({"text": chunk, "source": os.path.relpath(path, corpus_dir)})
+    return documents
+
+
+_store: Optional[VectorStore] = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_vector_store(index_dir: str = VECTOR_INDEX_DIR) -> Optional[VectorStore]:
+    """Lazily load the shared index; None when no index has been built"""
+    global _store, _store_loaded
+    if not _store_loaded:
+        with _store_lock:
+            if not _store_loaded:
+                if os.path.exists(os.path.join(index_dir, META_FILE)):
+                    _store = VectorStore.load(index_dir)
+                _store_loaded = True
+    return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local RAG vector index")
+    parser.add_argument("corpus_dir")
+    parser.add_argument("index_dir", nargs="?", default=VECTOR_INDEX_DIR)
+    parser.add_argument("--nlist", type=int, default=0, help="number of IVF partitions (0 = brute force)")
+    args = parser.parse_args()
+
+    from embedding import get_embeddings
+    docs = load_corpus(args.corpus_dir)
+    store = build_index(docs, args.index_dir, get_embeddings, nlist=args.nlist)
+    print(f"Indexed {len(store)} chunks ({store.dims} dims) into {args.index_dir}")
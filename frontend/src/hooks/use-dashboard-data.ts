@@ -33,12 +33,17 @@ export function useDashboardData(fileId?: string) {
           ]);
         };
 
-        const results = await Promise.allSettled([
-          fetchWithTimeout(`${API_BASE}/dashboard/summary${fileId ? `?file_id=${fileId}` : ""}`),
-          fetchWithTimeout(`${API_BASE}/dashboard/expenses${fileId ? `?file_id=${fileId}` : ""}`),
-          fetchWithTimeout(`${API_BASE}/dashboard/investments${fileId ? `?file_id=${fileId}` : ""}`),
-          fetchWithTimeout(`${API_BASE}/dashboard/goals${fileId ? `?file_id=${fileId}` : ""}`),
-          fetchWithTimeout(`${API_BASE}/dashboard/history${fileId ? `?file_id=${fileId}` : ""}`),
+        // One bundled request replaces the per-panel fetches; the server loads
+        // the dataset once and computes every panel in a single pass.
+        // Analytics waits on the LLM, so it keeps its own request and timeout
+        // and a slow answer never holds back the other panels.
+        const params = new URLSearchParams({
+          panels: "summary,expenses,investments,goals,history",
+        });
+        if (fileId) params.set("file_id", fileId);
+
+        const [bundleResult, analyticsResult] = await Promise.allSettled([
+          fetchWithTimeout(`${API_BASE}/dashboard/bundle?${params}`),
           fetchWithTimeout(`${API_BASE}/dashboard/analytics${fileId ? `?file_id=${fileId}` : ""}`, 15000),
         ]);
 
@@ -54,14 +59,20 @@ export function useDashboardData(fileId?: string) {
           return null;
         };
 
-        const [
-          summaryData,
-          expensesData,
-          investmentsData,
-          goalsData,
-          historyData,
-          analyticsData
-        ] = await Promise.all(results.map(processResult));
+        const [bundle, analyticsData] = await Promise.all([
+          processResult(bundleResult),
+          processResult(analyticsResult),
+        ]);
+
+        if (bundle?.errors && Object.keys(bundle.errors).length > 0) {
+          console.warn("Dashboard panels failed", bundle.errors);
+        }
+
+        const summaryData = bundle?.summary ?? null;
+        const expensesData = bundle?.expenses ?? null;
+        const investmentsData = bundle?.investments ?? null;
+        const goalsData = bundle?.goals ?? null;
+        const historyData = bundle?.history ?? null;
 
 
         // FETCH REAL DATA FROM FIRESTORE